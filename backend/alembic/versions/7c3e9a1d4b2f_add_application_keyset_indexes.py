@@ -0,0 +1,41 @@
+"""add application keyset indexes
+
+Revision ID: 7c3e9a1d4b2f
+Revises: 025eb7f20441
+Create Date: 2026-10-16 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1d4b2f'
+down_revision: Union[str, Sequence[str], None] = '025eb7f20441'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_SORT_INDEXES = {
+    'ix_applications_tenant_status': 'status',
+    'ix_applications_tenant_company': 'company',
+    'ix_applications_tenant_applied_date': 'applied_date',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, column in _SORT_INDEXES.items():
+        op.drop_index(index_name, table_name='applications')
+        op.create_index(index_name, 'applications', ['tenant_id', column, 'id'], unique=False)
+    op.create_index('ix_applications_tenant_created_at', 'applications', ['tenant_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_tenant_created_at', table_name='applications')
+    for index_name, column in _SORT_INDEXES.items():
+        op.drop_index(index_name, table_name='applications')
+        op.create_index(index_name, 'applications', ['tenant_id', column], unique=False)
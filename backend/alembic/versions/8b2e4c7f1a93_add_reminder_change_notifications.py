@@ -0,0 +1,53 @@
+"""add reminder change notifications
+
+Revision ID: 8b2e4c7f1a93
+Revises: 3f6d2a9c8e14
+Create Date: 2026-10-16 23:48:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4c7f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f6d2a9c8e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_reminder_change() RETURNS trigger AS $$
+        BEGIN
+          PERFORM pg_notify('reminder_changes', json_build_object(
+            'id', NEW.id,
+            'remind_at', extract(epoch FROM NEW.remind_at),
+            'sent', NEW.sent
+          )::text);
+          RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER reminders_notify_insert
+        AFTER INSERT ON reminders
+        FOR EACH ROW EXECUTE FUNCTION notify_reminder_change()
+    """)
+    op.execute("""
+        CREATE TRIGGER reminders_notify_update
+        AFTER UPDATE OF remind_at, sent ON reminders
+        FOR EACH ROW
+        WHEN (OLD.remind_at IS DISTINCT FROM NEW.remind_at
+              OR OLD.sent IS DISTINCT FROM NEW.sent)
+        EXECUTE FUNCTION notify_reminder_change()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS reminders_notify_update ON reminders')
+    op.execute('DROP TRIGGER IF EXISTS reminders_notify_insert ON reminders')
+    op.execute('DROP FUNCTION IF EXISTS notify_reminder_change()')
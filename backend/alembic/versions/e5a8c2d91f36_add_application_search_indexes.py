@@ -0,0 +1,40 @@
+"""add application search indexes
+
+Revision ID: e5a8c2d91f36
+Revises: b41d6f0e8c57
+Create Date: 2026-10-16 11:41:08.275519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8c2d91f36'
+down_revision: Union[str, Sequence[str], None] = 'b41d6f0e8c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || "
+    "coalesce(notes, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Built concurrently so large tenants keep writing while the GIN indexes build.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_applications_company_trgm', 'applications', ['company'], unique=False, postgresql_using='gin', postgresql_ops={'company': 'gin_trgm_ops'}, postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_applications_search_document', 'applications', [sa.text(SEARCH_DOCUMENT_SQL)], unique=False, postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_applications_search_document', table_name='applications', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_applications_company_trgm', table_name='applications', postgresql_concurrently=True, if_exists=True)
@@ -1,21 +1,30 @@
-import os
 import uuid
 from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING
 
 import redis.asyncio as redis
-from fastapi import Depends, Header, HTTPException, Request, Response, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.params import Depends as DependsMarker
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-from sqlalchemy import and_, select
+from sqlalchemy import and_, exc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.metrics import registry
+from app.core.rate_limit import rate_limiter
+from app.core.redis import create_redis_client, create_redis_pool
+from app.core.tracing import traced, tracer
+from app.db.replicas import REPLICA_INFO_KEY, replica_name
+from app.db.session import (
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    get_db,
+    replica_router,
+)
+from app.middleware.metrics import route_template
 from app.models.tenant import Tenant
 from app.models.tenant_user import TenantUser
 from app.models.user import User
+from app.services.principal_cache import principal_cache
 
 if TYPE_CHECKING:
     from app.repositories.application_repository import ApplicationRepository
@@ -26,15 +35,16 @@ if TYPE_CHECKING:
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+TENANT_HEADER = "X-Tenant-ID"
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RATE_LIMIT_SCOPES = frozenset({"user", "tenant"})
 
-def rate_limit(times: int, seconds: int) -> DependsMarker:
-    async def _enforce_rate_limit(request: Request, response: Response) -> None:
-        if FastAPILimiter.redis is None:
-            return
 
-        await RateLimiter(times=times, seconds=seconds)(request, response)
-
-    return Depends(_enforce_rate_limit)
+RATE_LIMIT_REJECTIONS = registry.counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by a route's rate limit",
+    labelnames=("route",),
+)
 
 
 def _decode_access_token(token: str) -> dict[str, object] | None:
@@ -43,16 +53,125 @@ def _decode_access_token(token: str) -> dict[str, object] | None:
     return decode_token(token, "access")
 
 
-async def get_redis() -> AsyncGenerator[redis.Redis, None]:
-    client = redis.from_url(
-        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
-        encoding="utf-8",
-        decode_responses=True,
-    )
+async def get_access_token_claims(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> dict[str, object] | None:
+    # FastAPI caches dependencies per request, so the rate limit and
+    # get_current_user share one decode.
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        return None
+    return _decode_access_token(credentials.credentials)
+
+
+def _rate_limit_identity(
+    request: Request, claims: dict[str, object] | None, per: str
+) -> str:
+    """Who a request is limited as: its tenant or user if the token verifies.
+
+    Anonymous requests are limited by client address. Behind a proxy, run
+    uvicorn with ``--proxy-headers`` so that is the caller's address.
+    """
+    if claims is not None:
+        if per == "tenant":
+            tenant_key = _tenant_key(request)
+            if tenant_key is not None:
+                return f"tenant:{tenant_key}"
+        return f"user:{claims['sub']}"
+    client = request.client.host if request.client else "unknown"
+    return f"ip:{client}"
+
+
+def rate_limit(times: int, seconds: int, per: str = "user") -> DependsMarker:
+    """Allow ``times`` requests per ``seconds`` to a route for each caller.
+
+    ``per="tenant"`` shares the limit between a tenant's members.
+    """
+    if per not in RATE_LIMIT_SCOPES:
+        raise ValueError(f"Unknown rate limit scope: {per}")
+
+    async def _enforce_rate_limit(
+        request: Request,
+        claims: dict[str, object] | None = Depends(get_access_token_claims),
+    ) -> None:
+        route = route_template(request.scope)
+        identity = _rate_limit_identity(request, claims, per)
+        decision = await rate_limiter.hit(
+            f"{request.method} {route}:{times}/{seconds}:{identity}", times, seconds
+        )
+        if not decision.allowed:
+            RATE_LIMIT_REJECTIONS.inc(route=route)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too Many Requests",
+                headers={"Retry-After": str(decision.retry_after_seconds)},
+            )
+
+    return Depends(_enforce_rate_limit)
+
+
+def get_redis_pool(request: Request) -> redis.ConnectionPool:
+    pool = getattr(request.app.state, "redis_pool", None)
+    if pool is None:
+        # Apps served without the lifespan (e.g. bare TestClient) still share
+        # a single pool once the first request has created it.
+        pool = create_redis_pool()
+        request.app.state.redis_pool = pool
+    return pool
+
+
+async def get_redis(
+    pool: redis.ConnectionPool = Depends(get_redis_pool),
+) -> AsyncGenerator[redis.Redis, None]:
+    client = create_redis_client(pool)
     try:
         yield client
     finally:
-        await client.close()
+        # Clients built on an external pool leave it open on close.
+        await client.aclose()
+
+
+def _tenant_key(request: Request) -> str | None:
+    try:
+        return str(uuid.UUID(request.headers.get(TENANT_HEADER, "")))
+    except ValueError:
+        return None
+
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only dependencies, served by a replica when possible.
+
+    Mutating requests get the request's primary session, and once they succeed
+    the tenant's reads stay on the primary for the read-your-writes window.
+    Reads also use the primary while every replica lags or is unreachable.
+    Declare it with ``scope="function"`` so the pin is set before the
+    response is sent.
+    """
+    tenant_key = _tenant_key(request)
+    if request.method not in READ_ONLY_METHODS:
+        yield db
+        if tenant_key is not None:
+            await replica_router.pin(tenant_key)
+        return
+
+    with tracer.span("deps.choose_read_replica", root=False) as span:
+        replica = await replica_router.choose(tenant_key)
+        if span is not None:
+            span.set_attribute("db.replica", replica.name if replica else "primary")
+    if replica is None:
+        yield db
+        return
+
+    async with ReplicaSessionLocal(
+        bind=replica.engine, info={REPLICA_INFO_KEY: replica.name}
+    ) as session:
+        try:
+            yield session
+        except (exc.OperationalError, exc.InterfaceError, OSError):
+            replica_router.mark_unavailable(replica)
+            raise
 
 
 async def get_auth_service(
@@ -72,13 +191,34 @@ async def get_application_repository(
     return ApplicationRepository(session=db)
 
 
+async def get_read_application_repository(
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+) -> "ApplicationRepository":
+    from app.repositories.application_repository import ApplicationRepository
+
+    return ApplicationRepository(session=db)
+
+
 async def get_application_service(
     repository: "ApplicationRepository" = Depends(get_application_repository),
     redis_client: redis.Redis = Depends(get_redis),
 ) -> "ApplicationService":
     from app.services.application_service import ApplicationService
 
-    return ApplicationService(repository=repository, redis_client=redis_client)
+    return ApplicationService(
+        repository=repository,
+        redis_client=redis_client,
+        session_factory=AsyncSessionLocal,
+    )
+
+
+async def get_read_application_service(
+    repository: "ApplicationRepository" = Depends(get_read_application_repository),
+    redis_client: redis.Redis = Depends(get_redis),
+) -> "ApplicationService":
+    return await get_application_service(
+        repository=repository, redis_client=redis_client
+    )
 
 
 async def get_reminder_repository(
@@ -97,9 +237,11 @@ async def get_reminder_service(
     return ReminderService(repository=repository)
 
 
+@traced("deps.get_current_user")
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
+    payload: dict[str, object] | None = Depends(get_access_token_claims),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ) -> User:
     if credentials is None or credentials.scheme.lower() != "bearer":
         raise HTTPException(
@@ -108,9 +250,6 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-
-    payload = _decode_access_token(token)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -134,7 +273,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cached_user = await principal_cache.get_user(user_id)
+    if cached_user is not None:
+        return cached_user
+
     user = await db.get(User, user_id)
+    if user is None and replica_name(db) is not None:
+        # A user who just registered may not have reached the replica yet.
+        async with AsyncSessionLocal() as session:
+            user = await session.get(User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -142,16 +289,21 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    await principal_cache.set_user(user)
     return user
 
 
+@traced("deps.get_current_tenant")
 async def get_current_tenant(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-    tenant_id: uuid.UUID = Header(alias="X-Tenant-ID"),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    tenant_id: uuid.UUID = Header(alias=TENANT_HEADER),
 ) -> Tenant:
+    cached_tenant = await principal_cache.get_tenant(current_user.id, tenant_id)
+    if cached_tenant is not None:
+        return cached_tenant
 
-    tenant = await db.scalar(
+    membership = (
         select(Tenant)
         .join(TenantUser, Tenant.id == TenantUser.tenant_id)
         .where(
@@ -161,6 +313,11 @@ async def get_current_tenant(
             )
         )
     )
+    tenant = await db.scalar(membership)
+    if tenant is None and replica_name(db) is not None:
+        # Denials are not cached, but a fresh membership may still be replicating.
+        async with AsyncSessionLocal() as session:
+            tenant = await session.scalar(membership)
 
     if tenant is None:
         raise HTTPException(
@@ -168,4 +325,5 @@ async def get_current_tenant(
             detail="User does not have access to the specified tenant",
         )
 
+    await principal_cache.set_tenant(current_user.id, tenant)
     return tenant
@@ -1,21 +1,39 @@
 from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 
-from app.api.deps import get_application_service, get_current_tenant, rate_limit
+from app.api.deps import (
+    get_application_service,
+    get_current_tenant,
+    get_read_application_service,
+    rate_limit,
+)
 from app.models.application import ApplicationStatus
 from app.models.tenant import Tenant
 from app.schemas.application import (
     ApplicationCreate,
     ApplicationDashboardResponse,
+    ApplicationImportResponse,
     ApplicationListParams,
     ApplicationResponse,
     ApplicationUpdate,
 )
+from app.services.application_import import ImportFormatError, row_parser
+from app.services.application_service import InvalidCursorError
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.post(
     "",
@@ -31,6 +49,30 @@ async def create_application(
     return await service.create_application(tenant.id, payload)
 
 
+@router.post(
+    "/bulk",
+    response_model=ApplicationImportResponse,
+    dependencies=[rate_limit(times=5, seconds=60)],
+)
+async def bulk_import_applications(
+    request: Request,
+    tenant: Tenant = Depends(get_current_tenant),
+    service: Any = Depends(get_application_service),
+) -> ApplicationImportResponse:
+    parse_rows = row_parser(request.headers.get("content-type", ""))
+    if parse_rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson",
+        )
+    try:
+        return await service.bulk_import_applications(
+            tenant.id, parse_rows(request.stream())
+        )
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
 @router.get(
     "/dashboard",
     response_model=ApplicationDashboardResponse,
@@ -49,8 +91,9 @@ async def dashboard_summary(
     dependencies=[rate_limit(times=60, seconds=60)],
 )
 async def list_applications(
+    response: Response,
     tenant: Tenant = Depends(get_current_tenant),
-    service: Any = Depends(get_application_service),
+    service: Any = Depends(get_read_application_service),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     status_filter: ApplicationStatus | None = Query(default=None, alias="status"),
@@ -59,6 +102,9 @@ async def list_applications(
         default="created_at"
     ),
     sort_order: Literal["asc", "desc"] = Query(default="desc"),
+    cursor: str | None = Query(default=None, min_length=1, max_length=512),
+    q: str | None = Query(default=None, min_length=1, max_length=200),
+    search_mode: Literal["prefix", "fulltext"] = Query(default="fulltext"),
 ) -> list[ApplicationResponse]:
     params = ApplicationListParams(
         limit=limit,
@@ -67,8 +113,18 @@ async def list_applications(
         company=company,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        q=q,
+        search_mode=search_mode,
     )
-    return await service.list_applications(tenant.id, params)
+    try:
+        page = await service.list_applications_page(tenant.id, params)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
 
 @router.get(
@@ -79,7 +135,7 @@ async def list_applications(
 async def get_application_by_id(
     application_id: UUID,
     tenant: Tenant = Depends(get_current_tenant),
-    service: Any = Depends(get_application_service),
+    service: Any = Depends(get_read_application_service),
 ) -> ApplicationResponse:
     application = await service.get_application_by_id(tenant.id, application_id)
     if application is None:
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_current_user
+from app.core.metrics import render_text
+from app.core.metrics_multiprocess import metrics_collector
+from app.db.instrumentation import query_instrumentation
+from app.schemas.metrics import QueryStatsResponse
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_PROCESS_HEADER = "X-Metrics-Process"
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    # Merging snapshots reads files; keep it off the event loop.
+    metrics = await run_in_threadpool(metrics_collector.collect)
+    return PlainTextResponse(render_text(metrics), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    "/queries",
+    response_model=list[QueryStatsResponse],
+    dependencies=[Depends(get_current_user)],
+    description=(
+        "Statement statistics of the one worker process that served the request, "
+        f"named in the {METRICS_PROCESS_HEADER} header."
+    ),
+)
+async def query_metrics(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+) -> list[QueryStatsResponse]:
+    response.headers[METRICS_PROCESS_HEADER] = metrics_collector.process_id
+    return [
+        QueryStatsResponse(**stats) for stats in query_instrumentation.summary(limit)
+    ]
@@ -0,0 +1,107 @@
+import asyncio
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.metrics import registry
+
+T = TypeVar("T")
+
+EXECUTOR_IN_FLIGHT = registry.gauge(
+    "executor_in_flight_tasks",
+    "Tasks running or queued on a bounded worker pool",
+    labelnames=("executor",),
+    aggregate="sum",
+)
+EXECUTOR_SATURATION = registry.gauge(
+    "executor_saturation_ratio",
+    "In-flight tasks divided by the pool's worker plus queue capacity",
+    labelnames=("executor",),
+)
+EXECUTOR_REJECTIONS = registry.counter(
+    "executor_rejections_total",
+    "Tasks rejected because the bounded worker pool was full",
+    labelnames=("executor",),
+)
+EXECUTOR_QUEUE_WAIT_SECONDS = registry.histogram(
+    "executor_queue_wait_seconds",
+    "Time a task waited for a free worker",
+    labelnames=("executor",),
+)
+
+
+_executors: "weakref.WeakSet[BoundedExecutor]" = weakref.WeakSet()
+
+
+class ExecutorOverloadedError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """Thread pool that rejects new work once its queue is full.
+
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more may
+    wait; anything beyond that raises :class:`ExecutorOverloadedError` instead of
+    piling up behind slow work.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+        _executors.add(self)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _record_in_flight(self) -> None:
+        EXECUTOR_IN_FLIGHT.set(self._in_flight, executor=self.name)
+        EXECUTOR_SATURATION.set(self._in_flight / self.capacity, executor=self.name)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=self.name
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        if self._in_flight >= self.capacity:
+            EXECUTOR_REJECTIONS.inc(executor=self.name)
+            raise ExecutorOverloadedError(f"{self.name} executor is saturated")
+
+        submitted_at = time.perf_counter()
+
+        def _call() -> T:
+            EXECUTOR_QUEUE_WAIT_SECONDS.observe(
+                time.perf_counter() - submitted_at, executor=self.name
+            )
+            return func(*args)
+
+        self._in_flight += 1
+        self._record_in_flight()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), _call)
+        finally:
+            self._in_flight -= 1
+            self._record_in_flight()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def shutdown_executors() -> None:
+    for executor in list(_executors):
+        executor.shutdown()
@@ -0,0 +1,93 @@
+import logging
+import uuid
+
+import redis.asyncio as redis
+
+from app.core.metrics import registry
+from app.core.redis import LuaScript
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE_HELD = registry.gauge(
+    "leader_lease_held",
+    "1 while this process holds the named leader lease",
+    labelnames=("name",),
+)
+
+# KEYS: lease key. ARGV: owner token, ttl in ms.
+# Renews the lease for its holder, takes it when free, and refuses otherwise.
+ACQUIRE_LEASE_SCRIPT = LuaScript(
+    """
+local holder = redis.call('GET', KEYS[1])
+if holder == ARGV[1] then
+  redis.call('PEXPIRE', KEYS[1], ARGV[2])
+  return 1
+end
+if not holder then
+  redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+  return 1
+end
+return 0
+"""
+)
+
+# KEYS: lease key. ARGV: owner token.
+RELEASE_LEASE_SCRIPT = LuaScript(
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+)
+
+
+class LeaderLease:
+    """Redis lease that elects one holder among processes sharing ``name``.
+
+    Call :meth:`acquire` more often than ``ttl_seconds`` to keep the lease; a
+    holder that stops renewing loses it when the key expires, and another
+    process takes over on its next attempt.
+    """
+
+    def __init__(self, redis_client: redis.Redis, name: str, ttl_seconds: float):
+        self.redis_client = redis_client
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.token = uuid.uuid4().hex
+        self.is_leader = False
+
+    @property
+    def key(self) -> str:
+        return f"leader:{self.name}"
+
+    def _record(self, is_leader: bool) -> bool:
+        if is_leader != self.is_leader:
+            logger.info(
+                "%s leader lease %s", self.name, "acquired" if is_leader else "lost"
+            )
+        self.is_leader = is_leader
+        LEADER_LEASE_HELD.set(1 if is_leader else 0, name=self.name)
+        return is_leader
+
+    async def acquire(self) -> bool:
+        """Take or renew the lease; returns whether this process now holds it."""
+        try:
+            acquired = await ACQUIRE_LEASE_SCRIPT(
+                self.redis_client,
+                [self.key],
+                [self.token, int(self.ttl_seconds * 1000)],
+            )
+        except redis.RedisError:
+            logger.warning("%s leader lease check failed", self.name, exc_info=True)
+            return self._record(False)
+        return self._record(bool(acquired))
+
+    async def release(self) -> None:
+        if not self.is_leader:
+            return
+        try:
+            await RELEASE_LEASE_SCRIPT(self.redis_client, [self.key], [self.token])
+        except redis.RedisError:
+            logger.warning("%s leader lease release failed", self.name, exc_info=True)
+        self._record(False)
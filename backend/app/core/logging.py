@@ -1,20 +1,103 @@
+import atexit
+import copy
 import json
 import logging
+import os
+import queue
+import random
 import sys
+import zlib
+from collections.abc import Callable, Mapping
 from contextvars import ContextVar
 from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from app.core.metrics import registry
+from app.core.tracing import current_span
 
 _request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 
+LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
+LOG_QUEUE_MAX_SIZE = int(os.getenv("LOG_QUEUE_MAX_SIZE", "10000"))
+LOG_SERIALIZER = os.getenv("LOG_SERIALIZER", "auto").strip().lower()
+# Comma-separated ``logger=rate`` pairs, e.g. ``app.middleware.request_id=0.1``.
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped by sampling or because the log queue was full",
+    labelnames=("reason",),
+)
+
+Serializer = Callable[[dict[str, Any]], str]
+
 
 class RequestIDFilter(logging.Filter):
-    """Stamps every log record with the current request_id from context."""
+    """Stamps every log record with the current request_id from context.
+
+    Inside a trace, records also get the trace and span ids.
+    """
 
     def filter(self, record: logging.LogRecord) -> bool:
         record.request_id = _request_id_var.get() or None  # type: ignore[attr-defined]
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.context.trace_id  # type: ignore[attr-defined]
+            record.span_id = span.context.span_id  # type: ignore[attr-defined]
         return True
 
 
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO and lower records per logger name prefix.
+
+    Records of one request are kept or dropped together, so a sampled request
+    still has both its start and completion lines. Warnings and errors are
+    never sampled.
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        # Longest prefix first, so the most specific logger rate wins.
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate >= 1:
+            return True
+
+        request_id = _request_id_var.get()
+        if request_id:
+            keep = zlib.crc32(request_id.encode()) % 10_000 < rate * 10_000
+        else:
+            keep = random.random() < rate
+        if not keep:
+            LOG_RECORDS_DROPPED.inc(reason="sampled")
+        return keep
+
+
+def parse_sample_rates(raw: str) -> dict[str, float]:
+    rates = {}
+    for item in raw.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
 class RequestLoggerAdapter(logging.LoggerAdapter):
     def process(self, msg, kwargs):
         extra = kwargs.setdefault("extra", {})
@@ -28,10 +111,44 @@ _RESERVED_LOG_ATTRS = frozenset(
 )
 
 
+def _json_dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, default=str)
+
+
+def get_serializer(name: str = LOG_SERIALIZER) -> Serializer:
+    """Return the JSON serializer for log lines: ``json``, ``orjson`` or ``auto``.
+
+    ``auto`` uses orjson when it is installed and the standard library
+    otherwise.
+    """
+    if name == "json":
+        return _json_dumps
+    if name not in {"auto", "orjson"}:
+        raise ValueError(f"Unknown log serializer {name!r}")
+
+    try:
+        import orjson
+    except ImportError:
+        if name == "orjson":
+            raise
+        return _json_dumps
+
+    def _orjson_dumps(payload: dict[str, Any]) -> str:
+        return orjson.dumps(
+            payload, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    return _orjson_dumps
+
+
 class JsonFormatter(logging.Formatter):
+    def __init__(self, serializer: Serializer | None = None):
+        super().__init__()
+        self.serializer = serializer or _json_dumps
+
     def format(self, record):
         log_record = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -47,22 +164,94 @@ class JsonFormatter(logging.Formatter):
 
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record["exception"] = record.exc_text
+
+        return self.serializer(log_record)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queues records for a background listener, dropping them when full.
+
+    Only message interpolation and traceback rendering happen on the calling
+    thread; JSON formatting and the write happen on the listener's thread.
+    """
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        prepared = copy.copy(record)
+        prepared.message = record.getMessage()
+        prepared.msg = prepared.message
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = self._traceback_formatter.formatException(
+                record.exc_info
+            )
+        # Tracebacks keep frames alive; the rendered text is all that is needed.
+        prepared.exc_info = None
+        return prepared
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+
+
+_listener: QueueListener | None = None
+
 
-        return json.dumps(log_record)
+def shutdown_logging() -> None:
+    """Stop the background log listener after it writes what is queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
-def setup_logging():
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(JsonFormatter())
-    handler.addFilter(RequestIDFilter())
+def setup_logging(
+    use_queue: bool = LOG_QUEUE_ENABLED,
+    serializer: Serializer | None = None,
+    sample_rates: Mapping[str, float] | None = None,
+    stream=None,
+):
+    global _listener
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter(serializer or get_serializer()))
+
+    rates = (
+        parse_sample_rates(LOG_SAMPLE_RATES) if sample_rates is None else sample_rates
+    )
+    # Filters read context vars, so they run on the caller's thread before the
+    # record is queued.
+    filters: list[logging.Filter] = [RequestIDFilter()]
+    if rates:
+        filters.append(SamplingFilter(rates))
+
+    root_handler: logging.Handler = handler
+    if use_queue:
+        records: queue.Queue[logging.LogRecord] = queue.Queue(
+            maxsize=max(0, LOG_QUEUE_MAX_SIZE)
+        )
+        root_handler = NonBlockingQueueHandler(records)
+        _listener = QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+    for log_filter in filters:
+        root_handler.addFilter(log_filter)
 
     logger = logging.getLogger()
     logger.handlers.clear()
     logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
+    logger.addHandler(root_handler)
     logger.propagate = False
 
 
+atexit.register(shutdown_logging)
+
+
 def get_logger(
     name: str, request_id: str | None = None
 ) -> logging.Logger | RequestLoggerAdapter:
@@ -0,0 +1,415 @@
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+# How gauges from several processes combine into one value per label set.
+GAUGE_AGGREGATIONS = ("max", "min", "sum")
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        if len(labels) != len(self.labelnames) or set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, "
+                f"got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        aggregate: str = "max",
+    ):
+        if aggregate not in GAUGE_AGGREGATIONS:
+            raise ValueError(f"Unknown gauge aggregation {aggregate!r}")
+        super().__init__(name, description, labelnames)
+        self.aggregate = aggregate
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+@dataclass
+class HistogramSample:
+    bucket_counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._samples: dict[LabelValues, HistogramSample] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = HistogramSample(bucket_counts=[0] * len(self.buckets))
+                self._samples[key] = sample
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    sample.bucket_counts[index] += 1
+            sample.sum += value
+            sample.count += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def sample(self, **labels: object) -> HistogramSample | None:
+        return self._samples.get(self._key(labels))
+
+    def quantile(self, q: float, **labels: object) -> float | None:
+        """Estimate the ``q`` quantile by interpolating within its bucket.
+
+        Matches Prometheus ``histogram_quantile``: values past the last bucket
+        are reported as its upper bound.
+        """
+        sample = self.sample(**labels)
+        if sample is None or sample.count == 0:
+            return None
+
+        rank = q * sample.count
+        lower_bound, lower_count = 0.0, 0
+        for upper_bound, cumulative in zip(self.buckets, sample.bucket_counts):
+            if cumulative >= rank:
+                in_bucket = cumulative - lower_count
+                if in_bucket == 0:
+                    return upper_bound
+                return lower_bound + (upper_bound - lower_bound) * (
+                    (rank - lower_count) / in_bucket
+                )
+            lower_bound, lower_count = upper_bound, cumulative
+        return self.buckets[-1] if self.buckets else None
+
+    def samples(self) -> dict[LabelValues, HistogramSample]:
+        with self._lock:
+            return {
+                key: HistogramSample(
+                    bucket_counts=list(sample.bucket_counts),
+                    sum=sample.sum,
+                    count=sample.count,
+                )
+                for key, sample in self._samples.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+Metric = Counter | Gauge | Histogram
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: Sequence[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value))
+
+
+def render_text(metrics: Iterable[Metric]) -> str:
+    """Render metrics in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if isinstance(metric, Histogram):
+            for key, sample in sorted(metric.samples().items()):
+                pairs = list(zip(metric.labelnames, key))
+                for upper_bound, cumulative in zip(
+                    metric.buckets, sample.bucket_counts
+                ):
+                    bucket_labels = _format_labels(
+                        [*pairs, ("le", _format_value(upper_bound))]
+                    )
+                    lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(
+                    f"{metric.name}_bucket"
+                    f"{_format_labels([*pairs, ('le', '+Inf')])} {sample.count}"
+                )
+                labels = _format_labels(pairs)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(sample.sum)}")
+                lines.append(f"{metric.name}_count{labels} {sample.count}")
+        else:
+            for key, value in sorted(metric.samples().items()):
+                labels = _format_labels(list(zip(metric.labelnames, key)))
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot_metrics(metrics: Iterable[Metric]) -> list[dict[str, Any]]:
+    """Dump metric definitions and values as JSON-compatible dicts."""
+    snapshot: list[dict[str, Any]] = []
+    for metric in metrics:
+        entry: dict[str, Any] = {
+            "name": metric.name,
+            "kind": metric.kind,
+            "description": metric.description,
+            "labelnames": list(metric.labelnames),
+        }
+        if isinstance(metric, Histogram):
+            entry["buckets"] = list(metric.buckets)
+            entry["samples"] = [
+                [list(key), sample.bucket_counts, sample.sum, sample.count]
+                for key, sample in metric.samples().items()
+            ]
+        else:
+            if isinstance(metric, Gauge):
+                entry["aggregate"] = metric.aggregate
+            entry["samples"] = [
+                [list(key), value] for key, value in metric.samples().items()
+            ]
+        snapshot.append(entry)
+    return snapshot
+
+
+def _metric_from_entry(entry: dict[str, Any]) -> Metric:
+    name, description = entry["name"], entry["description"]
+    if entry["kind"] == "counter":
+        return Counter(name, description, entry["labelnames"])
+    if entry["kind"] == "gauge":
+        return Gauge(name, description, entry["labelnames"], entry["aggregate"])
+    return Histogram(name, description, entry["labelnames"], entry["buckets"])
+
+
+def merge_snapshots(
+    snapshots: Iterable[tuple[list[dict[str, Any]], bool]],
+) -> list[Metric]:
+    """Combine per-process snapshots into one set of metrics.
+
+    Each snapshot comes with whether its process is still alive. Counters and
+    histograms are summed across every process, so totals survive worker
+    restarts. Gauges describe current state, so only live processes count,
+    combined with the gauge's ``aggregate`` function. A metric whose
+    definition differs between processes keeps the first one seen and skips
+    the rest.
+    """
+    merged: dict[str, Metric] = {}
+    gauge_values: dict[str, dict[LabelValues, list[float]]] = {}
+    for snapshot, alive in snapshots:
+        for entry in snapshot:
+            metric = merged.get(entry["name"])
+            if metric is None:
+                metric = merged[entry["name"]] = _metric_from_entry(entry)
+            if metric.kind != entry["kind"] or list(metric.labelnames) != list(
+                entry["labelnames"]
+            ):
+                continue
+
+            if isinstance(metric, Counter):
+                for key, value in entry["samples"]:
+                    key = tuple(key)
+                    metric._values[key] = metric._values.get(key, 0.0) + value
+            elif isinstance(metric, Gauge):
+                values = gauge_values.setdefault(metric.name, {})
+                if alive:
+                    for key, value in entry["samples"]:
+                        values.setdefault(tuple(key), []).append(value)
+            elif list(metric.buckets) == list(entry["buckets"]):
+                for key, bucket_counts, total, count in entry["samples"]:
+                    key = tuple(key)
+                    sample = metric._samples.get(key)
+                    if sample is None:
+                        sample = HistogramSample(bucket_counts=[0] * len(bucket_counts))
+                        metric._samples[key] = sample
+                    for index, bucket_count in enumerate(bucket_counts):
+                        sample.bucket_counts[index] += bucket_count
+                    sample.sum += total
+                    sample.count += count
+
+    combine: dict[str, Callable[[list[float]], float]] = {
+        "max": max,
+        "min": min,
+        "sum": sum,
+    }
+    for name, values in gauge_values.items():
+        gauge = merged[name]
+        assert isinstance(gauge, Gauge)
+        for key, per_process in values.items():
+            gauge._values[key] = float(combine[gauge.aggregate](per_process))
+    return list(merged.values())
+
+
+class MetricsRegistry:
+    """Process-local registry of named counters, gauges and histograms."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_type: type, name: str, factory) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_type):
+                    raise ValueError(
+                        f"Metric {name} is already registered as {existing.kind}"
+                    )
+                return existing
+
+            metric = factory()
+            self._metrics[name] = metric
+            return metric
+
+    def counter(
+        self, name: str, description: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        metric = self._get_or_create(
+            Counter, name, lambda: Counter(name, description, labelnames)
+        )
+        assert isinstance(metric, Counter)
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        aggregate: str = "max",
+    ) -> Gauge:
+        metric = self._get_or_create(
+            Gauge, name, lambda: Gauge(name, description, labelnames, aggregate)
+        )
+        assert isinstance(metric, Gauge)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._get_or_create(
+            Histogram,
+            name,
+            lambda: Histogram(name, description, labelnames, buckets),
+        )
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def metrics(self) -> list[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def reset(self) -> None:
+        for metric in self.metrics():
+            metric.reset()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,199 @@
+"""Aggregate metrics across worker processes through a shared directory.
+
+Each process keeps updating its in-memory registry and periodically writes a
+snapshot of it to ``METRICS_MULTIPROC_DIR``. A scrape of any process merges
+every snapshot in the directory, so ``/metrics`` reports the whole
+deployment no matter which uvicorn worker or reminder worker answers.
+"""
+
+import atexit
+import contextlib
+import fcntl
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from app.core.metrics import (
+    Metric,
+    MetricsRegistry,
+    merge_snapshots,
+    registry,
+    snapshot_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "5"))
+
+SNAPSHOT_SUFFIX = ".metrics.json"
+EXITED_SNAPSHOT = "exited.json"
+LOCK_FILE = ".lock"
+
+
+class MultiprocessCollector:
+    """Writes this process's snapshot and merges everyone else's on scrape.
+
+    Writes happen on a background thread every ``flush_interval_seconds``,
+    never on the request path. A process folds its counters and histograms
+    into the shared exited snapshot when it stops, so totals never go down;
+    one not rewritten for three intervals belongs to a process that died
+    without doing so, and is folded on the next scrape. Gauges of exited
+    processes are dropped.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: str = METRICS_MULTIPROC_DIR,
+        flush_interval_seconds: float = METRICS_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.registry = registry
+        self.directory = Path(directory) if directory else None
+        self.flush_interval_seconds = flush_interval_seconds
+        self.hostname = socket.gethostname()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    @property
+    def process_id(self) -> str:
+        # Read the pid each time: uvicorn forks its workers after import.
+        # With the host name, containers sharing the directory never clash.
+        return f"{self.hostname}-{os.getpid()}"
+
+    @property
+    def path(self) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{self.process_id}{SNAPSHOT_SUFFIX}"
+
+    def write(self) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {
+                "process": self.process_id,
+                "written_at": time.time(),
+                "metrics": snapshot_metrics(self.registry.metrics()),
+            }
+        )
+        # Write then rename, so readers never see a half-written snapshot.
+        staging = self.path.with_suffix(".tmp")
+        staging.write_text(payload)
+        os.replace(staging, self.path)
+
+    def _read(self, path: Path) -> dict[str, Any] | None:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Skipping unreadable metrics snapshot %s", path)
+            return None
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[Path]:
+        # Folding a snapshot rewrites the exited totals and deletes the file;
+        # a scrape between the two steps would count it twice.
+        assert self.directory is not None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield self.directory
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _fold(self, directory: Path, metrics: list[dict[str, Any]]) -> None:
+        exited_path = directory / EXITED_SNAPSHOT
+        exited = self._read(exited_path)
+        snapshots = [(metrics, False)]
+        if exited is not None:
+            snapshots.append((exited["metrics"], False))
+        payload = json.dumps(
+            {
+                "process": "exited",
+                "written_at": time.time(),
+                "metrics": snapshot_metrics(merge_snapshots(snapshots)),
+            }
+        )
+        staging = exited_path.with_suffix(".tmp")
+        staging.write_text(payload)
+        os.replace(staging, exited_path)
+
+    def collect(self) -> list[Metric]:
+        """Return metrics merged across every process sharing the directory."""
+        if self.directory is None:
+            return self.registry.metrics()
+
+        self.write()
+        stale_before = time.time() - 3 * self.flush_interval_seconds
+        snapshots = []
+        with self._locked() as directory:
+            for path in sorted(directory.glob(f"*{SNAPSHOT_SUFFIX}")):
+                snapshot = self._read(path)
+                if snapshot is None:
+                    continue
+                if snapshot["written_at"] < stale_before:
+                    self._fold(directory, snapshot["metrics"])
+                    self._remove(path)
+                    continue
+                snapshots.append((snapshot["metrics"], True))
+            exited = self._read(directory / EXITED_SNAPSHOT)
+        if exited is not None:
+            snapshots.append((exited["metrics"], False))
+        return merge_snapshots(snapshots)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Removing metrics snapshot %s failed", path, exc_info=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            try:
+                self.write()
+            except OSError:
+                logger.exception("Writing metrics snapshot failed")
+
+    def start(self) -> None:
+        if self.directory is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self.write()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-snapshot", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self.directory is None:
+            return
+        try:
+            with self._locked() as directory:
+                # Only a process with a live snapshot has totals left to fold;
+                # stop() also runs at exit after the lifespan already stopped.
+                if self.path.exists():
+                    self._fold(directory, snapshot_metrics(self.registry.metrics()))
+                    self._remove(self.path)
+        except OSError:
+            logger.exception("Folding metrics snapshot into exited totals failed")
+
+
+metrics_collector = MultiprocessCollector(registry)
+atexit.register(metrics_collector.stop)
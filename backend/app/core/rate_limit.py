@@ -0,0 +1,328 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import redis.asyncio as redis
+
+from app.core.metrics import registry
+from app.core.redis import LuaScript
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_SYNC_INTERVAL_SECONDS = float(
+    os.getenv("RATE_LIMIT_SYNC_INTERVAL_SECONDS", "0.5")
+)
+RATE_LIMIT_LOCAL_FRACTION = float(os.getenv("RATE_LIMIT_LOCAL_FRACTION", "0.5"))
+RATE_LIMIT_REDIS_TIMEOUT_SECONDS = float(
+    os.getenv("RATE_LIMIT_REDIS_TIMEOUT_SECONDS", "0.1")
+)
+RATE_LIMIT_REDIS_RETRY_SECONDS = float(os.getenv("RATE_LIMIT_REDIS_RETRY_SECONDS", "5"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_KEY_PREFIX = "ratelimit"
+
+RATE_LIMIT_DECISIONS = registry.counter(
+    "rate_limit_decisions_total",
+    "Rate limit decisions by where they were made (local or redis) and outcome",
+    labelnames=("source", "outcome"),
+)
+RATE_LIMIT_SYNCS = registry.counter(
+    "rate_limit_syncs_total",
+    "Rate limit counter syncs with Redis by mode (batch or inline) and outcome",
+    labelnames=("mode", "outcome"),
+)
+RATE_LIMIT_DEGRADED = registry.gauge(
+    "rate_limit_degraded",
+    "1 while rate limits are enforced per process because Redis is unavailable",
+)
+
+# KEYS: current and previous window of each limit, in pairs.
+# ARGV: per limit, hits to add to the current and previous window and the
+# counters' ttl in ms. Returns the resulting current and previous counts.
+SYNC_WINDOWS_SCRIPT = LuaScript(
+    """
+local counts = {}
+for i = 1, #KEYS, 2 do
+  local arg = (i - 1) / 2 * 3
+  local ttl_ms = tonumber(ARGV[arg + 3])
+  local current = tonumber(ARGV[arg + 1])
+  local previous = tonumber(ARGV[arg + 2])
+  if current > 0 then
+    current = redis.call('INCRBY', KEYS[i], current)
+    redis.call('PEXPIRE', KEYS[i], ttl_ms)
+  else
+    current = tonumber(redis.call('GET', KEYS[i]) or '0')
+  end
+  if previous > 0 then
+    previous = redis.call('INCRBY', KEYS[i + 1], previous)
+    redis.call('PEXPIRE', KEYS[i + 1], ttl_ms)
+  else
+    previous = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+  end
+  counts[#counts + 1] = current
+  counts[#counts + 1] = previous
+end
+return counts
+"""
+)
+
+
+class RateLimitDecision(NamedTuple):
+    allowed: bool
+    retry_after_seconds: int = 0
+
+
+@dataclass
+class _Window:
+    """Sliding-window state of one limit key in this process.
+
+    Counts are kept for the current and previous fixed window. ``local`` counts
+    this process's hits, ``remote`` the cluster-wide count at the last sync and
+    ``pending`` the hits not yet sent to Redis, by window index.
+    """
+
+    seconds: float
+    index: int
+    local_current: int = 0
+    local_previous: int = 0
+    remote_current: int = 0
+    remote_previous: int = 0
+    pending: dict[int, int] = field(default_factory=dict)
+    synced: bool = False
+
+    def roll(self, now: float) -> None:
+        index = int(now // self.seconds)
+        if index == self.index:
+            return
+        if index == self.index + 1:
+            self.local_previous = self.local_current
+            self.remote_previous = self.remote_current
+        else:
+            self.local_previous = self.remote_previous = 0
+        self.local_current = self.remote_current = 0
+        self.index = index
+        for stale in [i for i in self.pending if i < index - 1]:
+            del self.pending[stale]
+
+    def counts(self) -> tuple[int, int]:
+        current = max(
+            self.local_current,
+            self.remote_current + self.pending.get(self.index, 0),
+        )
+        previous = max(
+            self.local_previous,
+            self.remote_previous + self.pending.get(self.index - 1, 0),
+        )
+        return current, previous
+
+    def elapsed(self, now: float) -> float:
+        return now / self.seconds - self.index
+
+    def estimate(self, now: float) -> float:
+        current, previous = self.counts()
+        return previous * (1 - self.elapsed(now)) + current
+
+    def retry_after(self, limit: int, now: float) -> int:
+        """Seconds until the estimate leaves room for one more hit."""
+        current, previous = self.counts()
+        elapsed = self.elapsed(now)
+        if limit <= 0:
+            wait = 1 - elapsed
+        elif current + 1 > limit:
+            # Once this window becomes the previous one, its weight has to
+            # drop far enough for the count to fit.
+            wait = 1 - elapsed + max(0.0, 1 - (limit - 1) / current)
+        else:
+            wait = 1 - (limit - 1 - current) / previous - elapsed
+        # Round away float noise so a whole number of seconds stays whole.
+        return max(1, math.ceil(round(wait * self.seconds, 6)))
+
+    def add_hit(self) -> None:
+        self.local_current += 1
+        self.pending[self.index] = self.pending.get(self.index, 0) + 1
+
+    def take_pending(self) -> dict[int, int]:
+        taken, self.pending = self.pending, {}
+        return taken
+
+    def restore_pending(self, taken: dict[int, int]) -> None:
+        for index, hits in taken.items():
+            if index >= self.index - 1:
+                self.pending[index] = self.pending.get(index, 0) + hits
+
+    def apply_remote(self, index: int, current: int, previous: int) -> None:
+        self.synced = True
+        if index == self.index:
+            self.remote_current = current
+            self.remote_previous = previous
+        elif index == self.index - 1:
+            self.remote_previous = current
+
+
+class RateLimiter:
+    """Sliding-window rate limiter with per-process counters synced to Redis.
+
+    Each limit key is estimated from the previous and current fixed windows,
+    weighting the previous one by how much of it still overlaps the sliding
+    window. Hits are counted locally and sent to Redis in batches by
+    :meth:`run`, which also brings back the counts of other workers. Only the
+    first request for a key in this process and requests that take a key past
+    ``local_fraction`` of its limit check Redis before being answered, so most
+    requests never wait on a round trip.
+
+    Without Redis, or for ``redis_retry_seconds`` after a sync fails, limits
+    are enforced per process.
+    """
+
+    def __init__(
+        self,
+        sync_interval_seconds: float = RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+        local_fraction: float = RATE_LIMIT_LOCAL_FRACTION,
+        redis_timeout_seconds: float = RATE_LIMIT_REDIS_TIMEOUT_SECONDS,
+        redis_retry_seconds: float = RATE_LIMIT_REDIS_RETRY_SECONDS,
+        max_keys: int = RATE_LIMIT_MAX_KEYS,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.sync_interval_seconds = sync_interval_seconds
+        self.local_fraction = local_fraction
+        self.redis_timeout_seconds = redis_timeout_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+        self.max_keys = max_keys
+        # Wall-clock time, so every process agrees on window boundaries.
+        self.timer = timer
+        self.redis_client: redis.Redis | None = None
+        self._windows: OrderedDict[str, _Window] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._unavailable_until = 0.0
+        RATE_LIMIT_DEGRADED.set(1)
+
+    def configure(self, redis_client: redis.Redis | None) -> None:
+        self.redis_client = redis_client
+        self._unavailable_until = 0.0
+        RATE_LIMIT_DEGRADED.set(0 if redis_client is not None else 1)
+
+    @property
+    def degraded(self) -> bool:
+        return self.redis_client is None or time.monotonic() < self._unavailable_until
+
+    def reset(self) -> None:
+        self._windows.clear()
+        self._dirty.clear()
+
+    def _window(self, key: str, seconds: float, now: float) -> _Window:
+        window = self._windows.get(key)
+        if window is None:
+            window = _Window(seconds=seconds, index=int(now // seconds))
+            self._windows[key] = window
+            if len(self._windows) > self.max_keys:
+                evicted, _ = self._windows.popitem(last=False)
+                self._dirty.discard(evicted)
+        else:
+            self._windows.move_to_end(key)
+            window.roll(now)
+        return window
+
+    async def hit(self, key: str, limit: int, seconds: float) -> RateLimitDecision:
+        """Count one hit against ``key`` unless it would exceed ``limit``."""
+        now = self.timer()
+        window = self._window(key, seconds, now)
+        source = "local"
+        # Syncing only ever raises the counts, so a local rejection is final.
+        estimate = window.estimate(now) + 1
+        near_limit = limit * self.local_fraction < estimate
+        if (
+            estimate <= limit
+            and (near_limit or not window.synced)
+            and not self.degraded
+        ):
+            # Other workers' hits decide the answer for a key this process
+            # has not seen yet or one close to its limit.
+            await self._sync([key], mode="inline")
+            source = "redis"
+            now = self.timer()
+            window.roll(now)
+
+        if window.estimate(now) + 1 > limit:
+            RATE_LIMIT_DECISIONS.inc(source=source, outcome="rejected")
+            return RateLimitDecision(False, window.retry_after(limit, now))
+
+        window.add_hit()
+        self._dirty.add(key)
+        RATE_LIMIT_DECISIONS.inc(source=source, outcome="allowed")
+        return RateLimitDecision(True)
+
+    def _redis_key(self, key: str, index: int) -> str:
+        return f"{RATE_LIMIT_KEY_PREFIX}:{key}:{index}"
+
+    async def _sync(self, keys: Iterable[str], mode: str) -> bool:
+        client = self.redis_client
+        if client is None:
+            return False
+
+        batch = []
+        redis_keys: list[str] = []
+        args: list[int] = []
+        for key in keys:
+            window = self._windows.get(key)
+            if window is None:
+                continue
+            taken = window.take_pending()
+            batch.append((window, window.index, taken))
+            redis_keys += [
+                self._redis_key(key, window.index),
+                self._redis_key(key, window.index - 1),
+            ]
+            args += [
+                taken.get(window.index, 0),
+                taken.get(window.index - 1, 0),
+                math.ceil(window.seconds * 2000),
+            ]
+        if not batch:
+            return True
+
+        try:
+            async with asyncio.timeout(self.redis_timeout_seconds):
+                counts = await SYNC_WINDOWS_SCRIPT(client, redis_keys, args)
+        except (redis.RedisError, OSError, TimeoutError):
+            for window, _, taken in batch:
+                window.restore_pending(taken)
+            RATE_LIMIT_SYNCS.inc(mode=mode, outcome="error")
+            if not self.degraded:
+                logger.warning(
+                    "Rate limit sync with Redis failed; enforcing limits per "
+                    "process for %ss",
+                    self.redis_retry_seconds,
+                    exc_info=True,
+                )
+            self._unavailable_until = time.monotonic() + self.redis_retry_seconds
+            RATE_LIMIT_DEGRADED.set(1)
+            return False
+
+        for position, (window, index, _) in enumerate(batch):
+            current, previous = counts[2 * position], counts[2 * position + 1]
+            window.apply_remote(index, int(current), int(previous))
+        RATE_LIMIT_SYNCS.inc(mode=mode, outcome="success")
+        RATE_LIMIT_DEGRADED.set(0)
+        return True
+
+    async def flush(self) -> None:
+        """Send pending hits to Redis and refresh the counts of their keys."""
+        if self.degraded:
+            return
+        keys, self._dirty = self._dirty, set()
+        if not await self._sync(keys, mode="batch"):
+            self._dirty |= keys
+
+    async def run(self) -> None:
+        """Flush every ``sync_interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(self.sync_interval_seconds)
+            await self.flush()
+
+
+rate_limiter = RateLimiter()
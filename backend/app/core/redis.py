@@ -0,0 +1,131 @@
+import os
+import time
+from collections.abc import Sequence
+from hashlib import sha1
+from typing import Any
+
+import redis.asyncio as redis
+from redis.asyncio.connection import AbstractConnection
+from redis.exceptions import NoScriptError
+
+from app.core.metrics import registry
+from app.core.tracing import tracer
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT_SECONDS = float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5"))
+
+REDIS_POOL_MAX_CONNECTIONS = registry.gauge(
+    "redis_pool_max_connections",
+    "Configured maximum size of the shared Redis connection pool",
+    aggregate="sum",
+)
+REDIS_POOL_IN_USE_CONNECTIONS = registry.gauge(
+    "redis_pool_in_use_connections",
+    "Redis connections currently checked out of the shared pool",
+    aggregate="sum",
+)
+REDIS_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "redis_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the shared Redis pool",
+)
+REDIS_COMMAND_DURATION_SECONDS = registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency, including pool checkout, by command name",
+    labelnames=("command",),
+    buckets=(
+        0.0001,
+        0.00025,
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        1.0,
+    ),
+)
+REDIS_COMMAND_ERRORS = registry.counter(
+    "redis_command_errors_total",
+    "Redis commands that raised, by command name",
+    labelnames=("command",),
+)
+
+
+def redis_url() -> str:
+    return os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking pool that records checkout wait time and in-use connections."""
+
+    async def get_connection(self, *args, **kwargs) -> AbstractConnection:
+        start = time.perf_counter()
+        connection = await super().get_connection(*args, **kwargs)
+        REDIS_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+        REDIS_POOL_IN_USE_CONNECTIONS.set(len(self._in_use_connections))
+        return connection
+
+    async def release(self, connection: AbstractConnection) -> None:
+        await super().release(connection)
+        REDIS_POOL_IN_USE_CONNECTIONS.set(len(self._in_use_connections))
+
+
+def create_redis_pool(url: str | None = None) -> InstrumentedConnectionPool:
+    pool = InstrumentedConnectionPool.from_url(
+        url or redis_url(),
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
+        encoding="utf-8",
+        decode_responses=True,
+    )
+    REDIS_POOL_MAX_CONNECTIONS.set(REDIS_MAX_CONNECTIONS)
+    return pool
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client that records the latency of every command it runs."""
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        with tracer.span(
+            f"redis {command}",
+            kind="client",
+            attributes={"db.system": "redis", "db.operation": command},
+            root=False,
+        ):
+            start = time.perf_counter()
+            try:
+                return await super().execute_command(*args, **options)
+            except Exception:
+                REDIS_COMMAND_ERRORS.inc(command=command)
+                raise
+            finally:
+                REDIS_COMMAND_DURATION_SECONDS.observe(
+                    time.perf_counter() - start, command=command
+                )
+
+
+def create_redis_client(pool: redis.ConnectionPool) -> InstrumentedRedis:
+    return InstrumentedRedis(connection_pool=pool)
+
+
+class LuaScript:
+    """Server-side script run by SHA, loading the source on first use."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = sha1(source.encode("utf-8")).hexdigest()
+
+    async def __call__(
+        self,
+        client: redis.Redis,
+        keys: Sequence[str],
+        args: Sequence[str | int] = (),
+    ) -> Any:
+        try:
+            return await client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            return await client.eval(self.source, len(keys), *keys, *args)
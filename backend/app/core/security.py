@@ -7,6 +7,8 @@ from uuid import uuid4
 from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.executor import BoundedExecutor
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -22,6 +24,16 @@ REFRESH_SECRET = _get_required_env("JWT_REFRESH_SECRET")
 ALGORITHM = _get_required_env("JWT_ALGORITHM")
 ACCESS_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_EXPIRE_MINUTES", 15))
 REFRESH_EXPIRE_MINUTES = int(os.getenv("JWT_REFRESH_EXPIRE_MINUTES", 1440))
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop without the cost of a process pool.
+password_executor = BoundedExecutor(
+    "password_hash", PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE
+)
 
 
 def hash_password(password: str) -> str:
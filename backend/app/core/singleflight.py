@@ -0,0 +1,45 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """Collapses concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key runs ``func``; callers arriving while it is
+    still running await the same result (or exception) instead of repeating
+    the work.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Future[T]] = {}
+
+    def in_flight(self, key: K) -> bool:
+        return key in self._calls
+
+    async def run(self, key: K, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, shared)``; ``shared`` is true for coalesced callers."""
+        existing = self._calls.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing), True
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved so a call nobody joined stays quiet.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
@@ -0,0 +1,410 @@
+import atexit
+import functools
+import importlib
+import inspect
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple, TextIO, TypeVar
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+TRACING_QUEUE_MAX_SIZE = int(os.getenv("TRACING_QUEUE_MAX_SIZE", "2048"))
+TRACING_BATCH_SIZE = int(os.getenv("TRACING_BATCH_SIZE", "256"))
+TRACING_EXPORT_INTERVAL_SECONDS = float(
+    os.getenv("TRACING_EXPORT_INTERVAL_SECONDS", "1")
+)
+
+TRACEPARENT_HEADER = "traceparent"
+
+TRACING_SPANS_EXPORTED = registry.counter(
+    "tracing_spans_exported_total",
+    "Finished spans handed to the trace exporter",
+)
+TRACING_SPANS_DROPPED = registry.counter(
+    "tracing_spans_dropped_total",
+    "Finished spans dropped because the export queue was full or export failed",
+    labelnames=("reason",),
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TRACEPARENT = re.compile(
+    r"^(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-"
+    r"(?P<span_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})(?:-.*)?$"
+)
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """Parse a W3C ``traceparent`` header, returning None if it is invalid."""
+    header = (value or "").strip().lower()
+    match = _TRACEPARENT.match(header)
+    if match is None:
+        return None
+    version = match["version"]
+    if version == "ff" or (version == "00" and len(header) != 55):
+        return None
+    if match["trace_id"] == _INVALID_TRACE_ID or match["span_id"] == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(
+        match["trace_id"], match["span_id"], bool(int(match["flags"], 16) & 1)
+    )
+
+
+def format_traceparent(context: SpanContext) -> str:
+    flags = "01" if context.sampled else "00"
+    return f"00-{context.trace_id}-{context.span_id}-{flags}"
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "context",
+        "parent_id",
+        "kind",
+        "attributes",
+        "start_time_ns",
+        "end_time_ns",
+        "status",
+        "_tracer",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer | None",
+        name: str,
+        context: SpanContext,
+        parent_id: str | None = None,
+        kind: str = "internal",
+        attributes: Mapping[str, Any] | None = None,
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: int | None = None
+        self.status = "ok"
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled and self._tracer is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.recording:
+            self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        if self.recording:
+            self.status = "error"
+            self.attributes["exception.type"] = type(exc).__name__
+            self.attributes["exception.message"] = str(exc)
+
+    def end(self) -> None:
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        if self.recording:
+            assert self._tracer is not None
+            self._tracer._on_end(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        end_time_ns = self.end_time_ns or time.time_ns()
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": end_time_ns,
+            "duration_ms": round((end_time_ns - self.start_time_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def inject_trace_context(headers: MutableMapping[str, str]) -> MutableMapping[str, str]:
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = format_traceparent(span.context)
+    return headers
+
+
+class SpanExporter(ABC):
+    # export() runs on the tracer's background thread, so it may block.
+    @abstractmethod
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None:
+        return None
+
+
+class StreamSpanExporter(SpanExporter):
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+
+    def export(self, spans: Sequence[Span]) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(
+            "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        )
+        stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    def __init__(self, path: str = TRACING_FILE_PATH):
+        self.path = path
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(
+                json.dumps(span.to_dict(), default=str) + "\n" for span in spans
+            )
+
+
+class InMemorySpanExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def build_exporter(backend: str = TRACING_EXPORTER) -> SpanExporter | None:
+    backend = backend.strip()
+    if backend.lower() in {"", "none"}:
+        return None
+    if backend.lower() == "stdout":
+        return StreamSpanExporter()
+    if backend.lower() == "file":
+        return FileSpanExporter()
+    if backend.lower() == "memory":
+        return InMemorySpanExporter()
+    module_name, _, attribute = backend.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown TRACING_EXPORTER backend: {backend}")
+    factory = getattr(importlib.import_module(module_name), attribute)
+    return factory()
+
+
+_SHUTDOWN = object()
+
+
+class Tracer:
+    def __init__(
+        self,
+        exporter: SpanExporter | None = None,
+        sample_rate: float = TRACING_SAMPLE_RATE,
+        max_queue_size: int = TRACING_QUEUE_MAX_SIZE,
+        batch_size: int = TRACING_BATCH_SIZE,
+        export_interval_seconds: float = TRACING_EXPORT_INTERVAL_SECONDS,
+    ):
+        self.exporter = exporter
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.batch_size = max(1, batch_size)
+        self.export_interval_seconds = export_interval_seconds
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(0, max_queue_size))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def configure(
+        self, exporter: SpanExporter | None, sample_rate: float | None = None
+    ) -> None:
+        self.flush()
+        self.exporter = exporter
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+
+    def _sample(self, trace_id: str) -> bool:
+        # Decide from the trace id, so every service sampling at the same
+        # rate keeps the same traces.
+        return int(trace_id[16:], 16) < self.sample_rate * 2**64
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Mapping[str, Any] | None = None,
+        parent: SpanContext | None = None,
+        root: bool = True,
+    ) -> Span | None:
+        """Return None when nothing would be recorded.
+
+        With ``root=False`` no new trace is started without a parent span.
+        """
+        if self.exporter is None:
+            return None
+        if parent is None:
+            active = _current_span.get()
+            parent = active.context if active is not None else None
+        if parent is None:
+            if not root:
+                return None
+            trace_id = secrets.token_hex(16)
+            context = SpanContext(
+                trace_id, secrets.token_hex(8), self._sample(trace_id)
+            )
+            return Span(self, name, context, None, kind, attributes)
+        if not parent.sampled and not root:
+            return None
+        context = SpanContext(parent.trace_id, secrets.token_hex(8), parent.sampled)
+        return Span(self, name, context, parent.span_id, kind, attributes)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Mapping[str, Any] | None = None,
+        parent: SpanContext | None = None,
+        root: bool = True,
+    ) -> Iterator[Span | None]:
+        span = self.start_span(name, kind, attributes, parent, root)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _on_end(self, span: Span) -> None:
+        # Drop rather than block the request when the exporter falls behind.
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            TRACING_SPANS_DROPPED.inc(reason="queue_full")
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        args=(self._queue,),
+                        name="trace-exporter",
+                        daemon=True,
+                    )
+                    self._thread.start()
+
+    def _export(self, batch: list[Span]) -> None:
+        if not batch or self.exporter is None:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            TRACING_SPANS_DROPPED.inc(len(batch), reason="export_failed")
+            logger.warning("Exporting %s spans failed", len(batch), exc_info=True)
+        else:
+            TRACING_SPANS_EXPORTED.inc(len(batch))
+
+    def _run(self, spans: "queue.Queue[Any]") -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + self.export_interval_seconds
+        while True:
+            try:
+                item = spans.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is _SHUTDOWN:
+                # Spans that ended while the flush handed this queue off.
+                while True:
+                    try:
+                        batch.append(spans.get_nowait())
+                    except queue.Empty:
+                        break
+                for start in range(0, len(batch), self.batch_size):
+                    self._export(batch[start : start + self.batch_size])
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + self.export_interval_seconds
+
+    def flush(self) -> None:
+        # Each thread reads its own queue, so a thread started by a span
+        # ending mid-flush cannot take this one's shutdown marker.
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            spans, self._queue = self._queue, queue.Queue(maxsize=self._queue.maxsize)
+            spans.put(_SHUTDOWN)
+        thread.join()
+
+    def shutdown(self) -> None:
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer(build_exporter())
+atexit.register(tracer.shutdown)
+
+
+def traced(
+    name: str | None = None, kind: str = "internal", root: bool = True
+) -> Callable[[F], F]:
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with tracer.span(span_name, kind=kind, root=root):
+                return await func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def traced_methods(cls: type) -> type:
+    """Trace public coroutine methods, but only inside an existing trace."""
+    for attribute, value in list(vars(cls).items()):
+        if not attribute.startswith("_") and inspect.iscoroutinefunction(value):
+            wrap = traced(f"{cls.__name__}.{attribute}", root=False)
+            setattr(cls, attribute, wrap(value))
+    return cls
@@ -0,0 +1,220 @@
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+# Connection info key carrying the checkout wait to the first statement run on it.
+CHECKOUT_WAIT_INFO_KEY = "checkout_wait_seconds"
+
+DB_POOL_CHECKOUT_WAIT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+    labelnames=("pool",),
+    aggregate="sum",
+)
+DB_POOL_SATURATION = registry.gauge(
+    "db_pool_saturation_ratio",
+    "Checked-out connections divided by pool size plus overflow",
+    labelnames=("pool",),
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after the pool timeout",
+    labelnames=("pool",),
+)
+DB_POOL_STALE_CONNECTIONS = registry.counter(
+    "db_pool_stale_connections_total",
+    "Idle connections that failed their pre-ping and were replaced",
+    labelnames=("pool",),
+)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() not in {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Connection pool and driver settings for one database engine.
+
+    ``pre_ping`` chooses when a pooled connection is checked before use:
+    ``always`` pings on every checkout, ``idle`` only after the connection sat
+    unused for ``pre_ping_idle_seconds``, and ``never`` skips the round trip.
+    ``pgbouncer`` disables prepared statement caching for PgBouncer in
+    transaction pooling mode, which cannot keep them across transactions.
+    """
+
+    url: str
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout_seconds: float = 10.0
+    pool_recycle_seconds: int = 1800
+    pre_ping: str = "idle"
+    pre_ping_idle_seconds: float = 30.0
+    statement_cache_size: int = 500
+    pgbouncer: bool = False
+
+    def __post_init__(self) -> None:
+        if self.pre_ping not in PRE_PING_STRATEGIES:
+            raise ValueError(
+                f"pre_ping must be one of {', '.join(PRE_PING_STRATEGIES)}, "
+                f"got {self.pre_ping!r}"
+            )
+
+    @classmethod
+    def from_env(cls, url: str, prefix: str = "DB") -> "EngineSettings":
+        defaults = cls(url=url)
+        return cls(
+            url=url,
+            pool_size=int(os.getenv(f"{prefix}_POOL_SIZE", str(defaults.pool_size))),
+            max_overflow=int(
+                os.getenv(f"{prefix}_MAX_OVERFLOW", str(defaults.max_overflow))
+            ),
+            pool_timeout_seconds=float(
+                os.getenv(
+                    f"{prefix}_POOL_TIMEOUT_SECONDS",
+                    str(defaults.pool_timeout_seconds),
+                )
+            ),
+            pool_recycle_seconds=int(
+                os.getenv(
+                    f"{prefix}_POOL_RECYCLE_SECONDS",
+                    str(defaults.pool_recycle_seconds),
+                )
+            ),
+            pre_ping=os.getenv(f"{prefix}_PRE_PING", defaults.pre_ping).strip().lower(),
+            pre_ping_idle_seconds=float(
+                os.getenv(
+                    f"{prefix}_PRE_PING_IDLE_SECONDS",
+                    str(defaults.pre_ping_idle_seconds),
+                )
+            ),
+            statement_cache_size=int(
+                os.getenv(
+                    f"{prefix}_STATEMENT_CACHE_SIZE",
+                    str(defaults.statement_cache_size),
+                )
+            ),
+            pgbouncer=_env_flag(f"{prefix}_PGBOUNCER", "false"),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    def connect_args(self) -> dict[str, Any]:
+        if self.pgbouncer:
+            # PgBouncer may hand each transaction a different server connection,
+            # so statements cannot be cached, and names must never collide.
+            return {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return {"prepared_statement_cache_size": self.statement_cache_size}
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        return {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout_seconds,
+            "pool_recycle": self.pool_recycle_seconds,
+            "pool_pre_ping": self.pre_ping == "always",
+            "connect_args": self.connect_args(),
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection.
+
+    The pool's ``logging_name`` doubles as the ``pool`` metric label, and the
+    wait is left in the connection's ``info`` under ``CHECKOUT_WAIT_INFO_KEY``
+    for query instrumentation.
+    """
+
+    def _do_get(self) -> Any:
+        name = getattr(self, "logging_name", None) or "default"
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc(pool=name)
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_CHECKOUT_WAIT_SECONDS.observe(waited, pool=name)
+        record.info[CHECKOUT_WAIT_INFO_KEY] = waited
+        return record
+
+
+def _instrument_pool(engine: AsyncEngine, name: str, settings: EngineSettings) -> None:
+    sync_engine = engine.sync_engine
+    capacity = max(1, settings.capacity)
+
+    def _record_usage(returning: int = 0) -> None:
+        pool = sync_engine.pool
+        checked_out = pool.checkedout() - returning  # type: ignore[attr-defined]
+        DB_POOL_CHECKED_OUT.set(checked_out, pool=name)
+        DB_POOL_SATURATION.set(checked_out / capacity, pool=name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if (
+            settings.pre_ping == "idle"
+            and checked_in_at is not None
+            and time.monotonic() - checked_in_at >= settings.pre_ping_idle_seconds
+        ):
+            try:
+                sync_engine.dialect.do_ping(dbapi_connection)
+            except Exception as error:
+                DB_POOL_STALE_CONNECTIONS.inc(pool=name)
+                # The pool discards the connection and retries with a new one.
+                raise exc.DisconnectionError() from error
+        _record_usage()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+        # Fired just before the pool takes the connection back.
+        _record_usage(returning=1)
+
+
+def create_engine_from_settings(
+    settings: EngineSettings, name: str = "primary"
+) -> AsyncEngine:
+    engine = create_async_engine(
+        settings.url,
+        echo=False,
+        pool_logging_name=name,
+        **settings.engine_kwargs(),
+    )
+    _instrument_pool(engine, name, settings)
+    logger.info(
+        "Database engine %s: pool_size=%s max_overflow=%s pre_ping=%s pgbouncer=%s",
+        name,
+        settings.pool_size,
+        settings.max_overflow,
+        settings.pre_ping,
+        settings.pgbouncer,
+    )
+    return engine
@@ -0,0 +1,282 @@
+import functools
+import hashlib
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import registry
+from app.core.tracing import tracer
+from app.db.engine import CHECKOUT_WAIT_INFO_KEY
+
+logger = logging.getLogger(__name__)
+
+DB_SLOW_QUERY_THRESHOLD_SECONDS = float(
+    os.getenv("DB_SLOW_QUERY_THRESHOLD_SECONDS", "0.2")
+)
+DB_QUERY_SAMPLE_RATE = float(os.getenv("DB_QUERY_SAMPLE_RATE", "1.0"))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+DB_QUERY_MAX_FINGERPRINTS = int(os.getenv("DB_QUERY_MAX_FINGERPRINTS", "500"))
+
+# Statements past DB_QUERY_MAX_FINGERPRINTS share this label.
+OTHER_FINGERPRINT = "other"
+TRACE_SPAN_INFO_KEY = "trace_span"
+QUERY_TEXT_MAX_LENGTH = 1000
+
+DB_QUERY_DURATION_SECONDS = registry.histogram(
+    "db_query_duration_seconds",
+    "Statement execution time by statement fingerprint",
+    labelnames=("fingerprint",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_QUERY_ROWS = registry.histogram(
+    "db_query_rows",
+    "Rows returned or affected per statement by fingerprint",
+    labelnames=("fingerprint",),
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 1000, 5000, 10000),
+)
+DB_QUERY_POOL_WAIT_SECONDS = registry.histogram(
+    "db_query_pool_wait_seconds",
+    "Pool checkout wait paid by the first statement on a connection",
+    labelnames=("fingerprint",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_SLOW_QUERIES = registry.counter(
+    "db_slow_queries_total",
+    "Statements slower than the slow query threshold",
+    labelnames=("fingerprint",),
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request",
+    "Statements executed while serving one HTTP request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_N_PLUS_ONE_REQUESTS = registry.counter(
+    "db_n_plus_one_requests_total",
+    "Requests that repeated one statement at least the N+1 threshold",
+    labelnames=("fingerprint",),
+)
+
+_PLACEHOLDER = re.compile(r"\$\d+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """Collapse literals, placeholders and IN-lists so variants share one text."""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _LITERAL.sub("?", normalized)
+    return _VALUE_LIST.sub("(?, ...)", normalized)
+
+
+def fingerprint_of(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+
+
+@dataclass
+class RequestQueries:
+    """Statements run on behalf of one request, by fingerprint."""
+
+    request_id: str
+    count: int = 0
+    duration_seconds: float = 0.0
+    by_fingerprint: Counter[str] = field(default_factory=Counter)
+
+    def record(self, fingerprint: str, duration: float) -> None:
+        self.count += 1
+        self.duration_seconds += duration
+        self.by_fingerprint[fingerprint] += 1
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+class QueryInstrumentation:
+    """Per-statement metrics, slow query logs and per-request N+1 detection.
+
+    Every statement is fingerprinted and counted towards the current request,
+    and statements slower than ``slow_query_threshold_seconds`` are always
+    logged. Duration, row and pool wait histograms are recorded for a
+    ``sample_rate`` fraction of statements. A request that runs one fingerprint
+    ``n_plus_one_threshold`` times or more is logged as a likely N+1.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold_seconds: float = DB_SLOW_QUERY_THRESHOLD_SECONDS,
+        sample_rate: float = DB_QUERY_SAMPLE_RATE,
+        n_plus_one_threshold: int = DB_N_PLUS_ONE_THRESHOLD,
+        max_fingerprints: int = DB_QUERY_MAX_FINGERPRINTS,
+    ):
+        self.slow_query_threshold_seconds = slow_query_threshold_seconds
+        self.sample_rate = sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_fingerprints = max_fingerprints
+        self.statements: dict[str, str] = {}
+
+    def fingerprint(self, statement: str) -> str:
+        normalized = normalize_statement(statement)
+        fingerprint = fingerprint_of(normalized)
+        if fingerprint not in self.statements:
+            if len(self.statements) >= self.max_fingerprints:
+                return OTHER_FINGERPRINT
+            self.statements[fingerprint] = normalized[:QUERY_TEXT_MAX_LENGTH]
+        return fingerprint
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        operation = statement.split(None, 1)[0].upper() if statement.strip() else ""
+        span = tracer.start_span(
+            f"sql {operation}",
+            kind="client",
+            attributes={"db.system": "postgresql", "db.operation": operation},
+            root=False,
+        )
+        if span is not None:
+            conn.info[TRACE_SPAN_INFO_KEY] = span
+        conn.info["query_start_time"] = time.perf_counter()
+
+    def after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        start_time = conn.info.pop("query_start_time", None)
+        if start_time is None:
+            return
+        duration = time.perf_counter() - start_time
+        pool_wait = conn.info.pop(CHECKOUT_WAIT_INFO_KEY, None)
+        fingerprint = self.fingerprint(statement)
+
+        span = conn.info.pop(TRACE_SPAN_INFO_KEY, None)
+        if span is not None:
+            span.set_attribute(
+                "db.statement", normalize_statement(statement)[:QUERY_TEXT_MAX_LENGTH]
+            )
+            span.set_attribute("db.fingerprint", fingerprint)
+            span.set_attribute("db.rows", getattr(cursor, "rowcount", -1))
+            span.end()
+
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.record(fingerprint, duration)
+
+        if duration > self.slow_query_threshold_seconds:
+            DB_SLOW_QUERIES.inc(fingerprint=fingerprint)
+            logger.warning(
+                "Slow query detected",
+                extra={
+                    "query": statement,
+                    "fingerprint": fingerprint,
+                    "duration_ms": round(duration * 1000, 2),
+                    "threshold_ms": round(self.slow_query_threshold_seconds * 1000, 2),
+                },
+            )
+
+        if not self._sampled():
+            return
+        DB_QUERY_DURATION_SECONDS.observe(duration, fingerprint=fingerprint)
+        rows = getattr(cursor, "rowcount", -1)
+        if isinstance(rows, int) and rows >= 0:
+            DB_QUERY_ROWS.observe(rows, fingerprint=fingerprint)
+        if pool_wait is not None:
+            DB_QUERY_POOL_WAIT_SECONDS.observe(pool_wait, fingerprint=fingerprint)
+
+    def handle_error(self, exception_context) -> None:
+        connection = exception_context.connection
+        if connection is None:
+            return
+        connection.info.pop("query_start_time", None)
+        span = connection.info.pop(TRACE_SPAN_INFO_KEY, None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.end()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self.after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self.handle_error)
+
+    def start_request(self, request_id: str) -> Token[RequestQueries | None]:
+        return _request_queries.set(RequestQueries(request_id=request_id))
+
+    def finish_request(
+        self, token: Token[RequestQueries | None]
+    ) -> RequestQueries | None:
+        """Record the request's statement count and flag repeated statements."""
+        queries = _request_queries.get()
+        _request_queries.reset(token)
+        if queries is None:
+            return None
+
+        DB_QUERIES_PER_REQUEST.observe(queries.count)
+        for fingerprint, repeats in queries.by_fingerprint.items():
+            if repeats < self.n_plus_one_threshold:
+                continue
+            DB_N_PLUS_ONE_REQUESTS.inc(fingerprint=fingerprint)
+            logger.warning(
+                "Possible N+1 query",
+                extra={
+                    "fingerprint": fingerprint,
+                    "query": self.statements.get(fingerprint),
+                    "repeats": repeats,
+                    "queries": queries.count,
+                },
+            )
+        return queries
+
+    def summary(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Per-fingerprint statistics, slowest total time first."""
+        rows: list[dict[str, Any]] = []
+        for fingerprint, statement in list(self.statements.items()):
+            duration = DB_QUERY_DURATION_SECONDS.sample(fingerprint=fingerprint)
+            if duration is None or duration.count == 0:
+                continue
+            returned = DB_QUERY_ROWS.sample(fingerprint=fingerprint)
+            rows.append(
+                {
+                    "fingerprint": fingerprint,
+                    "statement": statement,
+                    "calls": duration.count,
+                    "total_seconds": duration.sum,
+                    "mean_seconds": duration.sum / duration.count,
+                    "p50_seconds": DB_QUERY_DURATION_SECONDS.quantile(
+                        0.5, fingerprint=fingerprint
+                    ),
+                    "p95_seconds": DB_QUERY_DURATION_SECONDS.quantile(
+                        0.95, fingerprint=fingerprint
+                    ),
+                    "p99_seconds": DB_QUERY_DURATION_SECONDS.quantile(
+                        0.99, fingerprint=fingerprint
+                    ),
+                    "mean_rows": (
+                        returned.sum / returned.count
+                        if returned is not None and returned.count
+                        else None
+                    ),
+                    "p95_pool_wait_seconds": DB_QUERY_POOL_WAIT_SECONDS.quantile(
+                        0.95, fingerprint=fingerprint
+                    ),
+                }
+            )
+        rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+        return rows[:limit]
+
+
+query_instrumentation = QueryInstrumentation()
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from collections.abc import Callable, Sequence
+
+import redis.asyncio as redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+DB_REPLICA_CHECK_INTERVAL_SECONDS = float(
+    os.getenv("DB_REPLICA_CHECK_INTERVAL_SECONDS", "5")
+)
+DB_REPLICA_CHECK_TIMEOUT_SECONDS = float(
+    os.getenv("DB_REPLICA_CHECK_TIMEOUT_SECONDS", "2")
+)
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "10"))
+READ_PIN_MAX_ENTRIES = 10000
+
+# Session.info key naming the replica a read session is bound to.
+REPLICA_INFO_KEY = "replica"
+
+DB_REPLICA_LAG_SECONDS = registry.gauge(
+    "db_replica_lag_seconds",
+    "Replication lag measured at the last replica check",
+    labelnames=("replica",),
+)
+DB_REPLICA_CHECK_FAILURES = registry.counter(
+    "db_replica_check_failures_total",
+    "Replica lag checks that failed or timed out",
+    labelnames=("replica",),
+)
+DB_READ_ROUTES = registry.counter(
+    "db_read_routes_total",
+    "Read-only sessions by the engine they were routed to and why",
+    labelnames=("target", "reason"),
+)
+
+# A replica that has replayed everything it received is current however old its
+# last replayed transaction is; otherwise the lag is the age of that transaction.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+def replica_name(session: AsyncSession) -> str | None:
+    """Name of the replica ``session`` reads from, or ``None`` for the primary."""
+    name = session.info.get(REPLICA_INFO_KEY)
+    return name if isinstance(name, str) else None
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        # Unknown until the first check, which routes reads to the primary.
+        self.lag_seconds = math.inf
+        self.checked_at = -math.inf
+        self.checking = False
+
+
+class ReplicaRouter:
+    """Chooses where read-only sessions run: a fresh replica or the primary.
+
+    Each replica's lag is measured at most every ``check_interval_seconds`` by
+    the request that finds the reading stale; replicas behind by more than
+    ``max_lag_seconds``, failing their check or failing a query are skipped
+    until their next check. Keys passed to :meth:`pin`, normally tenant ids
+    after a write, read from the primary for ``read_your_writes_seconds``. Pins
+    are shared through Redis once :meth:`configure` is given a client and are
+    process-local otherwise.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Replica] = (),
+        max_lag_seconds: float = DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds: float = DB_REPLICA_CHECK_INTERVAL_SECONDS,
+        check_timeout_seconds: float = DB_REPLICA_CHECK_TIMEOUT_SECONDS,
+        read_your_writes_seconds: float = DB_READ_YOUR_WRITES_SECONDS,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.replicas = list(replicas)
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.redis_client: redis.Redis | None = None
+        self._timer = timer
+        self._pins: TTLCache[str, bool] = TTLCache(
+            READ_PIN_MAX_ENTRIES, read_your_writes_seconds, timer=timer
+        )
+        self._turn = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def configure(self, redis_client: redis.Redis | None) -> None:
+        self.redis_client = redis_client
+
+    @staticmethod
+    def _pin_key(key: str) -> str:
+        return f"db:read_pin:{key}"
+
+    async def pin(self, key: str) -> None:
+        """Read ``key``'s data from the primary for the read-your-writes window."""
+        if not self.enabled or self.read_your_writes_seconds <= 0:
+            return
+
+        self._pins.set(key, True)
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.set(
+                self._pin_key(key), "1", px=int(self.read_your_writes_seconds * 1000)
+            )
+        except redis.RedisError:
+            logger.warning("Sharing read pin for %s failed", key, exc_info=True)
+
+    async def is_pinned(self, key: str) -> bool:
+        if self._pins.get(key):
+            return True
+        if self.redis_client is None:
+            return False
+        try:
+            return bool(await self.redis_client.exists(self._pin_key(key)))
+        except redis.RedisError:
+            logger.warning("Reading read pin for %s failed", key, exc_info=True)
+            return False
+
+    async def check_lag(self, replica: Replica) -> float:
+        try:
+            async with asyncio.timeout(self.check_timeout_seconds):
+                async with replica.engine.connect() as connection:
+                    lag = await connection.scalar(REPLICA_LAG_QUERY)
+        except Exception:
+            logger.warning(
+                "Lag check for %s failed; reading from the primary",
+                replica.name,
+                exc_info=True,
+            )
+            DB_REPLICA_CHECK_FAILURES.inc(replica=replica.name)
+            replica.lag_seconds = math.inf
+        else:
+            replica.lag_seconds = float(lag or 0)
+            DB_REPLICA_LAG_SECONDS.set(replica.lag_seconds, replica=replica.name)
+        replica.checked_at = self._timer()
+        return replica.lag_seconds
+
+    async def _refresh(self, replica: Replica) -> None:
+        if replica.checking:
+            return
+        if self._timer() - replica.checked_at < self.check_interval_seconds:
+            return
+        replica.checking = True
+        try:
+            await self.check_lag(replica)
+        finally:
+            replica.checking = False
+
+    def mark_unavailable(self, replica: Replica) -> None:
+        """Skip ``replica`` until its next scheduled lag check."""
+        replica.lag_seconds = math.inf
+        replica.checked_at = self._timer()
+
+    async def choose(self, key: str | None = None) -> Replica | None:
+        """Return a replica within the lag limit, or ``None`` for the primary."""
+        if not self.replicas:
+            return None
+        if key is not None and await self.is_pinned(key):
+            DB_READ_ROUTES.inc(target="primary", reason="pinned")
+            return None
+
+        await asyncio.gather(*(self._refresh(replica) for replica in self.replicas))
+        fresh = [
+            replica
+            for replica in self.replicas
+            if replica.lag_seconds <= self.max_lag_seconds
+        ]
+        if not fresh:
+            DB_READ_ROUTES.inc(target="primary", reason="lagging")
+            return None
+
+        replica = fresh[next(self._turn) % len(fresh)]
+        DB_READ_ROUTES.inc(target=replica.name, reason="fresh")
+        return replica
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
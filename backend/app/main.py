@@ -1,27 +1,50 @@
+import asyncio
+import functools
 import logging
 import os
+from collections.abc import Awaitable, Callable
 from contextlib import asynccontextmanager  # type: ignore[attr-defined]
+from datetime import datetime, timezone
 from typing import Any, cast
 
-import redis.asyncio as redis
 from apscheduler.schedulers.asyncio import (
     AsyncIOScheduler,  # type: ignore[import-untyped]
 )
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
 
 from app.api.router import api_router
+from app.api.routes.metrics import router as metrics_router
+from app.core.executor import shutdown_executors
+from app.core.leader import LeaderLease
 from app.core.logging import setup_logging
-from app.db.session import AsyncSessionLocal, engine
+from app.core.metrics_multiprocess import metrics_collector
+from app.core.rate_limit import rate_limiter
+from app.core.redis import create_redis_client, create_redis_pool
+from app.core.scheduler_metrics import instrument_scheduler
+from app.core.tracing import traced, tracer
+from app.db.session import AsyncSessionLocal, engine, replica_router
 from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.request_id import RequestIDMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.repositories.application_repository import ApplicationRepository
 from app.repositories.reminder_repository import ReminderRepository
-from app.services.reminder_service import ReminderService
+from app.services.application_service import ApplicationService
+from app.services.dashboard_counters import DASHBOARD_RECONCILE_INTERVAL_SECONDS
+from app.services.notifiers import close_notifier
+from app.services.principal_cache import principal_cache
+from app.services.reminder_service import (
+    REMINDER_ARCHIVE_INTERVAL_SECONDS,
+    ReminderService,
+)
+from app.workers.reminders import REMINDER_LEADER_LEASE_SECONDS
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+SCHEDULER_LEADER_NAME = "api-scheduler"
+
 
 def _cors_allow_origins() -> list[str]:
     configured_origins = os.getenv(
@@ -41,27 +64,55 @@ def _cors_allow_origin_regex() -> str | None:
     return configured_regex or None
 
 
+def _while_leading(
+    lease: LeaderLease, job: Callable[[], Awaitable[None]]
+) -> Callable[[], Awaitable[None]]:
+    @functools.wraps(job)
+    async def _job() -> None:
+        if lease.is_leader:
+            await job()
+
+    return _job
+
+
+def _reminder_scheduler_enabled() -> bool:
+    return os.getenv("REMINDER_SCHEDULER_ENABLED", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+        "off",
+    }
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    redis_client = None
     scheduler: AsyncIOScheduler | None = None
-    limiter_initialized = False
 
     logger.info("Application startup initiated")
+    metrics_collector.start()
 
-    try:
-        redis_client = redis.from_url(
-            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
-            encoding="utf-8",
-            decode_responses=True,
-        )
-        await FastAPILimiter.init(redis_client)
-        limiter_initialized = True
-        logger.info("Rate limiter initialized")
+    redis_pool = create_redis_pool()
+    app.state.redis_pool = redis_pool
+    redis_client = create_redis_client(redis_pool)
+    principal_cache.configure(redis_client)
+    replica_router.configure(redis_client)
+    rate_limiter.configure(redis_client)
+    invalidation_listener = asyncio.create_task(
+        principal_cache.listen_for_invalidations()
+    )
+    rate_limit_sync = asyncio.create_task(rate_limiter.run())
+    # Every API worker runs the embedded scheduler, but archiving and counter
+    # reconciliation cover all tenants and only need one of them.
+    scheduler_lease = LeaderLease(
+        redis_client, SCHEDULER_LEADER_NAME, REMINDER_LEADER_LEASE_SECONDS
+    )
 
+    try:
         scheduler = AsyncIOScheduler()
+        instrument_scheduler(scheduler)
         interval_seconds = int(os.getenv("REMINDER_CHECK_INTERVAL_SECONDS", "60"))
 
+        @traced("job enqueue_due_reminders")
         async def _enqueue_due_reminders_job() -> None:
             async with AsyncSessionLocal() as session:
                 service = ReminderService(
@@ -71,6 +122,7 @@ async def lifespan(app: FastAPI):
                 if enqueued:
                     logger.info("Enqueued %s due reminders", enqueued)
 
+        @traced("job process_queued_reminders")
         async def _process_queue_job() -> None:
             async with AsyncSessionLocal() as session:
                 service = ReminderService(
@@ -80,29 +132,76 @@ async def lifespan(app: FastAPI):
                 if processed:
                     logger.info("Processed %s queued reminders", processed)
 
-        scheduler.add_job(
-            _enqueue_due_reminders_job,
-            trigger="interval",
-            seconds=interval_seconds,
-            id="enqueue_due_reminders",
-            replace_existing=True,
-        )
-        scheduler.add_job(
-            _process_queue_job,
-            trigger="interval",
-            seconds=interval_seconds,
-            id="process_queued_reminders",
-            replace_existing=True,
-        )
+        @traced("job archive_sent_reminders")
+        async def _archive_sent_reminders_job() -> None:
+            async with AsyncSessionLocal() as session:
+                service = ReminderService(
+                    repository=ReminderRepository(session=session)
+                )
+                await service.archive_sent_reminders()
+
+        @traced("job reconcile_dashboard_counters")
+        async def _reconcile_dashboard_counters_job() -> None:
+            async with AsyncSessionLocal() as session:
+                service = ApplicationService(
+                    repository=ApplicationRepository(session=session),
+                    redis_client=redis_client,
+                )
+                reconciled = await service.reconcile_dashboard_counters()
+                if reconciled:
+                    logger.info(
+                        "Reconciled dashboard counters for %s tenants", reconciled
+                    )
+
+        reminder_scheduler_enabled = _reminder_scheduler_enabled()
+        if reminder_scheduler_enabled:
+            scheduler.add_job(
+                _enqueue_due_reminders_job,
+                trigger="interval",
+                seconds=interval_seconds,
+                id="enqueue_due_reminders",
+                replace_existing=True,
+            )
+            scheduler.add_job(
+                _process_queue_job,
+                trigger="interval",
+                seconds=interval_seconds,
+                id="process_queued_reminders",
+                replace_existing=True,
+            )
+            scheduler.add_job(
+                scheduler_lease.acquire,
+                trigger="interval",
+                seconds=scheduler_lease.ttl_seconds / 3,
+                next_run_time=datetime.now(timezone.utc),
+                id="renew_scheduler_lease",
+                replace_existing=True,
+            )
+            scheduler.add_job(
+                _while_leading(scheduler_lease, _archive_sent_reminders_job),
+                trigger="interval",
+                seconds=REMINDER_ARCHIVE_INTERVAL_SECONDS,
+                id="archive_sent_reminders",
+                replace_existing=True,
+            )
+            scheduler.add_job(
+                _while_leading(scheduler_lease, _reconcile_dashboard_counters_job),
+                trigger="interval",
+                seconds=DASHBOARD_RECONCILE_INTERVAL_SECONDS,
+                id="reconcile_dashboard_counters",
+                replace_existing=True,
+            )
         scheduler.start()
-        logger.info(
-            "Reminder scheduler started with interval_seconds=%s",
-            interval_seconds,
-        )
+        if reminder_scheduler_enabled:
+            logger.info(
+                "Reminder scheduler started with interval_seconds=%s",
+                interval_seconds,
+            )
+        else:
+            logger.info("Embedded reminder scheduler disabled")
     except Exception:
-        limiter_initialized = False
         logger.exception(
-            "Rate limiter initialization failed. Requests will continue without it."
+            "Scheduler initialization failed. Requests will continue without it."
         )
 
     try:
@@ -112,19 +211,34 @@ async def lifespan(app: FastAPI):
         if scheduler is not None:
             scheduler.shutdown(wait=False)
             logger.info("Reminder scheduler stopped")
-        if redis_client is not None and limiter_initialized:
-            await FastAPILimiter.close()
-            logger.info("Rate limiter closed")
-        if redis_client is not None:
-            await redis_client.close()
-            logger.info("Redis client closed")
+        await scheduler_lease.release()
+        for task in (invalidation_listener, rate_limit_sync):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await rate_limiter.flush()
+        rate_limiter.configure(None)
+        principal_cache.configure(None)
+        replica_router.configure(None)
+        await close_notifier()
+        await redis_client.aclose()
+        await redis_pool.disconnect()
+        logger.info("Redis connection pool closed")
+        shutdown_executors()
         await engine.dispose()
+        await replica_router.dispose()
         logger.info("Database engine disposed")
+        metrics_collector.stop()
+        tracer.flush()
 
 
 app = FastAPI(lifespan=lifespan)
-app.add_middleware(ErrorHandlerMiddleware)  # type: ignore[call-arg,arg-type]
-app.add_middleware(RequestIDMiddleware)  # type: ignore[call-arg,arg-type]
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ErrorHandlerMiddleware)
+app.add_middleware(RequestIDMiddleware)
+app.add_middleware(TracingMiddleware)
 app.add_middleware(
     cast(Any, CORSMiddleware),
     allow_origins=_cors_allow_origins(),
@@ -132,8 +246,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 app.include_router(api_router)
+app.include_router(metrics_router)
 
 
 @app.get("/")
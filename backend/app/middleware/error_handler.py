@@ -1,26 +1,47 @@
 import logging
 
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        try:
-            return await call_next(request)
+class ErrorHandlerMiddleware:
+    """Turns unhandled exceptions into a JSON 500 carrying the request id.
+
+    An exception raised after the response has started cannot be replaced by
+    a new response, so it is logged and re-raised for the server to abort.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
         except Exception:
-            logger.exception(
-                "Unhandled error",
-                extra={"request_id": getattr(request.state, "request_id", None)},
-            )
+            request_id = scope.get("state", {}).get("request_id")
+            logger.exception("Unhandled error", extra={"request_id": request_id})
+            if response_started:
+                raise
 
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "detail": "Internal Server Error",
-                    "request_id": getattr(request.state, "request_id", None),
+                    "request_id": request_id,
                 },
             )
+            await response(scope, receive, send)
@@ -0,0 +1,67 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import registry
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_DURATION_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code",
+    labelnames=("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    labelnames=("method",),
+    aggregate="sum",
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Return the matched route's path template, e.g. ``/applications/{id}``.
+
+    Raw paths carry ids and would give every resource its own series.
+    """
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Records per-route latency and in-flight HTTP requests.
+
+    The route is only known once routing has run, so it is read from the
+    scope after the downstream app returns. Requests that match no route
+    share one ``unmatched`` label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_tracking_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_tracking_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(method=method)
+            HTTP_REQUEST_DURATION_SECONDS.observe(
+                time.perf_counter() - start,
+                method=method,
+                route=route_template(scope),
+                status=status_code,
+            )
@@ -2,54 +2,90 @@ import logging
 import time
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import _request_id_var
+from app.db.instrumentation import query_instrumentation
 
 logger = logging.getLogger(__name__)
 
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class RequestIDMiddleware:
+    """Tags each HTTP request with an id and logs its start, end and duration.
+
+    The id is stored in ``request.state.request_id`` and the logging context,
+    and returned in the ``X-Request-ID`` response header. As a plain ASGI
+    middleware it passes the response through untouched, so streaming bodies
+    are not buffered.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        method = scope["method"]
+        path = scope["path"]
+        status_code = None
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                ]
+            await send(message)
 
         token = _request_id_var.set(request_id)
+        queries_token = query_instrumentation.start_request(request_id)
         start = time.perf_counter()
         try:
+            client = scope.get("client")
             logger.info(
                 "Request started",
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "client": request.client.host if request.client else None,
+                    "method": method,
+                    "path": path,
+                    "client": client[0] if client else None,
                 },
             )
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception:
             duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            query_instrumentation.finish_request(queries_token)
             logger.exception(
                 "Request failed",
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
+                    "method": method,
+                    "path": path,
                     "duration_ms": duration_ms,
                 },
             )
             raise
         else:
             duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            queries = query_instrumentation.finish_request(queries_token)
             logger.info(
                 "Request completed",
                 extra={
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
                     "duration_ms": duration_ms,
+                    "db_queries": queries.count if queries else 0,
+                    "db_duration_ms": (
+                        round(queries.duration_seconds * 1000, 2) if queries else 0
+                    ),
                 },
             )
         finally:
             _request_id_var.reset(token)
-
-        response.headers["X-Request-ID"] = request_id
-        return response
@@ -0,0 +1,52 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.tracing import TRACEPARENT_HEADER, parse_traceparent, tracer
+from app.middleware.metrics import route_template
+
+_TRACEPARENT_HEADER = TRACEPARENT_HEADER.encode("latin-1")
+
+
+class TracingMiddleware:
+    """Runs each HTTP request inside a server span.
+
+    An incoming W3C ``traceparent`` header makes the span a child of the
+    caller's, following its sampling decision. The span is named after the
+    matched route template once routing has run.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == _TRACEPARENT_HEADER:
+                traceparent = value.decode("latin-1")
+                break
+
+        method = scope["method"]
+        with tracer.span(
+            method,
+            kind="server",
+            attributes={"http.method": method, "http.target": scope["path"]},
+            parent=parse_traceparent(traceparent),
+        ) as span:
+            assert span is not None
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = route_template(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.route", route)
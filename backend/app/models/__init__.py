@@ -2,8 +2,17 @@
 
 from app.models.application import Application
 from app.models.reminder import Reminder
+from app.models.reminder_archive import ReminderArchive
 from app.models.tenant import Tenant
 from app.models.tenant_user import TenantRole, TenantUser
 from app.models.user import User
 
-__all__ = ["Application", "Reminder", "Tenant", "TenantRole", "TenantUser", "User"]
+__all__ = [
+    "Application",
+    "Reminder",
+    "ReminderArchive",
+    "Tenant",
+    "TenantRole",
+    "TenantUser",
+    "User",
+]
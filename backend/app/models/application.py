@@ -3,7 +3,19 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, String, Text, func
+from sqlalchemy import (
+    DDL,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +26,15 @@ if TYPE_CHECKING:
     from app.models.tenant import Tenant
 
 
+# Indexed expression behind full-text and prefix search. Queries must use this
+# exact expression for Postgres to match it to ix_applications_search_document.
+SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || "
+    "coalesce(notes, '') || ' ' || coalesce(description, ''))"
+)
+
+
 class ApplicationStatus(str, enum.Enum):
     applied = "applied"
     screening = "screening"
@@ -68,7 +89,40 @@ class Application(Base):
     )
 
     __table_args__ = (
-        Index("ix_applications_tenant_status", "tenant_id", "status"),
-        Index("ix_applications_tenant_company", "tenant_id", "company"),
-        Index("ix_applications_tenant_applied_date", "tenant_id", "applied_date"),
+        # Each sortable column carries ``id`` so keyset pages seek straight to
+        # the (value, id) position instead of scanning ties.
+        Index("ix_applications_tenant_status", "tenant_id", "status", "id"),
+        Index("ix_applications_tenant_company", "tenant_id", "company", "id"),
+        Index("ix_applications_tenant_applied_date", "tenant_id", "applied_date", "id"),
+        Index("ix_applications_tenant_created_at", "tenant_id", "created_at", "id"),
+        # Covers the dashboard aggregate so it reads only live rows.
+        Index(
+            "ix_applications_tenant_live_dashboard",
+            "tenant_id",
+            "status",
+            "applied_date",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Trigram index so substring company filters (ILIKE '%...%') avoid a
+        # sequential scan; requires the pg_trgm extension.
+        Index(
+            "ix_applications_company_trgm",
+            "company",
+            postgresql_using="gin",
+            postgresql_ops={"company": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_applications_search_document",
+            text(SEARCH_DOCUMENT_SQL),
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
     )
+
+
+event.listen(
+    Application.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
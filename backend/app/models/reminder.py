@@ -2,7 +2,18 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Text, func
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +22,38 @@ from app.db.base import Base
 if TYPE_CHECKING:
     from app.models.application import Application
 
+REMINDER_CHANGES_CHANNEL = "reminder_changes"
+
+# Publishes {id, due_at (epoch seconds), sent} on REMINDER_CHANGES_CHANNEL
+# whenever a reminder is created or its schedule, retry time or sent flag
+# changes. ``due_at`` is the later of remind_at and next_attempt_at.
+NOTIFY_REMINDER_CHANGE_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_reminder_change() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_notify('{REMINDER_CHANGES_CHANNEL}', json_build_object(
+    'id', NEW.id,
+    'due_at', extract(epoch FROM greatest(NEW.remind_at, NEW.next_attempt_at)),
+    'sent', NEW.sent
+  )::text);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+NOTIFY_REMINDER_INSERT_TRIGGER_SQL = """
+CREATE TRIGGER reminders_notify_insert
+AFTER INSERT ON reminders
+FOR EACH ROW EXECUTE FUNCTION notify_reminder_change()
+"""
+NOTIFY_REMINDER_UPDATE_TRIGGER_SQL = """
+CREATE TRIGGER reminders_notify_update
+AFTER UPDATE OF remind_at, sent, next_attempt_at ON reminders
+FOR EACH ROW
+WHEN (OLD.remind_at IS DISTINCT FROM NEW.remind_at
+      OR OLD.sent IS DISTINCT FROM NEW.sent
+      OR OLD.next_attempt_at IS DISTINCT FROM NEW.next_attempt_at)
+EXECUTE FUNCTION notify_reminder_change()
+"""
+
 
 class Reminder(Base):
     __tablename__ = "reminders"
@@ -41,6 +84,21 @@ class Reminder(Base):
         nullable=False,
         server_default="false",
     )
+    # Set while a dispatcher holds the reminder; other dispatchers skip it until
+    # the lease runs out, so a crashed dispatcher's claims are retried.
+    claimed_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Failed deliveries so far, and when the next one may be tried; the delay
+    # doubles with each failure.
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+    next_attempt_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -50,3 +108,32 @@ class Reminder(Base):
     application: Mapped["Application"] = relationship(
         "Application", back_populates="reminders"
     )
+
+    __table_args__ = (
+        # Pending reminders are a small slice of the table; these let the due
+        # scans skip every sent row. Queries must filter on ``sent = false`` for
+        # the planner to match the predicate.
+        Index(
+            "ix_reminders_pending_remind_at",
+            "remind_at",
+            postgresql_where=text("sent = false"),
+        ),
+        Index(
+            "ix_reminders_tenant_pending_remind_at",
+            "tenant_id",
+            "remind_at",
+            postgresql_where=text("sent = false"),
+        ),
+    )
+
+
+for _statement in (
+    NOTIFY_REMINDER_CHANGE_FUNCTION_SQL,
+    NOTIFY_REMINDER_INSERT_TRIGGER_SQL,
+    NOTIFY_REMINDER_UPDATE_TRIGGER_SQL,
+):
+    event.listen(
+        Reminder.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
@@ -1,13 +1,55 @@
-from datetime import datetime, timedelta, timezone
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import asc, desc, func, select
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy import (
+    ColumnElement,
+    asc,
+    desc,
+    false,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Select
+from sqlalchemy.sql import Select, Update
 
-from app.models.application import Application, ApplicationStatus
+from app.core.tracing import traced_methods
+from app.models.application import SEARCH_DOCUMENT_SQL, Application, ApplicationStatus
 
+# COPY talks to asyncpg directly, so its failures are not wrapped by SQLAlchemy.
+BULK_INSERT_ERRORS = (
+    SQLAlchemyError,
+    asyncpg.PostgresError,
+    asyncpg.InterfaceError,
+    OSError,
+)
 
+_SEARCH_CONFIG: ColumnElement[str] = literal_column("'simple'::regconfig")
+_SEARCH_TERM = re.compile(r"[^\W_]+")
+_BULK_COLUMNS = (
+    "id",
+    "tenant_id",
+    "title",
+    "company",
+    "status",
+    "location",
+    "description",
+    "salary_range",
+    "notes",
+    "url",
+    "applied_date",
+)
+
+
+@traced_methods
 class ApplicationRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -18,13 +60,60 @@ class ApplicationRepository:
             Application.deleted_at.is_(None),
         )
 
+    @staticmethod
+    def _search_clause(search: str, mode: str) -> ColumnElement[bool]:
+        """Match ``search`` against title, company, notes and description.
+
+        ``prefix`` matches every word that starts with each search term;
+        ``fulltext`` takes web-search syntax (quoted phrases, ``or``, ``-word``).
+        Both go through ix_applications_search_document.
+        """
+        document: ColumnElement[str] = literal_column(SEARCH_DOCUMENT_SQL)
+        if mode == "prefix":
+            terms = _SEARCH_TERM.findall(search)
+            if not terms:
+                return false()
+            prefix_query = " & ".join(f"{term}:*" for term in terms)
+            tsquery = func.to_tsquery(_SEARCH_CONFIG, prefix_query)
+        else:
+            tsquery = func.websearch_to_tsquery(_SEARCH_CONFIG, search)
+        return document.op("@@")(tsquery)
+
     async def create_application(self, data: dict) -> Application:
-        application = Application(**data)
-        self.session.add(application)
+        result = await self.session.execute(
+            insert(Application).values(**data).returning(Application)
+        )
+        application = result.scalar_one()
         await self.session.commit()
-        await self.session.refresh(application)
         return application
 
+    async def bulk_create_applications(self, rows: list[dict[str, Any]]) -> int:
+        """Insert ``rows`` with one COPY and commit, rolling back on failure.
+
+        COPY bypasses ORM defaults, so every row must carry an ``id`` and a
+        ``status``; timestamps still come from the column defaults.
+        """
+        if not rows:
+            return 0
+
+        try:
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            assert driver_connection is not None
+            await driver_connection.copy_records_to_table(
+                Application.__tablename__,
+                columns=_BULK_COLUMNS,
+                records=[
+                    tuple(row.get(column) for column in _BULK_COLUMNS) for row in rows
+                ],
+            )
+            await self.session.commit()
+        except BULK_INSERT_ERRORS:
+            await self.session.rollback()
+            raise
+        return len(rows)
+
     async def get_application_by_id(
         self, tenant_id: UUID, application_id: UUID
     ) -> Application | None:
@@ -41,15 +130,41 @@ class ApplicationRepository:
         company: str | None = None,
         sort_by: str = "created_at",
         sort_order: str = "desc",
+        after: tuple[Any, UUID] | None = None,
+        search: str | None = None,
+        search_mode: str = "fulltext",
     ) -> list[Application]:
+        """List live applications, ordered by ``sort_by`` with ``id`` breaking ties.
+
+        ``after`` is the ``(sort value, id)`` of the last row of the previous
+        page; when given, the page starts right after it instead of at
+        ``offset``, so deep pages cost the same as the first one.
+        """
         query = self._base_query(tenant_id)
 
         if status is not None:
             query = query.where(Application.status == status)
 
         if company is not None:
+            # Served by the ix_applications_company_trgm trigram index.
             query = query.where(Application.company.ilike(f"%{company.strip()}%"))
 
+        if search is not None:
+            # Postgres badly overestimates tsquery matches, so with ORDER BY ...
+            # LIMIT it would walk the sort index and filter every row. Resolve
+            # the matches from the search index first, then sort those.
+            matches = (
+                select(Application.id)
+                .where(
+                    Application.tenant_id == tenant_id,
+                    Application.deleted_at.is_(None),
+                    self._search_clause(search, search_mode),
+                )
+                .cte("search_matches")
+                .prefix_with("MATERIALIZED")
+            )
+            query = query.where(Application.id.in_(select(matches.c.id)))
+
         allowed_sort_fields = {
             "applied_date": Application.applied_date,
             "created_at": Application.created_at,
@@ -57,85 +172,162 @@ class ApplicationRepository:
             "status": Application.status,
         }
         sort_column = allowed_sort_fields.get(sort_by, Application.created_at)
-        sort_direction = asc if sort_order.lower() == "asc" else desc
-        query = query.order_by(sort_direction(sort_column))
+        ascending = sort_order.lower() == "asc"
+        sort_direction = asc if ascending else desc
+        query = query.order_by(
+            sort_direction(sort_column), sort_direction(Application.id)
+        )
+
+        if after is not None:
+            after_value, after_id = after
+            position = tuple_(sort_column, Application.id)
+            boundary = tuple_(
+                literal(after_value, sort_column.type),
+                literal(after_id, Application.id.type),
+            )
+            query = query.where(
+                position > boundary if ascending else position < boundary
+            )
 
         query = query.limit(limit).offset(offset)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    def _live_update(self, tenant_id: UUID, application_id: UUID) -> Update:
+        return (
+            update(Application)
+            .where(
+                Application.tenant_id == tenant_id,
+                Application.id == application_id,
+                Application.deleted_at.is_(None),
+            )
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+
+    @staticmethod
+    def _known_fields(updates: dict) -> dict:
+        return {
+            field: value
+            for field, value in updates.items()
+            if hasattr(Application, field)
+        }
+
     async def update_application(
         self, tenant_id: UUID, application_id: UUID, updates: dict
     ) -> Application | None:
-        application = await self.get_application_by_id(tenant_id, application_id)
-        if application is None:
-            return None
-
-        for field, value in updates.items():
-            if hasattr(application, field):
-                setattr(application, field, value)
+        values = self._known_fields(updates)
+        if not values:
+            return await self.get_application_by_id(tenant_id, application_id)
 
+        result = await self.session.execute(
+            self._live_update(tenant_id, application_id)
+            .values(**values)
+            .returning(Application)
+        )
+        application = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(application)
         return application
 
-    async def soft_delete_application(
-        self, tenant_id: UUID, application_id: UUID
-    ) -> Application | None:
-        application = await self.get_application_by_id(tenant_id, application_id)
-        if application is None:
-            return None
+    async def update_application_with_previous(
+        self, tenant_id: UUID, application_id: UUID, updates: dict
+    ) -> tuple[Application, ApplicationStatus, date] | None:
+        """Update a live application and return it with its previous status and date.
 
-        application.deleted_at = datetime.now(timezone.utc)
-        await self.session.commit()
-        await self.session.refresh(application)
-        return application
+        The old values come from a ``FOR UPDATE`` subquery joined into the same
+        UPDATE, so they are exactly the ones this statement overwrote.
+        """
+        values = self._known_fields(updates)
+        if not values:
+            application = await self.get_application_by_id(tenant_id, application_id)
+            if application is None:
+                return None
+            return application, application.status, application.applied_date
 
-    async def get_dashboard_summary(self, tenant_id: UUID) -> dict[str, int]:
-        query = (
-            select(Application.status, func.count(Application.id))
+        previous = (
+            select(Application.id, Application.status, Application.applied_date)
             .where(
                 Application.tenant_id == tenant_id,
+                Application.id == application_id,
                 Application.deleted_at.is_(None),
             )
-            .group_by(Application.status)
+            .with_for_update()
+            .subquery("previous")
         )
+        result = await self.session.execute(
+            self._live_update(tenant_id, application_id)
+            .where(Application.id == previous.c.id)
+            .values(**values)
+            .returning(Application, previous.c.status, previous.c.applied_date)
+        )
+        row = result.one_or_none()
+        await self.session.commit()
+        if row is None:
+            return None
+        application, previous_status, previous_applied_date = row
+        return application, previous_status, previous_applied_date
 
-        result = await self.session.execute(query)
-        summary = {
-            "applied": 0,
-            "screening": 0,
-            "interview": 0,
-            "offer": 0,
-            "rejected": 0,
-        }
-
-        for status, count in result.all():
-            summary[status.value] = int(count)
+    async def soft_delete_application(
+        self, tenant_id: UUID, application_id: UUID
+    ) -> Application | None:
+        result = await self.session.execute(
+            self._live_update(tenant_id, application_id)
+            .values(deleted_at=datetime.now(timezone.utc))
+            .returning(Application)
+        )
+        application = result.scalar_one_or_none()
+        await self.session.commit()
+        return application
 
+    async def get_dashboard_summary(self, tenant_id: UUID) -> dict[str, int]:
+        """Count live applications per status and per trend window in one pass."""
         today = datetime.now(timezone.utc).date()
         seven_days_ago = today - timedelta(days=6)
         thirty_days_ago = today - timedelta(days=29)
 
-        last_7_days = await self.session.scalar(
-            select(func.count(Application.id)).where(
-                Application.tenant_id == tenant_id,
-                Application.deleted_at.is_(None),
-                Application.applied_date >= seven_days_ago,
-                Application.applied_date <= today,
-            )
+        status_counts = [
+            func.count().filter(Application.status == status).label(status.value)
+            for status in ApplicationStatus
+        ]
+        query = select(
+            *status_counts,
+            func.count()
+            .filter(Application.applied_date.between(seven_days_ago, today))
+            .label("applied_last_7_days"),
+            func.count()
+            .filter(Application.applied_date.between(thirty_days_ago, today))
+            .label("applied_last_30_days"),
+        ).where(
+            Application.tenant_id == tenant_id,
+            Application.deleted_at.is_(None),
         )
-        last_30_days = await self.session.scalar(
-            select(func.count(Application.id)).where(
+
+        result = await self.session.execute(query)
+        return {key: int(count) for key, count in result.one()._mapping.items()}
+
+    async def get_dashboard_counters(
+        self, tenant_id: UUID, since: date
+    ) -> tuple[dict[str, int], dict[date, int]]:
+        """Count live applications per status and per ``applied_date`` >= ``since``.
+
+        Older dates collapse into one bucket, so the grouped result stays at
+        most a few rows per status and day in the window.
+        """
+        older = since - timedelta(days=1)
+        bucket = func.greatest(Application.applied_date, older).label("bucket")
+        query = (
+            select(Application.status, bucket, func.count())
+            .where(
                 Application.tenant_id == tenant_id,
                 Application.deleted_at.is_(None),
-                Application.applied_date >= thirty_days_ago,
-                Application.applied_date <= today,
             )
+            .group_by(Application.status, bucket)
         )
 
-        summary["applied_last_7_days"] = int(last_7_days or 0)
-        summary["applied_last_30_days"] = int(last_30_days or 0)
-
-        return summary
+        status_counts: dict[str, int] = {}
+        day_counts: dict[date, int] = {}
+        for status, day, count in (await self.session.execute(query)).all():
+            status_counts[status.value] = status_counts.get(status.value, 0) + count
+            if day >= since:
+                day_counts[day] = day_counts.get(day, 0) + count
+        return status_counts, day_counts
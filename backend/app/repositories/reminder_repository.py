@@ -1,21 +1,61 @@
-from datetime import datetime, timezone
+from collections.abc import Collection
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import DateTime
 
+from app.core.tracing import traced_methods
 from app.models.reminder import Reminder
+from app.models.reminder_archive import ReminderArchive
+from app.models.tenant_user import TenantRole, TenantUser
+from app.models.user import User
 
+# ``sent = false`` rather than ``sent IS false``: only this spelling lets the
+# planner use the partial pending-reminder indexes.
+_UNSENT = Reminder.sent == false()
 
+# When a reminder may be delivered: its remind_at, pushed back by any pending
+# retry delay.
+_DUE_AT = func.greatest(Reminder.remind_at, Reminder.next_attempt_at)
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "tenant_id",
+    "application_id",
+    "remind_at",
+    "message",
+    "created_at",
+)
+
+
+def _retry_ready(moment: datetime) -> ColumnElement[bool]:
+    return or_(Reminder.next_attempt_at.is_(None), Reminder.next_attempt_at <= moment)
+
+
+@traced_methods
 class ReminderRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def create_reminder(self, data: dict) -> Reminder:
-        reminder = Reminder(**data)
-        self.session.add(reminder)
+        result = await self.session.execute(
+            insert(Reminder).values(**data).returning(Reminder)
+        )
+        reminder = result.scalar_one()
         await self.session.commit()
-        await self.session.refresh(reminder)
         return reminder
 
     async def fetch_pending_reminders(self, tenant_id: UUID) -> list[Reminder]:
@@ -24,7 +64,7 @@ class ReminderRepository:
             select(Reminder)
             .where(
                 Reminder.tenant_id == tenant_id,
-                Reminder.sent.is_(False),
+                _UNSENT,
                 Reminder.remind_at <= now,
             )
             .order_by(Reminder.remind_at.asc())
@@ -38,8 +78,9 @@ class ReminderRepository:
         query = (
             select(Reminder)
             .where(
-                Reminder.sent.is_(False),
+                _UNSENT,
                 Reminder.remind_at <= now,
+                _retry_ready(now),
             )
             .order_by(Reminder.remind_at.asc())
             .limit(limit)
@@ -48,6 +89,22 @@ class ReminderRepository:
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def fetch_upcoming_reminders(
+        self, until: datetime, limit: int
+    ) -> list[tuple[UUID, datetime]]:
+        """Return ``(id, due_at)`` of unsent reminders due by ``until``.
+
+        ``due_at`` is ``remind_at``, or the retry time once a delivery failed.
+        """
+        due_at = _DUE_AT.label("due_at")
+        result = await self.session.execute(
+            select(Reminder.id, due_at)
+            .where(_UNSENT, Reminder.remind_at <= until, _retry_ready(until))
+            .order_by(due_at.asc())
+            .limit(limit)
+        )
+        return [(row.id, row.due_at) for row in result]
+
     async def get_by_id(self, reminder_id: UUID) -> Reminder | None:
         result = await self.session.execute(
             select(Reminder).where(Reminder.id == reminder_id)
@@ -55,11 +112,151 @@ class ReminderRepository:
         return result.scalar_one_or_none()
 
     async def mark_sent(self, reminder_id: UUID) -> Reminder | None:
-        reminder = await self.get_by_id(reminder_id)
-        if reminder is None:
-            return None
-
-        reminder.sent = True
+        result = await self.session.execute(
+            update(Reminder)
+            .where(Reminder.id == reminder_id)
+            .values(sent=True)
+            .returning(Reminder)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        reminder = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(reminder)
         return reminder
+
+    async def claim_due_reminders(
+        self,
+        limit: int,
+        lease_seconds: float,
+        tenant_id: UUID | None = None,
+        reminder_ids: Collection[UUID] | None = None,
+    ) -> list[Reminder]:
+        """Claim up to ``limit`` due, unsent reminders in one statement.
+
+        Rows locked by another dispatcher are skipped rather than waited on, and
+        rows whose claim is still live are left alone. The claim lasts
+        ``lease_seconds``; if it is never completed the reminder becomes
+        claimable again.
+        """
+        now = datetime.now(timezone.utc)
+        claimable = (
+            select(Reminder.id)
+            .where(
+                _UNSENT,
+                Reminder.remind_at <= now,
+                _retry_ready(now),
+                or_(Reminder.claimed_until.is_(None), Reminder.claimed_until < now),
+            )
+            .order_by(Reminder.remind_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if tenant_id is not None:
+            claimable = claimable.where(Reminder.tenant_id == tenant_id)
+        if reminder_ids is not None:
+            claimable = claimable.where(Reminder.id.in_(reminder_ids))
+
+        result = await self.session.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(claimable.scalar_subquery()))
+            .values(claimed_until=now + timedelta(seconds=lease_seconds))
+            .returning(Reminder)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        reminders = sorted(result.scalars().all(), key=lambda item: item.remind_at)
+        await self.session.commit()
+        return reminders
+
+    async def complete_claimed_reminders(
+        self,
+        sent_ids: Collection[UUID],
+        failed_ids: Collection[UUID],
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+    ) -> int:
+        """Mark sent reminders sent and release every claim in one UPDATE.
+
+        Failed reminders keep ``sent = false``, count the attempt and are held
+        back until ``next_attempt_at``: ``retry_base_seconds`` doubled per
+        earlier failure, capped at ``retry_max_seconds``. Returns how many
+        reminders were marked sent.
+        """
+        claimed_ids = [*sent_ids, *failed_ids]
+        if not claimed_ids:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        failed = Reminder.id.in_(list(failed_ids))
+        retry_delay = func.least(
+            retry_base_seconds * func.power(2, Reminder.attempts), retry_max_seconds
+        )
+        result = await self.session.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(claimed_ids))
+            .values(
+                sent=case((Reminder.id.in_(list(sent_ids)), True), else_=Reminder.sent),
+                attempts=case((failed, Reminder.attempts + 1), else_=Reminder.attempts),
+                next_attempt_at=case(
+                    (
+                        failed,
+                        literal(now, DateTime(timezone=True))
+                        + func.make_interval(0, 0, 0, 0, 0, 0, retry_delay),
+                    ),
+                    else_=None,
+                ),
+                claimed_until=None,
+            )
+            .returning(Reminder)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        marked = sum(1 for reminder in result.scalars() if reminder.sent)
+        await self.session.commit()
+        return marked
+
+    async def fetch_tenant_admin_emails(
+        self, tenant_ids: Collection[UUID]
+    ) -> dict[UUID, list[str]]:
+        result = await self.session.execute(
+            select(TenantUser.tenant_id, User.email)
+            .join(User, User.id == TenantUser.user_id)
+            .where(
+                TenantUser.tenant_id.in_(tenant_ids),
+                TenantUser.role == TenantRole.admin,
+                User.is_active.is_(True),
+            )
+            .order_by(User.email)
+        )
+        emails: dict[UUID, list[str]] = {}
+        for tenant_id, email in result:
+            emails.setdefault(tenant_id, []).append(email)
+        return emails
+
+    async def archive_sent_reminders(self, before: datetime, limit: int) -> int:
+        """Move up to ``limit`` sent reminders due before ``before`` to the archive.
+
+        The delete and the archive insert run as one statement, so a reminder
+        is never in both tables or neither. Returns how many were moved.
+        """
+        archivable = (
+            select(Reminder.id)
+            .where(Reminder.sent.is_(True), Reminder.remind_at < before)
+            .order_by(Reminder.remind_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Reminder)
+            .where(Reminder.id.in_(archivable.scalar_subquery()))
+            .returning(*(Reminder.__table__.c[name] for name in _ARCHIVED_COLUMNS))
+            .cte("moved")
+        )
+        result = await self.session.execute(
+            insert(ReminderArchive)
+            .from_select(
+                _ARCHIVED_COLUMNS,
+                select(*(moved.c[name] for name in _ARCHIVED_COLUMNS)),
+            )
+            .returning(ReminderArchive.id)
+        )
+        archived = len(result.all())
+        await self.session.commit()
+        return archived
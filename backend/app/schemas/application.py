@@ -45,6 +45,9 @@ class ApplicationListParams(CleanInputModel):
     company: str | None = Field(default=None, min_length=1, max_length=200)
     sort_by: Literal["applied_date", "created_at", "company", "status"] = "created_at"
     sort_order: Literal["asc", "desc"] = "desc"
+    cursor: str | None = Field(default=None, min_length=1, max_length=512)
+    q: str | None = Field(default=None, min_length=1, max_length=200)
+    search_mode: Literal["prefix", "fulltext"] = "fulltext"
 
 
 class ApplicationResponse(CleanInputModel):
@@ -83,3 +86,16 @@ class ApplicationDashboardResponse(CleanInputModel):
     total: int
     by_status: ApplicationStatusBreakdown
     trends: ApplicationTrendSummary
+
+
+class ApplicationImportRowError(CleanInputModel):
+    row: int
+    errors: list[str]
+
+
+class ApplicationImportResponse(CleanInputModel):
+    received: int
+    inserted: int
+    failed: int
+    truncated: bool = False
+    errors: list[ApplicationImportRowError]
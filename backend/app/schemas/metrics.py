@@ -0,0 +1,14 @@
+from app.schemas.clean_input_model import CleanInputModel
+
+
+class QueryStatsResponse(CleanInputModel):
+    fingerprint: str
+    statement: str
+    calls: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float | None
+    p95_seconds: float | None
+    p99_seconds: float | None
+    mean_rows: float | None
+    p95_pool_wait_seconds: float | None
@@ -0,0 +1,135 @@
+import codecs
+import csv
+import json
+import os
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any
+
+from app.schemas.application import ApplicationCreate
+
+BULK_IMPORT_MAX_RECORD_LENGTH = int(os.getenv("BULK_IMPORT_MAX_RECORD_LENGTH", "65536"))
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# A parsed row is its 1-based position among data rows and either the field
+# mapping to validate or a message describing why the row could not be read.
+ImportRow = tuple[int, dict[str, Any] | str]
+RowParser = Callable[[AsyncIterable[bytes]], AsyncIterator[ImportRow]]
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _record_too_long(max_length: int) -> ImportFormatError:
+    return ImportFormatError(f"Records must be at most {max_length} characters")
+
+
+async def _iter_lines(
+    chunks: AsyncIterable[bytes], max_length: int
+) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if len(line) > max_length:
+                    raise _record_too_long(max_length)
+                yield line
+            if len(buffer) > max_length:
+                raise _record_too_long(max_length)
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("Request body must be UTF-8 encoded") from exc
+    if len(buffer) > max_length:
+        raise _record_too_long(max_length)
+    if buffer:
+        yield buffer
+
+
+async def iter_csv_rows(
+    chunks: AsyncIterable[bytes],
+    max_record_length: int = BULK_IMPORT_MAX_RECORD_LENGTH,
+) -> AsyncIterator[ImportRow]:
+    """Parse a streamed CSV body whose header row names ApplicationCreate fields.
+
+    Lines are buffered only until their quotes balance, so quoted values may
+    span lines without holding the whole body in memory. A record longer than
+    ``max_record_length`` raises ImportFormatError. Empty cells are treated as
+    missing.
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    pending_length = 0
+    row_number = 0
+    async for line in _iter_lines(chunks, max_record_length):
+        pending.append(line)
+        pending_length += len(line) + 1
+        if pending_length > max_record_length + 1:
+            raise _record_too_long(max_record_length)
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        record_text = "\n".join(pending)
+        pending = []
+        pending_length = 0
+        if not record_text.strip():
+            continue
+        record = next(csv.reader([record_text]))
+
+        if header is None:
+            header = [column.strip() for column in record]
+            unknown = sorted(set(header) - set(ApplicationCreate.model_fields))
+            if unknown:
+                raise ImportFormatError(f"Unknown CSV columns: {', '.join(unknown)}")
+            continue
+
+        row_number += 1
+        if len(record) != len(header):
+            yield row_number, (f"Expected {len(header)} columns, found {len(record)}")
+            continue
+        yield row_number, {
+            column: value for column, value in zip(header, record) if value != ""
+        }
+
+    if pending:
+        yield row_number + 1, "Unterminated quoted value"
+    elif header is None:
+        raise ImportFormatError("CSV body must start with a header row")
+
+
+async def iter_ndjson_rows(
+    chunks: AsyncIterable[bytes],
+    max_record_length: int = BULK_IMPORT_MAX_RECORD_LENGTH,
+) -> AsyncIterator[ImportRow]:
+    """Parse a streamed NDJSON body with one application object per line."""
+    row_number = 0
+    async for line in _iter_lines(chunks, max_record_length):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, "Each line must be a JSON object"
+            continue
+        yield row_number, row
+
+
+def row_parser(content_type: str) -> RowParser | None:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return iter_csv_rows
+    if media_type in NDJSON_CONTENT_TYPES:
+        return iter_ndjson_rows
+    return None
@@ -1,20 +1,124 @@
+import asyncio
+import base64
+import binascii
+import json
+import logging
 import os
+import uuid
+from collections.abc import AsyncIterable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from typing import Any
 from uuid import UUID
 
 import redis.asyncio as redis
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.models.application import Application
-from app.repositories.application_repository import ApplicationRepository
+from app.core.singleflight import SingleFlight
+from app.models.application import Application, ApplicationStatus
+from app.repositories.application_repository import (
+    BULK_INSERT_ERRORS,
+    ApplicationRepository,
+)
 from app.schemas.application import (
     ApplicationCreate,
     ApplicationDashboardResponse,
+    ApplicationImportResponse,
+    ApplicationImportRowError,
     ApplicationListParams,
     ApplicationStatusBreakdown,
     ApplicationTrendSummary,
     ApplicationUpdate,
 )
+from app.services.application_import import ImportRow
+from app.services.dashboard_counters import (
+    DASHBOARD_REBUILDS,
+    DASHBOARD_REQUESTS_COALESCED,
+    DASHBOARD_STALE_READS,
+    TREND_DAYS,
+    DashboardCounters,
+    application_deltas,
+    combine_deltas,
+    counts_to_fields,
+    summary_from_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "50000"))
+
+_DASHBOARD_FIELDS = {"status", "applied_date"}
+
+# Shared by every service instance in the worker so concurrent requests for
+# one tenant rebuild its counters once.
+_dashboard_seeds: SingleFlight[UUID, dict[str, int]] = SingleFlight()
+_dashboard_refreshes: SingleFlight[UUID, dict[str, int]] = SingleFlight()
+_background_refreshes: set[asyncio.Task] = set()
+
+_CURSOR_VALUE_PARSERS: dict[str, Callable[[str], Any]] = {
+    "applied_date": date.fromisoformat,
+    "created_at": datetime.fromisoformat,
+    "company": str,
+    "status": ApplicationStatus,
+}
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass
+class ApplicationPage:
+    items: list[Application]
+    next_cursor: str | None = None
+
+
+def _encode_cursor(params: ApplicationListParams, last: Application) -> str:
+    value = getattr(last, params.sort_by)
+    if isinstance(value, Enum):
+        value = value.value
+    elif isinstance(value, (date, datetime)):
+        value = value.isoformat()
+
+    payload = {
+        "sort_by": params.sort_by,
+        "sort_order": params.sort_order,
+        "value": value,
+        "id": str(last.id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(params: ApplicationListParams) -> tuple[Any, UUID] | None:
+    if params.cursor is None:
+        return None
 
-DASHBOARD_CACHE_TTL_SECONDS = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
+    try:
+        padded = params.cursor + "=" * (-len(params.cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if (payload["sort_by"], payload["sort_order"]) != (
+            params.sort_by,
+            params.sort_order,
+        ):
+            raise InvalidCursorError("Cursor does not match the requested sort order")
+        value = _CURSOR_VALUE_PARSERS[params.sort_by](payload["value"])
+        return value, UUID(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, KeyError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+def _validation_messages(exc: ValidationError) -> list[str]:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return messages
 
 
 class ApplicationService:
@@ -22,19 +126,133 @@ class ApplicationService:
         self,
         repository: ApplicationRepository,
         redis_client: redis.Redis | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
     ):
         self.repository = repository
         self.redis_client = redis_client
+        self.session_factory = session_factory
+        self.dashboard_counters = (
+            DashboardCounters(redis_client) if redis_client is not None else None
+        )
+
+    async def _apply_dashboard_deltas(
+        self, tenant_id: UUID, *deltas: dict[str, int]
+    ) -> None:
+        if self.dashboard_counters is None:
+            return
+
+        await self.dashboard_counters.apply(tenant_id, combine_deltas(*deltas))
+
+    async def rebuild_dashboard_counters(
+        self, tenant_id: UUID, keep_ttl: bool = False, reason: str = "seed"
+    ) -> dict[str, int] | None:
+        """Rewrite a tenant's dashboard counters from Postgres.
+
+        With ``keep_ttl`` the hash keeps its expiry and is only rewritten if it
+        still exists, so reconciliation never revives an idle tenant's counters.
+        """
+        if self.dashboard_counters is None:
+            return None
+
+        since = datetime.now(timezone.utc).date() - timedelta(days=TREND_DAYS - 1)
+        status_counts, day_counts = await self.repository.get_dashboard_counters(
+            tenant_id, since
+        )
+        fields = counts_to_fields(status_counts, day_counts)
+        replaced = await self.dashboard_counters.replace(
+            tenant_id, fields, keep_ttl=keep_ttl
+        )
+        if not replaced:
+            return None
+        DASHBOARD_REBUILDS.inc(reason=reason)
+        return fields
+
+    async def _rebuild_under_lock(
+        self, tenant_id: UUID, wait: bool, reason: str
+    ) -> dict[str, int] | None:
+        """Rebuild while holding the tenant's cross-worker refresh lock.
+
+        If another worker holds the lock, either wait for its result (``wait``)
+        or leave the refresh to it and return ``None``.
+        """
+        assert self.dashboard_counters is not None
+        token = await self.dashboard_counters.acquire_refresh_lock(tenant_id)
+        if token is None:
+            if not wait:
+                return None
+            DASHBOARD_REQUESTS_COALESCED.inc(scope="redis")
+            fields = await self.dashboard_counters.wait_for(tenant_id)
+            if fields is not None:
+                return fields
+            # The lock holder never published; rebuild ourselves.
+            return await self.rebuild_dashboard_counters(tenant_id, reason=reason)
+
+        try:
+            return await self.rebuild_dashboard_counters(
+                tenant_id, keep_ttl=not wait, reason=reason
+            )
+        finally:
+            await self.dashboard_counters.release_refresh_lock(tenant_id, token)
 
-    @staticmethod
-    def _dashboard_cache_key(tenant_id: UUID) -> str:
-        return f"dashboard:{tenant_id}"
+    async def _seed_dashboard_counters(self, tenant_id: UUID) -> dict[str, int]:
+        async def _seed() -> dict[str, int]:
+            fields = await self._rebuild_under_lock(tenant_id, wait=True, reason="seed")
+            return fields or {}
 
-    async def _invalidate_dashboard_cache(self, tenant_id: UUID) -> None:
-        if self.redis_client is None:
+        fields, shared = await _dashboard_seeds.run(tenant_id, _seed)
+        if shared:
+            DASHBOARD_REQUESTS_COALESCED.inc(scope="local")
+        return fields
+
+    def _schedule_dashboard_refresh(self, tenant_id: UUID) -> None:
+        """Refresh stale counters in the background with a session of its own."""
+        if self.session_factory is None or _dashboard_refreshes.in_flight(tenant_id):
             return
 
-        await self.redis_client.delete(self._dashboard_cache_key(tenant_id))
+        task = asyncio.get_running_loop().create_task(
+            self._refresh_dashboard_counters(tenant_id)
+        )
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+
+    async def _refresh_dashboard_counters(self, tenant_id: UUID) -> None:
+        assert self.session_factory is not None
+        try:
+            async with self.session_factory() as session:
+                service = ApplicationService(
+                    repository=ApplicationRepository(session=session),
+                    redis_client=self.redis_client,
+                )
+
+                async def _refresh() -> dict[str, int]:
+                    fields = await service._rebuild_under_lock(
+                        tenant_id, wait=False, reason="refresh"
+                    )
+                    return fields or {}
+
+                await _dashboard_refreshes.run(tenant_id, _refresh)
+        except Exception:
+            logger.exception(
+                "Dashboard counter refresh failed for tenant_id=%s", tenant_id
+            )
+
+    async def reconcile_dashboard_counters(self) -> int:
+        if self.dashboard_counters is None:
+            return 0
+
+        reconciled = 0
+        async for tenant_id in self.dashboard_counters.tenant_ids():
+            try:
+                if await self.rebuild_dashboard_counters(
+                    tenant_id, keep_ttl=True, reason="reconcile"
+                ):
+                    reconciled += 1
+            except Exception:
+                logger.exception(
+                    "Dashboard counter reconciliation failed for tenant_id=%s",
+                    tenant_id,
+                )
+        return reconciled
 
     async def create_application(
         self, tenant_id: UUID, payload: ApplicationCreate
@@ -42,9 +260,101 @@ class ApplicationService:
         data = payload.model_dump(exclude_none=True)
         data["tenant_id"] = tenant_id
         application = await self.repository.create_application(data)
-        await self._invalidate_dashboard_cache(tenant_id)
+        await self._apply_dashboard_deltas(
+            tenant_id,
+            application_deltas(
+                payload.status or ApplicationStatus.applied, payload.applied_date
+            ),
+        )
         return application
 
+    async def bulk_import_applications(
+        self,
+        tenant_id: UUID,
+        rows: AsyncIterable[ImportRow],
+        chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+        max_rows: int = BULK_IMPORT_MAX_ROWS,
+    ) -> ApplicationImportResponse:
+        """Validate streamed rows and insert the valid ones a chunk at a time.
+
+        Each chunk is committed on its own, so rows inserted before a failure
+        stay inserted. A chunk the database rejects is rolled back and its rows
+        are reported as failed. Rows past ``max_rows`` are not read and the
+        report is marked truncated. Dashboard counters are adjusted once at the
+        end.
+        """
+        received = inserted = 0
+        truncated = False
+        errors: list[ApplicationImportRowError] = []
+        chunk: list[dict[str, Any]] = []
+        chunk_rows: list[int] = []
+        chunk_deltas: list[dict[str, int]] = []
+        committed_deltas: list[dict[str, int]] = []
+
+        async def _flush() -> None:
+            nonlocal inserted, chunk, chunk_rows, chunk_deltas
+            try:
+                inserted += await self.repository.bulk_create_applications(chunk)
+            except BULK_INSERT_ERRORS:
+                logger.exception(
+                    "Bulk import of %s rows failed for tenant_id=%s",
+                    len(chunk),
+                    tenant_id,
+                )
+                errors.extend(
+                    ApplicationImportRowError(
+                        row=row_number, errors=["Could not be saved; retry this row"]
+                    )
+                    for row_number in chunk_rows
+                )
+            else:
+                committed_deltas.extend(chunk_deltas)
+            chunk, chunk_rows, chunk_deltas = [], [], []
+
+        try:
+            async for row_number, row in rows:
+                if received >= max_rows:
+                    truncated = True
+                    break
+                received += 1
+
+                if isinstance(row, str):
+                    errors.append(
+                        ApplicationImportRowError(row=row_number, errors=[row])
+                    )
+                    continue
+                try:
+                    payload = ApplicationCreate.model_validate(row)
+                except ValidationError as exc:
+                    errors.append(
+                        ApplicationImportRowError(
+                            row=row_number, errors=_validation_messages(exc)
+                        )
+                    )
+                    continue
+
+                status = payload.status or ApplicationStatus.applied
+                data = payload.model_dump()
+                data.update(id=uuid.uuid4(), tenant_id=tenant_id, status=status.value)
+                chunk.append(data)
+                chunk_rows.append(row_number)
+                chunk_deltas.append(application_deltas(status, payload.applied_date))
+                if len(chunk) >= chunk_size:
+                    await _flush()
+
+            await _flush()
+        finally:
+            if committed_deltas:
+                await self._apply_dashboard_deltas(tenant_id, *committed_deltas)
+
+        return ApplicationImportResponse(
+            received=received,
+            inserted=inserted,
+            failed=len(errors),
+            truncated=truncated,
+            errors=sorted(errors, key=lambda error: error.row),
+        )
+
     async def get_application_by_id(
         self, tenant_id: UUID, application_id: UUID
     ) -> Application | None:
@@ -53,7 +363,18 @@ class ApplicationService:
     async def list_applications(
         self, tenant_id: UUID, params: ApplicationListParams
     ) -> list[Application]:
-        return await self.repository.list_applications(
+        page = await self.list_applications_page(tenant_id, params)
+        return page.items
+
+    async def list_applications_page(
+        self, tenant_id: UUID, params: ApplicationListParams
+    ) -> ApplicationPage:
+        """List one page and, when it is full, the cursor for the next one."""
+        after = _decode_cursor(params)
+        if after is not None and params.offset:
+            raise InvalidCursorError("cursor and offset cannot be combined")
+
+        items = await self.repository.list_applications(
             tenant_id=tenant_id,
             limit=params.limit,
             offset=params.offset,
@@ -61,18 +382,29 @@ class ApplicationService:
             company=params.company,
             sort_by=params.sort_by,
             sort_order=params.sort_order,
+            after=after,
+            search=params.q,
+            search_mode=params.search_mode,
         )
+        next_cursor = None
+        if items and len(items) == params.limit:
+            next_cursor = _encode_cursor(params, items[-1])
+        return ApplicationPage(items=items, next_cursor=next_cursor)
 
     async def get_dashboard_summary(
         self, tenant_id: UUID
     ) -> ApplicationDashboardResponse:
-        cache_key = self._dashboard_cache_key(tenant_id)
-        if self.redis_client is not None:
-            cached_payload = await self.redis_client.get(cache_key)
-            if cached_payload is not None:
-                return ApplicationDashboardResponse.model_validate_json(cached_payload)
+        if self.dashboard_counters is None:
+            raw_summary = await self.repository.get_dashboard_summary(tenant_id)
+        else:
+            fields = await self.dashboard_counters.load(tenant_id)
+            if fields is None:
+                fields = await self._seed_dashboard_counters(tenant_id)
+            elif self.dashboard_counters.is_stale(fields):
+                DASHBOARD_STALE_READS.inc()
+                self._schedule_dashboard_refresh(tenant_id)
+            raw_summary = summary_from_fields(fields, datetime.now(timezone.utc).date())
 
-        raw_summary = await self.repository.get_dashboard_summary(tenant_id)
         breakdown = ApplicationStatusBreakdown(
             applied=raw_summary["applied"],
             screening=raw_summary["screening"],
@@ -96,13 +428,6 @@ class ApplicationService:
             trends=trends,
         )
 
-        if self.redis_client is not None:
-            await self.redis_client.setex(
-                cache_key,
-                DASHBOARD_CACHE_TTL_SECONDS,
-                dashboard.model_dump_json(),
-            )
-
         return dashboard
 
     async def update_application(
@@ -112,11 +437,22 @@ class ApplicationService:
         payload: ApplicationUpdate,
     ) -> Application | None:
         updates = payload.model_dump(exclude_unset=True)
-        updated = await self.repository.update_application(
+        if self.dashboard_counters is None or not _DASHBOARD_FIELDS & set(updates):
+            return await self.repository.update_application(
+                tenant_id, application_id, updates
+            )
+
+        result = await self.repository.update_application_with_previous(
             tenant_id, application_id, updates
         )
-        if updated is not None:
-            await self._invalidate_dashboard_cache(tenant_id)
+        if result is None:
+            return None
+        updated, previous_status, previous_applied_date = result
+        await self._apply_dashboard_deltas(
+            tenant_id,
+            application_deltas(previous_status, previous_applied_date, sign=-1),
+            application_deltas(updated.status, updated.applied_date),
+        )
         return updated
 
     async def soft_delete_application(
@@ -126,5 +462,8 @@ class ApplicationService:
             tenant_id, application_id
         )
         if deleted is not None:
-            await self._invalidate_dashboard_cache(tenant_id)
+            await self._apply_dashboard_deltas(
+                tenant_id,
+                application_deltas(deleted.status, deleted.applied_date, sign=-1),
+            )
         return deleted
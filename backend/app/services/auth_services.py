@@ -1,8 +1,13 @@
+from collections.abc import Callable
+from typing import TypeVar
+
 import redis.asyncio as redis
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.executor import ExecutorOverloadedError
+from app.core.redis import LuaScript
 from app.core.security import (
     REFRESH_EXPIRE_MINUTES,
     create_access_token,
@@ -10,6 +15,7 @@ from app.core.security import (
     decode_token,
     hash_password,
     hash_token,
+    password_executor,
     verify_password,
 )
 from app.models.tenant import Tenant
@@ -25,6 +31,43 @@ from app.schemas.auth import (
     UserLogin,
 )
 
+T = TypeVar("T")
+
+# KEYS: token key, index key. ARGV: token hash, token id, ttl seconds.
+STORE_REFRESH_TOKEN_SCRIPT = LuaScript(
+    """
+redis.call('SETEX', KEYS[1], ARGV[3], ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+)
+
+REFRESH_ROTATED = 1
+
+# KEYS: old token key, index key, new token key.
+# ARGV: presented hash, old token id, new token id, new hash, ttl seconds.
+# Returns 1 when rotated, 0 when the old token is missing, -1 on hash mismatch.
+# Verifying and revoking in one step means only one of several concurrent
+# refreshes with the same token can win; the rest see it as missing.
+ROTATE_REFRESH_TOKEN_SCRIPT = LuaScript(
+    """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return 0
+end
+if stored ~= ARGV[1] then
+    return -1
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[2])
+redis.call('SETEX', KEYS[3], ARGV[5], ARGV[4])
+redis.call('SADD', KEYS[2], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[5])
+return 1
+"""
+)
+
 
 class AuthService:
     def __init__(self, db: AsyncSession, redis_client: redis.Redis):
@@ -39,16 +82,53 @@ class AuthService:
     def _refresh_index_key(user_id: str) -> str:
         return f"refresh_index:{user_id}"
 
+    @staticmethod
+    async def _run_password_task(func: Callable[..., T], *args: object) -> T:
+        try:
+            return await password_executor.run(func, *args)
+        except ExecutorOverloadedError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded. Please retry.",
+                headers={"Retry-After": "1"},
+            )
+
     async def _store_refresh_token(
         self, user_id: str, token_id: str, token: str
     ) -> None:
-        ttl_seconds = REFRESH_EXPIRE_MINUTES * 60
-        key = self._refresh_key(user_id, token_id)
-        index_key = self._refresh_index_key(user_id)
+        await STORE_REFRESH_TOKEN_SCRIPT(
+            self.redis_client,
+            keys=[
+                self._refresh_key(user_id, token_id),
+                self._refresh_index_key(user_id),
+            ],
+            args=[hash_token(token), token_id, REFRESH_EXPIRE_MINUTES * 60],
+        )
 
-        await self.redis_client.setex(key, ttl_seconds, hash_token(token))
-        await self.redis_client.sadd(index_key, token_id)
-        await self.redis_client.expire(index_key, ttl_seconds)
+    async def _rotate_refresh_token(
+        self,
+        user_id: str,
+        token_id: str,
+        token: str,
+        new_token_id: str,
+        new_token: str,
+    ) -> int:
+        result = await ROTATE_REFRESH_TOKEN_SCRIPT(
+            self.redis_client,
+            keys=[
+                self._refresh_key(user_id, token_id),
+                self._refresh_index_key(user_id),
+                self._refresh_key(user_id, new_token_id),
+            ],
+            args=[
+                hash_token(token),
+                token_id,
+                new_token_id,
+                hash_token(new_token),
+                REFRESH_EXPIRE_MINUTES * 60,
+            ],
+        )
+        return int(result)
 
     async def _revoke_refresh_token(self, user_id: str, token_id: str) -> int:
         key = self._refresh_key(user_id, token_id)
@@ -87,7 +167,9 @@ class AuthService:
                 detail="Email already registered",
             )
 
-        hashed = hash_password(payload.password.get_secret_value())
+        hashed = await self._run_password_task(
+            hash_password, payload.password.get_secret_value()
+        )
 
         user = User(
             email=payload.email,
@@ -127,8 +209,8 @@ class AuthService:
                 detail="Invalid email or password",
             )
 
-        if not verify_password(
-            payload.password.get_secret_value(), user.hashed_password
+        if not await self._run_password_task(
+            verify_password, payload.password.get_secret_value(), user.hashed_password
         ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,31 +244,21 @@ class AuthService:
                 detail="Invalid refresh token payload",
             )
 
-        redis_key = self._refresh_key(sub, token_id)
-        stored_refresh_token_hash = await self.redis_client.get(redis_key)
-        presented_token_hash = hash_token(payload.refresh_token)
-
-        if stored_refresh_token_hash is None:
-            # A structurally valid token that is missing from Redis
-            # is likely replayed/revoked.
-            await self._revoke_all_refresh_tokens(sub, current_token_id=token_id)
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token reuse detected. Please log in again.",
-            )
+        new_refresh_token, new_token_id = create_refresh_token(sub)
+        rotated = await self._rotate_refresh_token(
+            sub, token_id, payload.refresh_token, new_token_id, new_refresh_token
+        )
 
-        if stored_refresh_token_hash != presented_token_hash:
+        if rotated != REFRESH_ROTATED:
+            # A structurally valid token that is missing from Redis or does not
+            # match the stored hash is likely replayed/revoked.
             await self._revoke_all_refresh_tokens(sub, current_token_id=token_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token reuse detected. Please log in again.",
             )
 
-        await self._revoke_refresh_token(sub, token_id)
-
         access_token = create_access_token(sub)
-        new_refresh_token, new_token_id = create_refresh_token(sub)
-        await self._store_refresh_token(sub, new_token_id, new_refresh_token)
 
         return TokenResponse(
             access_token=access_token,
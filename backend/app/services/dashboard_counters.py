@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Mapping
+from datetime import date, timedelta
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.metrics import registry
+from app.core.redis import LuaScript
+from app.models.application import ApplicationStatus
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_COUNTERS_TTL_SECONDS = int(
+    os.getenv("DASHBOARD_COUNTERS_TTL_SECONDS", "86400")
+)
+DASHBOARD_RECONCILE_INTERVAL_SECONDS = int(
+    os.getenv("DASHBOARD_RECONCILE_INTERVAL_SECONDS", "300")
+)
+DASHBOARD_COUNTERS_SOFT_TTL_SECONDS = int(
+    os.getenv("DASHBOARD_COUNTERS_SOFT_TTL_SECONDS", "60")
+)
+DASHBOARD_REFRESH_LOCK_SECONDS = float(
+    os.getenv("DASHBOARD_REFRESH_LOCK_SECONDS", "10")
+)
+REFRESH_POLL_INTERVAL_SECONDS = 0.05
+TREND_WINDOWS = {"applied_last_7_days": 7, "applied_last_30_days": 30}
+TREND_DAYS = max(TREND_WINDOWS.values())
+
+_KEY_PREFIX = "dashboard:counters:"
+_LOCK_PREFIX = "dashboard:refresh-lock:"
+REFRESHED_AT_FIELD = "meta:refreshed_at"
+
+DASHBOARD_REQUESTS_COALESCED = registry.counter(
+    "dashboard_requests_coalesced_total",
+    "Dashboard reads that waited on another request's counter rebuild",
+    labelnames=("scope",),
+)
+DASHBOARD_STALE_READS = registry.counter(
+    "dashboard_stale_reads_total",
+    "Dashboard reads served from counters past their soft TTL",
+)
+DASHBOARD_REBUILDS = registry.counter(
+    "dashboard_counter_rebuilds_total",
+    "Dashboard counter rewrites from Postgres",
+    labelnames=("reason",),
+)
+
+# KEYS: counters hash. ARGV: field, delta, field, delta, ...
+# A missing hash is left alone; the next read seeds it from Postgres.
+APPLY_DELTAS_SCRIPT = LuaScript(
+    """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+for i = 1, #ARGV, 2 do
+  redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+)
+
+# KEYS: counters hash. ARGV: ttl in ms, field, count, field, count, ...
+# A ttl of 0 keeps the current expiry and skips hashes that have expired.
+REPLACE_COUNTERS_SCRIPT = LuaScript(
+    """
+local ttl_ms = tonumber(ARGV[1])
+if ttl_ms == 0 then
+  ttl_ms = redis.call('PTTL', KEYS[1])
+  if ttl_ms <= 0 then
+    return 0
+  end
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('PEXPIRE', KEYS[1], ttl_ms)
+return 1
+"""
+)
+
+# KEYS: lock key. ARGV: owner token.
+RELEASE_LOCK_SCRIPT = LuaScript(
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+)
+
+
+def status_field(status: ApplicationStatus) -> str:
+    return f"status:{status.value}"
+
+
+def day_field(day: date) -> str:
+    return f"day:{day.isoformat()}"
+
+
+def application_deltas(
+    status: ApplicationStatus, applied_date: date, sign: int = 1
+) -> dict[str, int]:
+    return {status_field(status): sign, day_field(applied_date): sign}
+
+
+def combine_deltas(*deltas: Mapping[str, int]) -> dict[str, int]:
+    combined: dict[str, int] = {}
+    for delta in deltas:
+        for field, amount in delta.items():
+            combined[field] = combined.get(field, 0) + amount
+    return {field: amount for field, amount in combined.items() if amount}
+
+
+def counts_to_fields(
+    status_counts: Mapping[str, int], day_counts: Mapping[date, int]
+) -> dict[str, int]:
+    fields = {status_field(status): 0 for status in ApplicationStatus}
+    for status, count in status_counts.items():
+        fields[status_field(ApplicationStatus(status))] = count
+    for day, count in day_counts.items():
+        fields[day_field(day)] = count
+    return fields
+
+
+def summary_from_fields(fields: Mapping[str, int], today: date) -> dict[str, int]:
+    """Build the repository's dashboard summary shape from counter fields."""
+    summary = {
+        status.value: max(0, fields.get(status_field(status), 0))
+        for status in ApplicationStatus
+    }
+    for name, days in TREND_WINDOWS.items():
+        summary[name] = max(
+            0,
+            sum(
+                fields.get(day_field(today - timedelta(days=offset)), 0)
+                for offset in range(days)
+            ),
+        )
+    return summary
+
+
+class DashboardCounters:
+    """Per-tenant dashboard counts kept in a Redis hash and adjusted by deltas.
+
+    The hash holds one ``status:<value>`` field per status and one
+    ``day:<date>`` field per ``applied_date`` seen recently, so trend windows
+    are sums of day buckets. Deltas only apply to a hash that exists; seeding
+    and periodic reconciliation rewrite it from Postgres, which also repairs
+    any drift from deltas lost around a rewrite or a Redis error. Each rewrite
+    stamps ``meta:refreshed_at`` so readers can tell when a hash is past its
+    soft TTL.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        ttl_seconds: int = DASHBOARD_COUNTERS_TTL_SECONDS,
+        soft_ttl_seconds: int = DASHBOARD_COUNTERS_SOFT_TTL_SECONDS,
+        lock_seconds: float = DASHBOARD_REFRESH_LOCK_SECONDS,
+    ):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.soft_ttl_seconds = soft_ttl_seconds
+        self.lock_seconds = lock_seconds
+
+    @staticmethod
+    def key(tenant_id: UUID) -> str:
+        return f"{_KEY_PREFIX}{tenant_id}"
+
+    @staticmethod
+    def lock_key(tenant_id: UUID) -> str:
+        return f"{_LOCK_PREFIX}{tenant_id}"
+
+    def is_stale(self, fields: Mapping[str, int], now: float | None = None) -> bool:
+        refreshed_at = fields.get(REFRESHED_AT_FIELD)
+        if refreshed_at is None:
+            return True
+        current = time.time() if now is None else now
+        return current - refreshed_at >= self.soft_ttl_seconds
+
+    async def apply(self, tenant_id: UUID, deltas: Mapping[str, int]) -> bool:
+        args: list[str | int] = []
+        for field, amount in deltas.items():
+            if amount:
+                args.extend((field, amount))
+        if not args:
+            return False
+
+        try:
+            applied = await APPLY_DELTAS_SCRIPT(
+                self.redis_client, [self.key(tenant_id)], args
+            )
+        except redis.RedisError:
+            logger.warning(
+                "Dashboard counter update failed for tenant_id=%s",
+                tenant_id,
+                exc_info=True,
+            )
+            return False
+        return bool(applied)
+
+    async def load(self, tenant_id: UUID) -> dict[str, int] | None:
+        fields = await self.redis_client.hgetall(self.key(tenant_id))
+        if not fields:
+            return None
+        return {field: int(value) for field, value in fields.items()}
+
+    async def replace(
+        self, tenant_id: UUID, fields: Mapping[str, int], keep_ttl: bool = False
+    ) -> bool:
+        ttl_ms = 0 if keep_ttl else self.ttl_seconds * 1000
+        args: list[str | int] = [ttl_ms, REFRESHED_AT_FIELD, int(time.time())]
+        for field, count in fields.items():
+            args.extend((field, count))
+        replaced = await REPLACE_COUNTERS_SCRIPT(
+            self.redis_client, [self.key(tenant_id)], args
+        )
+        return bool(replaced)
+
+    async def acquire_refresh_lock(self, tenant_id: UUID) -> str | None:
+        token = uuid.uuid4().hex
+        acquired = await self.redis_client.set(
+            self.lock_key(tenant_id),
+            token,
+            nx=True,
+            px=int(self.lock_seconds * 1000),
+        )
+        return token if acquired else None
+
+    async def release_refresh_lock(self, tenant_id: UUID, token: str) -> None:
+        try:
+            await RELEASE_LOCK_SCRIPT(
+                self.redis_client, [self.lock_key(tenant_id)], [token]
+            )
+        except redis.RedisError:
+            logger.warning("Dashboard refresh lock release failed", exc_info=True)
+
+    async def wait_for(self, tenant_id: UUID) -> dict[str, int] | None:
+        """Poll until another worker's rebuild lands or its lock goes away."""
+        deadline = time.monotonic() + self.lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(REFRESH_POLL_INTERVAL_SECONDS)
+            fields = await self.load(tenant_id)
+            if fields is not None:
+                return fields
+            if not await self.redis_client.exists(self.lock_key(tenant_id)):
+                return None
+        return None
+
+    async def tenant_ids(self) -> AsyncIterator[UUID]:
+        async for key in self.redis_client.scan_iter(match=f"{_KEY_PREFIX}*"):
+            try:
+                yield UUID(key.removeprefix(_KEY_PREFIX))
+            except ValueError:
+                continue
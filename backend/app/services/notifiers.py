@@ -0,0 +1,388 @@
+import asyncio
+import logging
+import os
+import smtplib
+import ssl
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Collection, Sequence
+from email.message import EmailMessage
+from typing import Any
+from uuid import UUID
+
+import httpx
+
+from app.core.executor import BoundedExecutor
+from app.core.metrics import registry
+from app.core.tracing import inject_trace_context
+from app.db.session import AsyncSessionLocal
+from app.models.reminder import Reminder
+from app.repositories.reminder_repository import ReminderRepository
+
+logger = logging.getLogger(__name__)
+
+REMINDER_NOTIFIER = os.getenv("REMINDER_NOTIFIER", "log")
+REMINDER_WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL", "")
+REMINDER_WEBHOOK_TIMEOUT_SECONDS = float(
+    os.getenv("REMINDER_WEBHOOK_TIMEOUT_SECONDS", "10")
+)
+REMINDER_WEBHOOK_BATCH_SIZE = int(os.getenv("REMINDER_WEBHOOK_BATCH_SIZE", "50"))
+REMINDER_WEBHOOK_CONCURRENCY = int(os.getenv("REMINDER_WEBHOOK_CONCURRENCY", "10"))
+REMINDER_SMTP_HOST = os.getenv("REMINDER_SMTP_HOST", "")
+REMINDER_SMTP_PORT = int(os.getenv("REMINDER_SMTP_PORT", "587"))
+REMINDER_SMTP_USERNAME = os.getenv("REMINDER_SMTP_USERNAME", "")
+REMINDER_SMTP_PASSWORD = os.getenv("REMINDER_SMTP_PASSWORD", "")
+REMINDER_SMTP_STARTTLS = os.getenv(
+    "REMINDER_SMTP_STARTTLS", "true"
+).strip().lower() not in {"0", "false", "no", "off"}
+REMINDER_SMTP_FROM = os.getenv("REMINDER_SMTP_FROM", "")
+REMINDER_SMTP_TIMEOUT_SECONDS = float(os.getenv("REMINDER_SMTP_TIMEOUT_SECONDS", "10"))
+REMINDER_SMTP_BATCH_SIZE = int(os.getenv("REMINDER_SMTP_BATCH_SIZE", "20"))
+REMINDER_SMTP_CONCURRENCY = int(os.getenv("REMINDER_SMTP_CONCURRENCY", "2"))
+
+REMINDER_NOTIFICATIONS = registry.counter(
+    "reminder_notifications_total",
+    "Reminder notifications by backend and outcome",
+    labelnames=("backend", "outcome"),
+)
+REMINDER_NOTIFY_BATCH_SECONDS = registry.histogram(
+    "reminder_notify_batch_seconds",
+    "Time a notifier backend took to send one batch",
+    labelnames=("backend",),
+)
+
+
+async def tenant_admin_emails(tenant_ids: Collection[UUID]) -> dict[UUID, list[str]]:
+    async with AsyncSessionLocal() as session:
+        return await ReminderRepository(session).fetch_tenant_admin_emails(tenant_ids)
+
+
+def _reminder_payload(reminder: Reminder) -> dict[str, Any]:
+    return {
+        "id": str(reminder.id),
+        "tenant_id": str(reminder.tenant_id),
+        "application_id": str(reminder.application_id),
+        "remind_at": reminder.remind_at.isoformat(),
+        "message": reminder.message,
+    }
+
+
+class Notifier(ABC):
+    """Call :meth:`deliver`; it limits concurrency and records metrics."""
+
+    name = "notifier"
+
+    def __init__(self, concurrency: int = 1, batch_size: int = 1):
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def _limit(self) -> asyncio.Semaphore:
+        # The process-wide notifier can outlive an event loop, and a semaphore
+        # is bound to the loop it first waited on.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @abstractmethod
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]: ...
+
+    async def deliver(self, reminders: Sequence[Reminder]) -> list[bool]:
+        async with self._limit():
+            started = time.perf_counter()
+            try:
+                results = await self.send_batch(reminders)
+            except Exception:
+                logger.exception(
+                    "%s notifier failed to send reminder_ids=%s",
+                    self.name,
+                    [str(reminder.id) for reminder in reminders],
+                )
+                results = [False] * len(reminders)
+            REMINDER_NOTIFY_BATCH_SECONDS.observe(
+                time.perf_counter() - started, backend=self.name
+            )
+
+        sent = sum(results)
+        if sent:
+            REMINDER_NOTIFICATIONS.inc(sent, backend=self.name, outcome="sent")
+        if sent < len(results):
+            REMINDER_NOTIFICATIONS.inc(
+                len(results) - sent, backend=self.name, outcome="failed"
+            )
+        return results
+
+    async def aclose(self) -> None:
+        return None
+
+
+class LogNotifier(Notifier):
+    name = "log"
+
+    def __init__(self, concurrency: int = 1, batch_size: int = 100):
+        super().__init__(concurrency=concurrency, batch_size=batch_size)
+
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]:
+        for reminder in reminders:
+            logger.info(
+                "Sending reminder : reminder_id=%s tenant_id=%s application_id=%s",
+                reminder.id,
+                reminder.tenant_id,
+                reminder.application_id,
+            )
+        return [True] * len(reminders)
+
+
+class CallableNotifier(Notifier):
+    name = "callable"
+
+    def __init__(
+        self, func: Callable[[Reminder], Awaitable[None]], concurrency: int = 1
+    ):
+        super().__init__(concurrency=concurrency, batch_size=1)
+        self.func = func
+
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]:
+        for reminder in reminders:
+            await self.func(reminder)
+        return [True] * len(reminders)
+
+
+class InMemoryNotifier(Notifier):
+    name = "memory"
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        batch_size: int = 100,
+        fail_ids: Collection[UUID] = (),
+    ):
+        super().__init__(concurrency=concurrency, batch_size=batch_size)
+        self.fail_ids = set(fail_ids)
+        self.sent: list[Reminder] = []
+        self.batches: list[list[UUID]] = []
+
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]:
+        self.batches.append([reminder.id for reminder in reminders])
+        results = []
+        for reminder in reminders:
+            ok = reminder.id not in self.fail_ids
+            if ok:
+                self.sent.append(reminder)
+            results.append(ok)
+        return results
+
+
+class WebhookNotifier(Notifier):
+    name = "webhook"
+
+    def __init__(
+        self,
+        url: str,
+        timeout_seconds: float = REMINDER_WEBHOOK_TIMEOUT_SECONDS,
+        concurrency: int = REMINDER_WEBHOOK_CONCURRENCY,
+        batch_size: int = REMINDER_WEBHOOK_BATCH_SIZE,
+        client: httpx.AsyncClient | None = None,
+    ):
+        super().__init__(concurrency=concurrency, batch_size=batch_size)
+        self.url = url
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+        self.client = client
+
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]:
+        response = await self.client.post(
+            self.url,
+            json={"reminders": [_reminder_payload(reminder) for reminder in reminders]},
+            headers=inject_trace_context({}),
+        )
+        response.raise_for_status()
+        return [True] * len(reminders)
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+
+class SmtpNotifier(Notifier):
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        sender: str,
+        recipients: Callable[
+            [Collection[UUID]], Awaitable[dict[UUID, list[str]]]
+        ] = tenant_admin_emails,
+        port: int = REMINDER_SMTP_PORT,
+        username: str = REMINDER_SMTP_USERNAME,
+        password: str = REMINDER_SMTP_PASSWORD,
+        starttls: bool = REMINDER_SMTP_STARTTLS,
+        timeout_seconds: float = REMINDER_SMTP_TIMEOUT_SECONDS,
+        concurrency: int = REMINDER_SMTP_CONCURRENCY,
+        batch_size: int = REMINDER_SMTP_BATCH_SIZE,
+    ):
+        super().__init__(concurrency=concurrency, batch_size=batch_size)
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout_seconds = timeout_seconds
+        self._executor = BoundedExecutor(
+            "reminder_smtp", self.concurrency, self.concurrency
+        )
+        self._idle: list[smtplib.SMTP] = []
+
+    def _message(self, reminder: Reminder, recipients: list[str]) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(recipients)
+        message["Subject"] = "Application reminder"
+        message["X-Reminder-Id"] = str(reminder.id)
+        message.set_content(
+            reminder.message or f"Reminder for application {reminder.application_id}"
+        )
+        return message
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout_seconds)
+        try:
+            if self.starttls:
+                connection.starttls(context=ssl.create_default_context())
+            if self.username:
+                connection.login(self.username, self.password)
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def _send_messages(
+        self, connection: smtplib.SMTP | None, messages: list[EmailMessage]
+    ) -> tuple[smtplib.SMTP | None, list[bool]]:
+        # Runs on the executor since smtplib blocks. Idle connections may
+        # have been dropped by the server, so check them before reuse.
+        if connection is not None:
+            try:
+                healthy = connection.noop()[0] == 250
+            except OSError:
+                healthy = False
+            if not healthy:
+                connection.close()
+                connection = None
+        if connection is None:
+            connection = self._connect()
+
+        results: list[bool] = []
+        try:
+            for message in messages:
+                try:
+                    connection.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    raise
+                except smtplib.SMTPException:
+                    logger.warning("SMTP server rejected a reminder", exc_info=True)
+                    results.append(False)
+                else:
+                    results.append(True)
+        except OSError:
+            # The rest of the batch cannot go out on this connection; fail it
+            # without resending what was already accepted.
+            logger.warning("SMTP connection lost mid-batch", exc_info=True)
+            connection.close()
+            results.extend([False] * (len(messages) - len(results)))
+            return None, results
+        return connection, results
+
+    async def send_batch(self, reminders: Sequence[Reminder]) -> list[bool]:
+        # Reminders only go to their own tenant's admins; one without any
+        # fails and is retried with backoff.
+        recipients = await self.recipients(
+            {reminder.tenant_id for reminder in reminders}
+        )
+        addressed = [
+            (position, self._message(reminder, recipients[reminder.tenant_id]))
+            for position, reminder in enumerate(reminders)
+            if recipients.get(reminder.tenant_id)
+        ]
+        results = [False] * len(reminders)
+        if len(addressed) < len(reminders):
+            logger.warning(
+                "No tenant admin email for %s reminders",
+                len(reminders) - len(addressed),
+            )
+        if not addressed:
+            return results
+
+        connection = self._idle.pop() if self._idle else None
+        connection, sent = await self._executor.run(
+            self._send_messages, connection, [message for _, message in addressed]
+        )
+        if connection is not None:
+            self._idle.append(connection)
+        for (position, _), ok in zip(addressed, sent):
+            results[position] = ok
+        return results
+
+    def _quit(self, connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except OSError:
+            connection.close()
+
+    async def aclose(self) -> None:
+        while self._idle:
+            await self._executor.run(self._quit, self._idle.pop())
+        self._executor.shutdown()
+
+
+def _required(name: str, value: str) -> str:
+    if not value:
+        raise RuntimeError(f"Missing required env var: {name}")
+    return value
+
+
+def build_notifier(backend: str = REMINDER_NOTIFIER) -> Notifier:
+    backend = backend.strip().lower()
+    if backend == "log":
+        return LogNotifier()
+    if backend == "memory":
+        return InMemoryNotifier()
+    if backend == "webhook":
+        return WebhookNotifier(_required("REMINDER_WEBHOOK_URL", REMINDER_WEBHOOK_URL))
+    if backend == "smtp":
+        return SmtpNotifier(
+            host=_required("REMINDER_SMTP_HOST", REMINDER_SMTP_HOST),
+            sender=_required("REMINDER_SMTP_FROM", REMINDER_SMTP_FROM),
+        )
+    raise ValueError(f"Unknown REMINDER_NOTIFIER backend: {backend}")
+
+
+_notifier: Notifier | None = None
+
+
+def get_notifier() -> Notifier:
+    """Return the process-wide notifier, building it on first use."""
+    global _notifier
+    if _notifier is None:
+        _notifier = build_notifier()
+    return _notifier
+
+
+async def close_notifier() -> None:
+    global _notifier
+    if _notifier is not None:
+        notifier, _notifier = _notifier, None
+        await notifier.aclose()
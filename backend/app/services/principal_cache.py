@@ -0,0 +1,281 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.metrics import registry
+from app.models.tenant import Tenant
+from app.models.tenant_user import TenantUser
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+PRINCIPAL_CACHE_LOCAL_TTL_SECONDS = float(
+    os.getenv("PRINCIPAL_CACHE_LOCAL_TTL_SECONDS", "30")
+)
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+INVALIDATION_CHANNEL = "principal:invalidate"
+INVALIDATION_RETRY_SECONDS = 5.0
+
+PRINCIPAL_CACHE_LOOKUPS = registry.counter(
+    "principal_cache_lookups_total",
+    "Principal cache lookups by entry kind and outcome",
+    labelnames=("kind", "result"),
+)
+
+_PENDING_INVALIDATIONS_KEY = "principal_cache_invalidations"
+
+
+def _user_to_payload(user: User) -> dict[str, Any]:
+    # The password hash is deliberately left out of the shared cache.
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat(),
+        "last_update": user.last_update.isoformat(),
+    }
+
+
+def _user_from_payload(payload: dict[str, Any]) -> User:
+    return User(
+        id=UUID(payload["id"]),
+        email=payload["email"],
+        username=payload["username"],
+        first_name=payload["first_name"],
+        last_name=payload["last_name"],
+        is_active=payload["is_active"],
+        created_at=datetime.fromisoformat(payload["created_at"]),
+        last_update=datetime.fromisoformat(payload["last_update"]),
+    )
+
+
+def _tenant_to_payload(tenant: Tenant) -> dict[str, Any]:
+    return {
+        "id": str(tenant.id),
+        "name": tenant.name,
+        "created_at": tenant.created_at.isoformat(),
+    }
+
+
+def _tenant_from_payload(payload: dict[str, Any]) -> Tenant:
+    return Tenant(
+        id=UUID(payload["id"]),
+        name=payload["name"],
+        created_at=datetime.fromisoformat(payload["created_at"]),
+    )
+
+
+class PrincipalCache:
+    """Two-tier cache of authenticated users and their tenant memberships.
+
+    Entries live in a short-lived in-process LRU backed by Redis. Only positive
+    membership lookups are cached, so granting access takes effect immediately;
+    revocations and user changes are invalidated through :meth:`invalidate_user`
+    and :meth:`invalidate_membership`, which also notify other workers.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        local_ttl_seconds: float = PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+        ttl_seconds: int = PRINCIPAL_CACHE_TTL_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_client: redis.Redis | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+        self._users: TTLCache[UUID, dict[str, Any]] = TTLCache(
+            maxsize, local_ttl_seconds
+        )
+        self._memberships: TTLCache[tuple[UUID, UUID], dict[str, Any]] = TTLCache(
+            maxsize, local_ttl_seconds
+        )
+
+    def configure(self, redis_client: redis.Redis | None) -> None:
+        self.redis_client = redis_client
+
+    @staticmethod
+    def _user_key(user_id: UUID) -> str:
+        return f"principal:user:{user_id}"
+
+    @staticmethod
+    def _membership_key(user_id: UUID, tenant_id: UUID) -> str:
+        return f"principal:membership:{user_id}:{tenant_id}"
+
+    async def _redis_get(self, key: str) -> dict[str, Any] | None:
+        if self.redis_client is None:
+            return None
+        try:
+            cached = await self.redis_client.get(key)
+        except redis.RedisError:
+            logger.warning("Principal cache read failed", exc_info=True)
+            return None
+        return None if cached is None else json.loads(cached)
+
+    async def _redis_set(self, key: str, payload: dict[str, Any]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.setex(key, self.ttl_seconds, json.dumps(payload))
+        except redis.RedisError:
+            logger.warning("Principal cache write failed", exc_info=True)
+
+    async def get_user(self, user_id: UUID) -> User | None:
+        payload = self._users.get(user_id)
+        if payload is not None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(kind="user", result="local_hit")
+            return _user_from_payload(payload)
+
+        payload = await self._redis_get(self._user_key(user_id))
+        if payload is not None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(kind="user", result="redis_hit")
+            self._users.set(user_id, payload)
+            return _user_from_payload(payload)
+
+        PRINCIPAL_CACHE_LOOKUPS.inc(kind="user", result="miss")
+        return None
+
+    async def set_user(self, user: User) -> None:
+        payload = _user_to_payload(user)
+        self._users.set(user.id, payload)
+        await self._redis_set(self._user_key(user.id), payload)
+
+    async def get_tenant(self, user_id: UUID, tenant_id: UUID) -> Tenant | None:
+        local_key = (user_id, tenant_id)
+        payload = self._memberships.get(local_key)
+        if payload is not None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(kind="membership", result="local_hit")
+            return _tenant_from_payload(payload)
+
+        payload = await self._redis_get(self._membership_key(user_id, tenant_id))
+        if payload is not None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(kind="membership", result="redis_hit")
+            self._memberships.set(local_key, payload)
+            return _tenant_from_payload(payload)
+
+        PRINCIPAL_CACHE_LOOKUPS.inc(kind="membership", result="miss")
+        return None
+
+    async def set_tenant(self, user_id: UUID, tenant: Tenant) -> None:
+        payload = _tenant_to_payload(tenant)
+        self._memberships.set((user_id, tenant.id), payload)
+        await self._redis_set(self._membership_key(user_id, tenant.id), payload)
+
+    @classmethod
+    def user_invalidation(cls, user_id: UUID) -> tuple[str, str]:
+        return f"user:{user_id}", cls._user_key(user_id)
+
+    @classmethod
+    def membership_invalidation(cls, user_id: UUID, tenant_id: UUID) -> tuple[str, str]:
+        return (
+            f"membership:{user_id}:{tenant_id}",
+            cls._membership_key(user_id, tenant_id),
+        )
+
+    def evict_local(self, message: str) -> None:
+        kind, _, ids = message.partition(":")
+        try:
+            if kind == "user":
+                self._users.pop(UUID(ids))
+            elif kind == "membership":
+                user_id, _, tenant_id = ids.partition(":")
+                self._memberships.pop((UUID(user_id), UUID(tenant_id)))
+        except ValueError:
+            logger.warning("Ignoring malformed principal invalidation: %s", message)
+
+    async def publish_invalidation(self, message: str, key: str) -> None:
+        """Drop the shared entry and tell other workers to evict theirs."""
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.delete(key)
+            await self.redis_client.publish(INVALIDATION_CHANNEL, message)
+        except redis.RedisError:
+            logger.warning("Principal cache invalidation failed", exc_info=True)
+
+    async def invalidate(self, message: str, key: str) -> None:
+        self.evict_local(message)
+        await self.publish_invalidation(message, key)
+
+    async def invalidate_user(self, user_id: UUID) -> None:
+        await self.invalidate(*self.user_invalidation(user_id))
+
+    async def invalidate_membership(self, user_id: UUID, tenant_id: UUID) -> None:
+        await self.invalidate(*self.membership_invalidation(user_id, tenant_id))
+
+    def schedule_invalidation(self, message: str, key: str) -> None:
+        """Evict locally now and publish from the running loop, if there is one."""
+        self.evict_local(message)
+        if self.redis_client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self.publish_invalidation(message, key))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def listen_for_invalidations(self) -> None:
+        """Evict local entries invalidated by other workers until cancelled."""
+        while self.redis_client is not None:
+            try:
+                async with self.redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.evict_local(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Principal cache invalidation listener failed; retrying",
+                    exc_info=True,
+                )
+                await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+
+    def clear_local(self) -> None:
+        self._users.clear()
+        self._memberships.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, _flush_context) -> None:
+    # New memberships need no invalidation because denials are never cached.
+    pending: set[tuple[str, str]] = session.info.setdefault(
+        _PENDING_INVALIDATIONS_KEY, set()
+    )
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            pending.add(PrincipalCache.user_invalidation(obj.id))
+        elif isinstance(obj, TenantUser) and obj.user_id and obj.tenant_id:
+            pending.add(
+                PrincipalCache.membership_invalidation(obj.user_id, obj.tenant_id)
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    for message, key in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        principal_cache.schedule_invalidation(message, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
@@ -0,0 +1,163 @@
+import logging
+import os
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.metrics import registry
+from app.core.redis import LuaScript
+
+logger = logging.getLogger(__name__)
+
+REMINDER_QUEUE_VISIBILITY_TIMEOUT_SECONDS = float(
+    os.getenv("REMINDER_QUEUE_VISIBILITY_TIMEOUT_SECONDS", "300")
+)
+
+PENDING_KEY = "reminders:pending"
+IN_FLIGHT_KEY = "reminders:in-flight"
+
+REMINDER_QUEUE_DEPTH = registry.gauge(
+    "reminder_queue_depth",
+    "Reminder ids waiting in the queue or reserved by a worker",
+    labelnames=("state",),
+)
+REMINDER_QUEUE_LAG_SECONDS = registry.gauge(
+    "reminder_queue_lag_seconds",
+    "How long the oldest due reminder has been waiting in the queue",
+)
+REMINDER_QUEUE_REDELIVERIES = registry.counter(
+    "reminder_queue_redeliveries_total",
+    "Reserved reminder ids returned to the queue after their visibility timeout",
+)
+
+# KEYS: pending zset, in-flight zset. ARGV: score, id, score, id, ...
+# Ids already queued or reserved are left alone, so repeated enqueues of the
+# same reminder are no-ops.
+ENQUEUE_SCRIPT = LuaScript(
+    """
+local added = 0
+for i = 1, #ARGV, 2 do
+  local member = ARGV[i + 1]
+  if not redis.call('ZSCORE', KEYS[2], member) then
+    added = added + redis.call('ZADD', KEYS[1], 'NX', ARGV[i], member)
+  end
+end
+return added
+"""
+)
+
+# KEYS: pending zset, in-flight zset. ARGV: now ms, visibility deadline ms, limit.
+# Reservations past their deadline go back to pending first, scored by the time
+# they became visible again; then up to `limit` due ids move to in-flight.
+RESERVE_SCRIPT = LuaScript(
+    """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'WITHSCORES')
+for i = 1, #expired, 2 do
+  redis.call('ZREM', KEYS[2], expired[i])
+  redis.call('ZADD', KEYS[1], expired[i + 1], expired[i])
+end
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[3])
+for _, member in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], member)
+  redis.call('ZADD', KEYS[2], ARGV[2], member)
+end
+return {#expired / 2, ids}
+"""
+)
+
+# KEYS: pending zset, in-flight zset. Returns pending size, in-flight size and
+# the oldest pending score (false when empty).
+QUEUE_STATS_SCRIPT = LuaScript(
+    """
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {
+  redis.call('ZCARD', KEYS[1]),
+  redis.call('ZCARD', KEYS[2]),
+  oldest[2] or false,
+}
+"""
+)
+
+
+def _epoch_ms(moment: datetime | float) -> int:
+    if isinstance(moment, datetime):
+        return int(moment.timestamp() * 1000)
+    return int(moment * 1000)
+
+
+class ReminderQueue:
+    """Deduplicated reminder work queue with visibility timeouts.
+
+    Pending ids live in a sorted set scored by ``remind_at``; reserving one
+    moves it to an in-flight set scored by its visibility deadline. A worker
+    acknowledges ids once it has handled them. Ids a crashed worker never
+    acknowledged become visible again after the timeout and are redelivered.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        visibility_timeout_seconds: float = REMINDER_QUEUE_VISIBILITY_TIMEOUT_SECONDS,
+    ):
+        self.redis_client = redis_client
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+
+    async def enqueue(self, reminders: Iterable[tuple[UUID, datetime]]) -> int:
+        """Queue ``(id, remind_at)`` pairs; returns how many were new."""
+        args: list[str | int] = []
+        for reminder_id, remind_at in reminders:
+            args.extend((_epoch_ms(remind_at), str(reminder_id)))
+        if not args:
+            return 0
+        return int(
+            await ENQUEUE_SCRIPT(self.redis_client, [PENDING_KEY, IN_FLIGHT_KEY], args)
+        )
+
+    async def reserve(self, limit: int, now: float | None = None) -> list[UUID]:
+        """Reserve up to ``limit`` due ids until the visibility timeout."""
+        current = time.time() if now is None else now
+        redelivered, members = await RESERVE_SCRIPT(
+            self.redis_client,
+            [PENDING_KEY, IN_FLIGHT_KEY],
+            [
+                _epoch_ms(current),
+                _epoch_ms(current + self.visibility_timeout_seconds),
+                limit,
+            ],
+        )
+        if redelivered:
+            REMINDER_QUEUE_REDELIVERIES.inc(redelivered)
+
+        reminder_ids = []
+        invalid = []
+        for member in members:
+            try:
+                reminder_ids.append(UUID(member))
+            except ValueError:
+                invalid.append(member)
+        if invalid:
+            logger.warning("Dropping invalid reminder ids from queue: %s", invalid)
+            await self.redis_client.zrem(IN_FLIGHT_KEY, *invalid)
+        return reminder_ids
+
+    async def ack(self, reminder_ids: Iterable[UUID]) -> int:
+        members = [str(reminder_id) for reminder_id in reminder_ids]
+        if not members:
+            return 0
+        return int(await self.redis_client.zrem(IN_FLIGHT_KEY, *members))
+
+    async def refresh_metrics(self, now: float | None = None) -> None:
+        current = time.time() if now is None else now
+        pending, in_flight, oldest = await QUEUE_STATS_SCRIPT(
+            self.redis_client, [PENDING_KEY, IN_FLIGHT_KEY]
+        )
+
+        REMINDER_QUEUE_DEPTH.set(pending, state="pending")
+        REMINDER_QUEUE_DEPTH.set(in_flight, state="in_flight")
+        lag = 0.0
+        if oldest:
+            lag = max(0.0, current - float(oldest) / 1000)
+        REMINDER_QUEUE_LAG_SECONDS.set(lag)
@@ -1,24 +1,52 @@
+import asyncio
 import logging
-from collections.abc import Awaitable, Callable
+import os
+from collections.abc import Awaitable, Callable, Collection
+from datetime import datetime, timedelta, timezone
+from itertools import chain
 from uuid import UUID
 
 import redis.asyncio as redis
 
 from app.models.reminder import Reminder
 from app.repositories.reminder_repository import ReminderRepository
+from app.services.notifiers import CallableNotifier, Notifier, get_notifier
+from app.services.reminder_queue import ReminderQueue
 
 logger = logging.getLogger(__name__)
-REMINDER_QUEUE_KEY = "reminders:queue"
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "100"))
+REMINDER_SEND_CONCURRENCY = int(os.getenv("REMINDER_SEND_CONCURRENCY", "10"))
+REMINDER_CLAIM_LEASE_SECONDS = float(os.getenv("REMINDER_CLAIM_LEASE_SECONDS", "300"))
+REMINDER_RETRY_BASE_SECONDS = float(os.getenv("REMINDER_RETRY_BASE_SECONDS", "30"))
+REMINDER_RETRY_MAX_SECONDS = float(os.getenv("REMINDER_RETRY_MAX_SECONDS", "3600"))
+REMINDER_RETENTION_DAYS = float(os.getenv("REMINDER_RETENTION_DAYS", "30"))
+REMINDER_ARCHIVE_BATCH_SIZE = int(os.getenv("REMINDER_ARCHIVE_BATCH_SIZE", "1000"))
+REMINDER_ARCHIVE_INTERVAL_SECONDS = int(
+    os.getenv("REMINDER_ARCHIVE_INTERVAL_SECONDS", "3600")
+)
 
 
 class ReminderService:
     def __init__(
         self,
         repository: ReminderRepository,
-        notifier: Callable[[Reminder], Awaitable[None]] | None = None,
+        notifier: Notifier | Callable[[Reminder], Awaitable[None]] | None = None,
+        send_concurrency: int = REMINDER_SEND_CONCURRENCY,
+        claim_lease_seconds: float = REMINDER_CLAIM_LEASE_SECONDS,
+        retry_base_seconds: float = REMINDER_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = REMINDER_RETRY_MAX_SECONDS,
     ):
         self.repository = repository
-        self.notifier = notifier
+        # A bare coroutine function sends one reminder at a time, at most
+        # ``send_concurrency`` at once.
+        if notifier is None:
+            notifier = get_notifier()
+        elif not isinstance(notifier, Notifier):
+            notifier = CallableNotifier(notifier, concurrency=send_concurrency)
+        self.notifier: Notifier = notifier
+        self.claim_lease_seconds = claim_lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
 
     async def create_reminder(self, data: dict) -> Reminder:
         return await self.repository.create_reminder(data)
@@ -26,39 +54,81 @@ class ReminderService:
     async def fetch_due_reminders(self, tenant_id: UUID) -> list[Reminder]:
         return await self.repository.fetch_pending_reminders(tenant_id)
 
-    async def send_notification(self, reminder: Reminder) -> None:
-        if self.notifier is not None:
-            await self.notifier(reminder)
-            return
-
-        logger.info(
-            "Sending reminder : reminder_id=%s tenant_id=%s application_id=%s",
-            reminder.id,
-            reminder.tenant_id,
-            reminder.application_id,
-        )
+    async def send_notification(self, reminder: Reminder) -> bool:
+        [sent] = await self.notifier.deliver([reminder])
+        if not sent:
+            logger.warning("Failed to send reminder_id=%s", reminder.id)
+        return sent
 
     async def mark_reminder_sent(self, reminder_id: UUID) -> Reminder | None:
         return await self.repository.mark_sent(reminder_id)
 
-    async def process_due_reminders(self, tenant_id: UUID) -> int:
-        pending_reminders = await self.fetch_due_reminders(tenant_id)
-        processed_count = 0
+    async def _send_claimed(self, reminders: list[Reminder]) -> int:
+        """Send claimed reminders in notifier batches, then complete them.
+
+        Batches go out concurrently up to the notifier's own limit. Failed
+        reminders are released with a backoff delay before their next attempt.
+        """
+        batch_size = self.notifier.batch_size
+        batches = [
+            reminders[start : start + batch_size]
+            for start in range(0, len(reminders), batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self.notifier.deliver(batch) for batch in batches)
+        )
+        outcomes = list(zip(reminders, chain.from_iterable(results)))
+        sent_ids = [reminder.id for reminder, ok in outcomes if ok]
+        failed_ids = [reminder.id for reminder, ok in outcomes if not ok]
+        if failed_ids:
+            logger.warning(
+                "Failed to send %s reminders; retrying with backoff", len(failed_ids)
+            )
+        return await self.repository.complete_claimed_reminders(
+            sent_ids,
+            failed_ids,
+            retry_base_seconds=self.retry_base_seconds,
+            retry_max_seconds=self.retry_max_seconds,
+        )
 
-        for reminder in pending_reminders:
-            try:
-                await self.send_notification(reminder)
-            except Exception:
-                logger.exception(
-                    "Failed to send due reminder reminder_id=%s tenant_id=%s",
-                    reminder.id,
-                    reminder.tenant_id,
-                )
-                continue
-
-            marked = await self.mark_reminder_sent(reminder.id)
-            if marked is not None:
-                processed_count += 1
+    async def dispatch_due_reminders(
+        self,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        tenant_id: UUID | None = None,
+        reminder_ids: Collection[UUID] | None = None,
+    ) -> int:
+        """Claim one batch of due reminders, send them and mark them sent.
+
+        Returns how many were sent. Reminders whose notification fails are
+        released and become due again after their backoff delay.
+        """
+        claimed = await self.repository.claim_due_reminders(
+            limit=batch_size,
+            lease_seconds=self.claim_lease_seconds,
+            tenant_id=tenant_id,
+            reminder_ids=reminder_ids,
+        )
+        if not claimed:
+            return 0
+        return await self._send_claimed(claimed)
+
+    async def process_due_reminders(
+        self, tenant_id: UUID, batch_size: int = REMINDER_BATCH_SIZE
+    ) -> int:
+        processed_count = 0
+        while True:
+            claimed = await self.repository.claim_due_reminders(
+                limit=batch_size,
+                lease_seconds=self.claim_lease_seconds,
+                tenant_id=tenant_id,
+            )
+            if not claimed:
+                break
+            sent_count = await self._send_claimed(claimed)
+            processed_count += sent_count
+            # Stop rather than spin on a batch that made no progress.
+            if len(claimed) < batch_size or not sent_count:
+                break
 
         return processed_count
 
@@ -70,56 +140,66 @@ class ReminderService:
         redis_client: redis.Redis,
         batch_size: int = 100,
     ) -> int:
+        """Queue due reminders; ids already queued or reserved are skipped."""
         due_reminders = await self.repository.fetch_pending_reminders_global(
             limit=batch_size
         )
-        if not due_reminders:
-            return 0
-
-        reminder_ids = [str(reminder.id) for reminder in due_reminders]
-        await redis_client.rpush(REMINDER_QUEUE_KEY, *reminder_ids)
-        logger.info("Queued %s reminders", len(reminder_ids))
-        return len(reminder_ids)
+        queue = ReminderQueue(redis_client)
+        enqueued = await queue.enqueue(
+            (reminder.id, reminder.remind_at) for reminder in due_reminders
+        )
+        await queue.refresh_metrics()
+        if enqueued:
+            logger.info("Queued %s reminders", enqueued)
+        return enqueued
 
     async def process_queued_reminders(
         self,
         redis_client: redis.Redis,
         max_items: int = 100,
     ) -> int:
+        """Dispatch reserved reminders and acknowledge them once handled.
+
+        Failed sends are acknowledged too: Postgres still has them unsent, so
+        they are queued again once their retry delay has passed. Ids are only
+        left unacknowledged when dispatch itself fails, and then reappear after
+        the visibility timeout.
+        """
+        queue = ReminderQueue(redis_client)
+        reminder_ids = await queue.reserve(max_items)
         processed_count = 0
-
-        for _ in range(max_items):
-            reminder_id = await redis_client.lpop(REMINDER_QUEUE_KEY)
-            if reminder_id is None:
-                break
-
-            try:
-                reminder_uuid = UUID(reminder_id)
-            except ValueError:
-                logger.warning(
-                    "Skipping invalid reminder id from queue: %s", reminder_id
-                )
-                continue
-
-            reminder = await self.repository.get_by_id(reminder_uuid)
-            if reminder is None or reminder.sent:
-                continue
-
-            try:
-                await self.send_notification(reminder)
-            except Exception:
-                logger.exception(
-                    "Failed to process queued reminder reminder_id=%s tenant_id=%s",
-                    reminder.id,
-                    reminder.tenant_id,
-                )
-                continue
-
-            marked = await self.mark_reminder_sent(reminder.id)
-            if marked is not None:
-                processed_count += 1
+        if reminder_ids:
+            processed_count = await self.dispatch_due_reminders(
+                batch_size=len(reminder_ids), reminder_ids=reminder_ids
+            )
+            await queue.ack(reminder_ids)
+        await queue.refresh_metrics()
 
         if processed_count:
             logger.info("Processed %s queued reminders in worker", processed_count)
 
         return processed_count
+
+    async def archive_sent_reminders(
+        self,
+        retention_days: float = REMINDER_RETENTION_DAYS,
+        batch_size: int = REMINDER_ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Move sent reminders older than the retention period to the archive.
+
+        Works in batches so each transaction stays short; returns how many
+        reminders were archived.
+        """
+        before = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        archived_count = 0
+        while True:
+            archived = await self.repository.archive_sent_reminders(
+                before=before, limit=batch_size
+            )
+            archived_count += archived
+            if archived < batch_size:
+                break
+
+        if archived_count:
+            logger.info("Archived %s sent reminders", archived_count)
+        return archived_count
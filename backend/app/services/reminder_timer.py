@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import heapq
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+
+from app.core.metrics import registry
+from app.models.reminder import REMINDER_CHANGES_CHANNEL
+from app.repositories.reminder_repository import ReminderRepository
+from app.services.reminder_queue import ReminderQueue
+
+logger = logging.getLogger(__name__)
+
+REMINDER_LOOKAHEAD_SECONDS = float(os.getenv("REMINDER_LOOKAHEAD_SECONDS", "300"))
+REMINDER_TIMER_MAX_ENTRIES = int(os.getenv("REMINDER_TIMER_MAX_ENTRIES", "10000"))
+
+REMINDER_TIMER_ENTRIES = registry.gauge(
+    "reminder_timer_entries",
+    "Reminders waiting in the in-memory timer until they are due",
+)
+REMINDER_FIRE_DELAY_SECONDS = registry.histogram(
+    "reminder_fire_delay_seconds",
+    "Time between a reminder becoming due and the timer queueing it",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 15.0, 60.0, 300.0),
+)
+
+
+class TimerHeap:
+    """Min-heap of reminder deadlines that supports rescheduling and removal.
+
+    Superseded heap entries are skipped lazily, so updates stay O(log n).
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, UUID]] = []
+        self._deadlines: dict[UUID, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, reminder_id: object) -> bool:
+        return reminder_id in self._deadlines
+
+    def push(self, reminder_id: UUID, deadline: float) -> None:
+        if self._deadlines.get(reminder_id) == deadline:
+            return
+        self._deadlines[reminder_id] = deadline
+        heapq.heappush(self._heap, (deadline, reminder_id))
+
+    def discard(self, reminder_id: UUID) -> None:
+        self._deadlines.pop(reminder_id, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _drop_superseded(self) -> None:
+        while self._heap:
+            deadline, reminder_id = self._heap[0]
+            if self._deadlines.get(reminder_id) == deadline:
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> float | None:
+        self._drop_superseded()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[tuple[UUID, float]]:
+        due = []
+        self._drop_superseded()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, reminder_id = heapq.heappop(self._heap)
+            del self._deadlines[reminder_id]
+            due.append((reminder_id, deadline))
+            self._drop_superseded()
+        return due
+
+
+class ReminderTimer:
+    """Queues reminders when they fall due instead of on a polling interval.
+
+    A reminder falls due at its ``remind_at``, or at its ``next_attempt_at``
+    after a failed delivery.
+
+    Unsent reminders due within ``lookahead_seconds`` are loaded into a
+    :class:`TimerHeap`, and the caller sleeps until :meth:`step` says the next
+    one is due. Inserts and reschedules arrive over Postgres LISTEN/NOTIFY and
+    adjust the heap in place; the window is reloaded every half look-ahead,
+    which also picks up anything a dropped notification missed and reminders
+    whose send failed.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        session_factory: async_sessionmaker[AsyncSession],
+        lookahead_seconds: float = REMINDER_LOOKAHEAD_SECONDS,
+        max_entries: int = REMINDER_TIMER_MAX_ENTRIES,
+        on_fire: Callable[[], None] | None = None,
+    ):
+        self.queue = ReminderQueue(redis_client)
+        self.session_factory = session_factory
+        self.lookahead_seconds = lookahead_seconds
+        self.max_entries = max_entries
+        self.on_fire = on_fire
+        self.heap = TimerHeap()
+        self.window_end: float | None = None
+        self.reload_at = 0.0
+        self.wake = asyncio.Event()
+        self._connection: AsyncConnection | None = None
+        self._listener: Any = None
+        self._listen_failed = False
+
+    def reset(self) -> None:
+        """Forget the loaded window, e.g. after losing leadership."""
+        self.heap.clear()
+        self.window_end = None
+        REMINDER_TIMER_ENTRIES.set(0)
+
+    async def reload(self, now: float | None = None) -> None:
+        current = time.time() if now is None else now
+        until = current + self.lookahead_seconds
+        async with self.session_factory() as session:
+            upcoming = await ReminderRepository(session).fetch_upcoming_reminders(
+                datetime.fromtimestamp(until, timezone.utc), limit=self.max_entries
+            )
+
+        self.heap.clear()
+        for reminder_id, due_at in upcoming:
+            self.heap.push(reminder_id, due_at.timestamp())
+        # A full page may have cut the window short; only claim what was loaded.
+        if len(upcoming) >= self.max_entries:
+            self.window_end = upcoming[-1][1].timestamp()
+        else:
+            self.window_end = until
+        self.reload_at = current + self.lookahead_seconds / 2
+        REMINDER_TIMER_ENTRIES.set(len(self.heap))
+
+    def handle_notification(self, payload: str) -> None:
+        try:
+            change = json.loads(payload)
+            reminder_id = UUID(change["id"])
+            deadline = float(change["due_at"])
+            sent = bool(change["sent"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed reminder notification: %s", payload)
+            return
+
+        if self.window_end is None:
+            return
+        if sent or deadline > self.window_end:
+            self.heap.discard(reminder_id)
+        else:
+            self.heap.push(reminder_id, deadline)
+        REMINDER_TIMER_ENTRIES.set(len(self.heap))
+        self.wake.set()
+
+    async def fire_due(self, now: float | None = None) -> int:
+        current = time.time() if now is None else now
+        due = self.heap.pop_due(current)
+        if not due:
+            return 0
+
+        for _, deadline in due:
+            REMINDER_FIRE_DELAY_SECONDS.observe(max(0.0, current - deadline))
+        await self.queue.enqueue(
+            (reminder_id, datetime.fromtimestamp(deadline, timezone.utc))
+            for reminder_id, deadline in due
+        )
+        REMINDER_TIMER_ENTRIES.set(len(self.heap))
+        if self.on_fire is not None:
+            self.on_fire()
+        return len(due)
+
+    async def step(self, now: float | None = None) -> float:
+        """Reload if due, queue what is due, and return seconds until next work."""
+        current = time.time() if now is None else now
+        if self.window_end is None or current >= self.reload_at:
+            await self.reload(current)
+        await self.fire_due(current)
+
+        next_wake = self.reload_at
+        next_deadline = self.heap.next_deadline()
+        if next_deadline is not None:
+            next_wake = min(next_wake, next_deadline)
+        return max(0.0, next_wake - current)
+
+    def _on_notify(self, _connection: Any, _pid: int, _channel: str, payload: str):
+        self.handle_notification(payload)
+
+    def _on_listener_lost(self, _connection: Any) -> None:
+        logger.warning(
+            "LISTEN %s connection lost; reconnecting", REMINDER_CHANGES_CHANNEL
+        )
+        self._listener = None
+        self.wake.set()
+
+    async def listen(self, engine: AsyncEngine) -> bool:
+        """LISTEN for reminder changes on a dedicated connection.
+
+        Call it before every leader step: it reconnects after the connection
+        is lost and forces a reload to catch changes missed in between.
+        Returns whether listening; without it the timer still works from its
+        periodic reloads.
+        """
+        if self._listener is not None:
+            return True
+        await self.unlisten()
+
+        connection = None
+        try:
+            connection = await engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            listener = raw_connection.driver_connection
+            assert listener is not None
+            await listener.add_listener(REMINDER_CHANGES_CHANNEL, self._on_notify)
+            listener.add_termination_listener(self._on_listener_lost)
+        except Exception:
+            if connection is not None:
+                with contextlib.suppress(Exception):
+                    await connection.invalidate()
+            if not self._listen_failed:
+                logger.warning(
+                    "LISTEN %s failed; relying on periodic reloads",
+                    REMINDER_CHANGES_CHANNEL,
+                    exc_info=True,
+                )
+            self._listen_failed = True
+            return False
+
+        self._connection, self._listener = connection, listener
+        self._listen_failed = False
+        self.window_end = None
+        return True
+
+    async def unlisten(self) -> None:
+        connection, listener = self._connection, self._listener
+        self._connection = self._listener = None
+        if listener is not None:
+            listener.remove_termination_listener(self._on_listener_lost)
+            with contextlib.suppress(Exception):
+                await listener.remove_listener(
+                    REMINDER_CHANGES_CHANNEL, self._on_notify
+                )
+        if connection is None:
+            return
+        with contextlib.suppress(Exception):
+            if listener is None:
+                # The server side is gone; keep it out of the pool.
+                await connection.invalidate()
+            else:
+                await connection.close()
@@ -0,0 +1,240 @@
+"""Standalone reminder worker.
+
+Runs the reminder queue outside the API so it can be scaled on its own:
+
+    python -m app.workers.reminders --concurrency 4
+
+Every process consumes the queue with ``--concurrency`` loops. One process at
+a time, elected through a Redis lease, also runs the reminder timer: it keeps
+the next ``REMINDER_LOOKAHEAD_SECONDS`` of reminders in memory, follows
+changes over Postgres LISTEN/NOTIFY, and queues each reminder at its
+``remind_at``. The same process archives sent reminders past their retention
+every ``REMINDER_ARCHIVE_INTERVAL_SECONDS`` and reconciles dashboard counters
+every ``DASHBOARD_RECONCILE_INTERVAL_SECONDS``. Run the API with
+``REMINDER_SCHEDULER_ENABLED=false`` so its embedded scheduler stays out of
+the way.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from collections.abc import Awaitable, Callable, Iterable
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.leader import LeaderLease
+from app.core.logging import setup_logging
+from app.core.metrics_multiprocess import metrics_collector
+from app.core.redis import create_redis_client, create_redis_pool
+from app.core.scheduler_metrics import record_job
+from app.db.session import AsyncSessionLocal, engine
+from app.repositories.application_repository import ApplicationRepository
+from app.repositories.reminder_repository import ReminderRepository
+from app.services.application_service import ApplicationService
+from app.services.dashboard_counters import DASHBOARD_RECONCILE_INTERVAL_SECONDS
+from app.services.notifiers import close_notifier
+from app.services.reminder_service import (
+    REMINDER_ARCHIVE_INTERVAL_SECONDS,
+    REMINDER_BATCH_SIZE,
+    ReminderService,
+)
+from app.services.reminder_timer import REMINDER_LOOKAHEAD_SECONDS, ReminderTimer
+
+logger = logging.getLogger(__name__)
+
+REMINDER_WORKER_CONCURRENCY = int(os.getenv("REMINDER_WORKER_CONCURRENCY", "1"))
+REMINDER_WORKER_POLL_SECONDS = float(os.getenv("REMINDER_WORKER_POLL_SECONDS", "1"))
+REMINDER_LEADER_LEASE_SECONDS = float(os.getenv("REMINDER_LEADER_LEASE_SECONDS", "30"))
+
+ENQUEUE_LEADER_NAME = "reminders-enqueue"
+
+
+class ReminderWorker:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = REMINDER_WORKER_CONCURRENCY,
+        batch_size: int = REMINDER_BATCH_SIZE,
+        poll_seconds: float = REMINDER_WORKER_POLL_SECONDS,
+        lease_seconds: float = REMINDER_LEADER_LEASE_SECONDS,
+        lookahead_seconds: float = REMINDER_LOOKAHEAD_SECONDS,
+        engine: AsyncEngine | None = None,
+        archive_interval_seconds: float = REMINDER_ARCHIVE_INTERVAL_SECONDS,
+        reconcile_interval_seconds: float = DASHBOARD_RECONCILE_INTERVAL_SECONDS,
+    ):
+        self.redis_client = redis_client
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.engine = engine
+        self.archive_interval_seconds = archive_interval_seconds
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self.lease = LeaderLease(redis_client, ENQUEUE_LEADER_NAME, lease_seconds)
+        self._work_available = asyncio.Event()
+        self.timer = ReminderTimer(
+            redis_client,
+            session_factory,
+            lookahead_seconds=lookahead_seconds,
+            on_fire=self._work_available.set,
+        )
+
+    async def _wait(
+        self, stop: asyncio.Event, seconds: float, wake: Iterable[asyncio.Event] = ()
+    ) -> None:
+        """Sleep up to ``seconds``, returning early once any event is set."""
+        waiters = [asyncio.ensure_future(event.wait()) for event in (stop, *wake)]
+        try:
+            await asyncio.wait(
+                waiters, timeout=seconds, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def process_once(self) -> int:
+        async with self.session_factory() as session:
+            service = ReminderService(repository=ReminderRepository(session=session))
+            return await service.process_queued_reminders(
+                self.redis_client, max_items=self.batch_size
+            )
+
+    async def archive_once(self) -> int:
+        async with self.session_factory() as session:
+            service = ReminderService(repository=ReminderRepository(session=session))
+            return await service.archive_sent_reminders()
+
+    async def reconcile_once(self) -> int:
+        async with self.session_factory() as session:
+            service = ApplicationService(
+                repository=ApplicationRepository(session=session),
+                redis_client=self.redis_client,
+            )
+            return await service.reconcile_dashboard_counters()
+
+    async def _lead(self, stop: asyncio.Event) -> None:
+        """Run the reminder timer while holding the leader lease.
+
+        The leader sleeps until the next reminder is due, a change notification
+        arrives, or the lease needs renewing. Renewing at least three times per
+        TTL keeps the lease with a live leader, and a dead one is replaced
+        within one TTL. Only the leader holds a LISTEN connection.
+        """
+        try:
+            while not stop.is_set():
+                self.timer.wake.clear()
+                delay = self.lease.ttl_seconds / 3
+                if await self.lease.acquire():
+                    try:
+                        if self.engine is not None:
+                            await self.timer.listen(self.engine)
+                        with record_job("reminder_timer"):
+                            delay = min(delay, await self.timer.step())
+                    except Exception:
+                        logger.exception("Reminder timer step failed")
+                else:
+                    await self.timer.unlisten()
+                    self.timer.reset()
+                await self._wait(stop, delay, (self.timer.wake,))
+        finally:
+            await self.timer.unlisten()
+            await self.lease.release()
+
+    async def _run_while_leading(
+        self,
+        stop: asyncio.Event,
+        job: str,
+        run_once: Callable[[], Awaitable[int]],
+        interval_seconds: float,
+    ) -> None:
+        """Run ``run_once`` every ``interval_seconds`` while this process leads."""
+        while not stop.is_set():
+            delay = self.lease.ttl_seconds
+            if self.lease.is_leader:
+                try:
+                    with record_job(job):
+                        await run_once()
+                except Exception:
+                    logger.exception("Scheduled job %s failed", job)
+                delay = interval_seconds
+            await self._wait(stop, delay)
+
+    async def _consume(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            self._work_available.clear()
+            try:
+                with record_job("process_queued_reminders"):
+                    processed = await self.process_once()
+            except Exception:
+                logger.exception("Processing queued reminders failed")
+                processed = 0
+            if not processed:
+                await self._wait(stop, self.poll_seconds, (self._work_available,))
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info(
+            "Reminder worker started with concurrency=%s batch_size=%s",
+            self.concurrency,
+            self.batch_size,
+        )
+        await asyncio.gather(
+            self._lead(stop),
+            self._run_while_leading(
+                stop,
+                "archive_sent_reminders",
+                self.archive_once,
+                self.archive_interval_seconds,
+            ),
+            self._run_while_leading(
+                stop,
+                "reconcile_dashboard_counters",
+                self.reconcile_once,
+                self.reconcile_interval_seconds,
+            ),
+            *(self._consume(stop) for _ in range(self.concurrency)),
+        )
+        logger.info("Reminder worker stopped")
+
+
+async def _main(concurrency: int, batch_size: int) -> None:
+    redis_pool = create_redis_pool()
+    redis_client = create_redis_client(redis_pool)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    worker = ReminderWorker(
+        redis_client,
+        AsyncSessionLocal,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        engine=engine,
+    )
+    metrics_collector.start()
+    try:
+        await worker.run(stop)
+    finally:
+        metrics_collector.stop()
+        await close_notifier()
+        await redis_client.aclose()
+        await redis_pool.disconnect()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=REMINDER_WORKER_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=REMINDER_BATCH_SIZE)
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(_main(args.concurrency, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark application search with and without its indexes.
+
+Seeds one tenant with synthetic applications (1M by default) in the database
+from ``BENCHMARK_DATABASE_URL``, then times ``ApplicationRepository`` search
+queries twice: once with index scans disabled, which is what the
+``ilike('%...%')`` filter cost before the trigram and full-text indexes, and
+once with the planner free to use them. The schema must be migrated first
+(``alembic upgrade head``); the seeded tenant is deleted afterwards.
+
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... \\
+        python -m benchmarks.application_search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.repositories.application_repository import ApplicationRepository
+
+SEED_SQL = """
+INSERT INTO applications (
+    id, tenant_id, title, company, status, location, notes, description,
+    applied_date
+)
+SELECT
+    gen_random_uuid(),
+    :tenant_id,
+    (ARRAY['Backend Engineer', 'Frontend Developer', 'Data Scientist',
+           'Product Manager', 'Site Reliability Engineer'])[1 + g % 5],
+    'Company ' || substr(md5((g % 20000)::text), 1, 10),
+    (ARRAY['applied', 'screening', 'interview', 'offer',
+           'rejected'])[1 + g % 5]::application_status,
+    'Remote',
+    'Referred by ' || substr(md5(g::text), 1, 12),
+    CASE WHEN g % 3 = 0 THEN 'Team uses ' || substr(md5((g * 7)::text), 1, 8) END,
+    current_date - (g % 365)
+FROM generate_series(1, :rows) AS g
+"""
+
+DISABLE_INDEXES = (
+    "SET enable_indexscan = off",
+    "SET enable_bitmapscan = off",
+    "SET enable_indexonlyscan = off",
+)
+ENABLE_INDEXES = (
+    "RESET enable_indexscan",
+    "RESET enable_bitmapscan",
+    "RESET enable_indexonlyscan",
+)
+
+
+async def _seed(connection: AsyncConnection, tenant_id: uuid.UUID, rows: int) -> None:
+    await connection.execute(
+        text("INSERT INTO tenants (id, name) VALUES (:id, :name)"),
+        {"id": tenant_id, "name": f"search-benchmark-{tenant_id}"},
+    )
+    await connection.execute(text(SEED_SQL), {"tenant_id": tenant_id, "rows": rows})
+    await connection.commit()
+    await connection.execute(text("ANALYZE applications"))
+    await connection.commit()
+
+
+async def _median_ms(
+    call: Callable[[], Awaitable[list[Any]]], repeats: int
+) -> tuple[float, int]:
+    timings = []
+    found = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        found = len(await call())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), found
+
+
+async def run(database_url: str, rows: int, repeats: int) -> None:
+    engine = create_async_engine(database_url)
+    tenant_id = uuid.uuid4()
+    try:
+        async with engine.connect() as connection:
+            print(f"Seeding {rows} applications for tenant {tenant_id} ...")
+            await _seed(connection, tenant_id, rows)
+
+            needle = await connection.scalar(text("SELECT substr(md5('4242'), 3, 6)"))
+            note_word = await connection.scalar(
+                text("SELECT substr(md5('4242'), 1, 12)")
+            )
+            scenarios: dict[str, dict[str, Any]] = {
+                "company contains": {"company": needle},
+                "prefix search": {"search": note_word[:6], "search_mode": "prefix"},
+                "full-text search": {"search": note_word, "search_mode": "fulltext"},
+            }
+
+            session = AsyncSession(bind=connection)
+            repository = ApplicationRepository(session)
+            print(f"{'scenario':<18} {'no index (ms)':>14} {'indexed (ms)':>13} rows")
+            for label, filters in scenarios.items():
+
+                def _search(filters: dict[str, Any] = filters) -> Awaitable[list[Any]]:
+                    return repository.list_applications(
+                        tenant_id=tenant_id, limit=20, offset=0, **filters
+                    )
+
+                for statement in DISABLE_INDEXES:
+                    await connection.execute(text(statement))
+                scan_ms, found = await _median_ms(_search, repeats)
+                for statement in ENABLE_INDEXES:
+                    await connection.execute(text(statement))
+                indexed_ms, _ = await _median_ms(_search, repeats)
+                print(f"{label:<18} {scan_ms:>14.1f} {indexed_ms:>13.1f} {found}")
+            await session.close()
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("DELETE FROM tenants WHERE id = :id"), {"id": tenant_id}
+            )
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = os.getenv("BENCHMARK_DATABASE_URL")
+    if not database_url:
+        raise SystemExit("BENCHMARK_DATABASE_URL must be set")
+    asyncio.run(run(database_url, args.rows, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark request throughput through the request-id and error middleware.
+
+Serves a trivial JSON route through three stacks, calling the ASGI app
+in-process so no server or network time is included:
+
+- ``none``: the bare FastAPI app
+- ``base-http``: the previous ``BaseHTTPMiddleware`` implementations
+- ``asgi``: the pure ASGI middleware in ``app.middleware``
+- ``asgi-metrics``: the same, plus ``MetricsMiddleware`` as in ``app.main``
+
+Logging is silenced so that only middleware overhead is measured.
+
+    python -m benchmarks.middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message
+
+from app.core.logging import _request_id_var
+from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.request_id import RequestIDMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+class BaseHTTPRequestIDMiddleware(BaseHTTPMiddleware):
+    """The request-id middleware as it was before the ASGI rewrite."""
+
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        token = _request_id_var.set(request_id)
+        start = time.perf_counter()
+        try:
+            logger.info("Request started", extra={"path": request.url.path})
+            response = await call_next(request)
+            logger.info(
+                "Request completed",
+                extra={"duration_ms": (time.perf_counter() - start) * 1000},
+            )
+        finally:
+            _request_id_var.reset(token)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class BaseHTTPErrorHandlerMiddleware(BaseHTTPMiddleware):
+    """The error handler as it was before the ASGI rewrite."""
+
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "detail": "Internal Server Error",
+                    "request_id": getattr(request.state, "request_id", None),
+                },
+            )
+
+
+def _build_app(*middleware: Any) -> FastAPI:
+    app = FastAPI()
+    for middleware_class in middleware:
+        app.add_middleware(middleware_class)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+STACKS: dict[str, Callable[[], FastAPI]] = {
+    "none": lambda: _build_app(),
+    "base-http": lambda: _build_app(
+        BaseHTTPErrorHandlerMiddleware, BaseHTTPRequestIDMiddleware
+    ),
+    "asgi": lambda: _build_app(ErrorHandlerMiddleware, RequestIDMiddleware),
+    "asgi-metrics": lambda: _build_app(
+        MetricsMiddleware, ErrorHandlerMiddleware, RequestIDMiddleware
+    ),
+}
+
+
+async def _request(app: ASGIApp) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    await app(scope, receive, send)
+
+
+async def _requests_per_second(app: ASGIApp, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await _request(app)
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, rounds: int) -> None:
+    logging.disable(logging.CRITICAL)
+    apps = {name: build() for name, build in STACKS.items()}
+    for app in apps.values():
+        await _requests_per_second(app, min(requests, 500))
+
+    results: dict[str, list[float]] = {name: [] for name in apps}
+    # Interleave stacks so drift in machine load affects each one equally.
+    for _ in range(rounds):
+        for name, app in apps.items():
+            results[name].append(await _requests_per_second(app, requests))
+
+    baseline = statistics.median(results["base-http"])
+    print(f"{'stack':<12} {'req/s':>10} {'vs base-http':>13}")
+    for name, samples in results.items():
+        rate = statistics.median(samples)
+        print(f"{name:<12} {rate:>10.0f} {rate / baseline:>12.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import os
 from collections.abc import AsyncGenerator
 
+import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 import app.models  # noqa: F401
+from app.core.rate_limit import rate_limiter
 from app.db.base import Base
 
 
@@ -26,6 +28,14 @@ def _test_database_url() -> str:
     return test_database_url
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # Route tests share the process-wide limiter; start each with clean counts.
+    rate_limiter.reset()
+    yield
+    rate_limiter.reset()
+
+
 @pytest_asyncio.fixture
 async def test_engine() -> AsyncGenerator:
     engine = create_async_engine(_test_database_url(), echo=False, pool_pre_ping=True)
@@ -1,12 +1,17 @@
 import importlib
 import sys
 import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 
+from app.models.tenant import Tenant
+from app.models.user import User
+
 
 @pytest.fixture
 def deps_module(monkeypatch):
@@ -18,48 +23,177 @@ def deps_module(monkeypatch):
 
     sys.modules.pop("app.core.security", None)
     sys.modules.pop("app.api.deps", None)
-    return importlib.import_module("app.api.deps")
+    module = importlib.import_module("app.api.deps")
+    module.principal_cache.clear_local()
+    yield module
+    module.principal_cache.clear_local()
+
+
+def _make_user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=uuid.uuid4(),
+        email="user@example.com",
+        username="user",
+        first_name="Test",
+        last_name="User",
+        is_active=True,
+        created_at=now,
+        last_update=now,
+    )
 
 
-@pytest.mark.asyncio
-async def test_get_redis_yields_client_and_closes(monkeypatch, deps_module):
-    fake_client = AsyncMock()
-    from_url_mock = Mock(return_value=fake_client)
+def _make_tenant(tenant_id: uuid.UUID) -> Tenant:
+    return Tenant(id=tenant_id, name="Workspace", created_at=datetime.now(timezone.utc))
+
+
+def _fake_request(**state):
+    app = SimpleNamespace(state=SimpleNamespace(**state))
+    return SimpleNamespace(app=app)
+
+
+def test_get_redis_pool_returns_pool_from_app_state(monkeypatch, deps_module):
+    pool = object()
+    create_pool_mock = Mock()
+    monkeypatch.setattr(deps_module, "create_redis_pool", create_pool_mock)
+
+    assert deps_module.get_redis_pool(_fake_request(redis_pool=pool)) is pool
+    create_pool_mock.assert_not_called()
+
+
+def test_get_redis_pool_creates_and_stores_pool_when_missing(monkeypatch, deps_module):
+    pool = object()
+    create_pool_mock = Mock(return_value=pool)
+    monkeypatch.setattr(deps_module, "create_redis_pool", create_pool_mock)
+    request = _fake_request()
 
-    monkeypatch.setattr(deps_module.redis, "from_url", from_url_mock)
-    monkeypatch.setenv("REDIS_URL", "redis://localhost:6390/1")
+    first = deps_module.get_redis_pool(request)
+    second = deps_module.get_redis_pool(request)
 
-    generator = deps_module.get_redis()
+    assert first is pool
+    assert second is pool
+    assert request.app.state.redis_pool is pool
+    create_pool_mock.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_get_redis_yields_client_bound_to_shared_pool(deps_module):
+    pool = Mock(connection_kwargs={}, disconnect=AsyncMock())
+
+    generator = deps_module.get_redis(pool=pool)
     yielded = await generator.__anext__()
 
-    assert yielded is fake_client
-    from_url_mock.assert_called_once_with(
-        "redis://localhost:6390/1",
-        encoding="utf-8",
-        decode_responses=True,
-    )
+    assert isinstance(yielded, deps_module.redis.Redis)
+    assert yielded.connection_pool is pool
 
     await generator.aclose()
-    fake_client.close.assert_awaited_once()
+    pool.disconnect.assert_not_called()
+
+
+def _limited_request(client_host: str = "10.0.0.1", headers: dict | None = None):
+    from starlette.requests import Request
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/limited",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+            "client": (client_host, 1234),
+            "route": SimpleNamespace(path_format="/limited"),
+        }
+    )
+
+
+async def _enforce(deps_module, enforce, request) -> None:
+    credentials = await deps_module.bearer_scheme(request)
+    claims = await deps_module.get_access_token_claims(credentials)
+    await enforce(request, claims)
 
 
 @pytest.mark.asyncio
-async def test_get_redis_uses_default_url(monkeypatch, deps_module):
-    fake_client = AsyncMock()
-    from_url_mock = Mock(return_value=fake_client)
+async def test_rate_limit_rejects_per_client_and_counts_by_route(deps_module):
+    enforce = deps_module.rate_limit(times=2, seconds=60).dependency
+    rejected = deps_module.RATE_LIMIT_REJECTIONS.value(route="/limited")
 
-    monkeypatch.setattr(deps_module.redis, "from_url", from_url_mock)
-    monkeypatch.delenv("REDIS_URL", raising=False)
+    await _enforce(deps_module, enforce, _limited_request())
+    await _enforce(deps_module, enforce, _limited_request())
+    with pytest.raises(HTTPException) as exc_info:
+        await _enforce(deps_module, enforce, _limited_request())
+    await _enforce(deps_module, enforce, _limited_request(client_host="10.0.0.2"))
 
-    generator = deps_module.get_redis()
-    await generator.__anext__()
-    await generator.aclose()
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+    assert deps_module.RATE_LIMIT_REJECTIONS.value(route="/limited") == rejected + 1
 
-    from_url_mock.assert_called_once_with(
-        "redis://localhost:6379/0",
-        encoding="utf-8",
-        decode_responses=True,
+
+@pytest.mark.asyncio
+async def test_rate_limit_per_tenant_is_shared_by_members(deps_module):
+    from app.core.security import create_access_token
+
+    tenant_id = uuid.uuid4()
+    enforce = deps_module.rate_limit(times=1, seconds=60, per="tenant").dependency
+
+    def _member_request():
+        token = create_access_token(str(uuid.uuid4()))
+        return _limited_request(
+            headers={
+                "Authorization": f"Bearer {token}",
+                deps_module.TENANT_HEADER: str(tenant_id),
+            }
+        )
+
+    await _enforce(deps_module, enforce, _member_request())
+    with pytest.raises(HTTPException):
+        await _enforce(deps_module, enforce, _member_request())
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_ignores_unverified_tokens(deps_module):
+    enforce = deps_module.rate_limit(times=1, seconds=60).dependency
+
+    await _enforce(
+        deps_module,
+        enforce,
+        _limited_request(headers={"Authorization": "Bearer forged"}),
     )
+    with pytest.raises(HTTPException):
+        await _enforce(
+            deps_module,
+            enforce,
+            _limited_request(headers={"Authorization": "Bearer other"}),
+        )
+
+
+def test_rate_limit_shares_the_token_decode_with_the_route(monkeypatch, deps_module):
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    decoded = []
+
+    def _decode(token):
+        decoded.append(token)
+        return {"sub": "user-id"}
+
+    monkeypatch.setattr(deps_module, "_decode_access_token", _decode)
+    app = FastAPI()
+
+    @app.get("/shared", dependencies=[deps_module.rate_limit(times=5, seconds=60)])
+    async def shared(claims=Depends(deps_module.get_access_token_claims)):
+        return claims
+
+    response = TestClient(app).get("/shared", headers={"Authorization": "Bearer token"})
+
+    assert response.json() == {"sub": "user-id"}
+    assert decoded == ["token"]
+
+
+def test_rate_limit_rejects_unknown_scope(deps_module):
+    with pytest.raises(ValueError):
+        deps_module.rate_limit(times=1, seconds=60, per="route")
 
 
 @pytest.mark.asyncio
@@ -129,87 +263,97 @@ async def test_get_reminder_service_returns_reminder_service(deps_module):
 
 @pytest.mark.asyncio
 async def test_get_current_user_raises_without_credentials(deps_module):
-    db = AsyncMock()
+    db = AsyncMock(info={})
 
     with pytest.raises(HTTPException) as exc:
-        await deps_module.get_current_user(credentials=None, db=db)
+        await deps_module.get_current_user(credentials=None, payload=None, db=db)
 
     assert exc.value.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_raises_for_invalid_token(monkeypatch, deps_module):
-    db = AsyncMock()
+async def test_get_current_user_raises_for_invalid_token(deps_module):
+    db = AsyncMock(info={})
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="bad-token")
 
-    monkeypatch.setattr(deps_module, "_decode_access_token", lambda *_: None)
-
     with pytest.raises(HTTPException) as exc:
-        await deps_module.get_current_user(credentials=credentials, db=db)
+        await deps_module.get_current_user(credentials=credentials, payload=None, db=db)
 
     assert exc.value.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_raises_for_invalid_subject(monkeypatch, deps_module):
-    db = AsyncMock()
+async def test_get_current_user_raises_for_invalid_subject(deps_module):
+    db = AsyncMock(info={})
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
 
-    monkeypatch.setattr(
-        deps_module,
-        "_decode_access_token",
-        lambda *_: {"sub": "not-a-uuid"},
-    )
+    payload = {"sub": "not-a-uuid"}
 
     with pytest.raises(HTTPException) as exc:
-        await deps_module.get_current_user(credentials=credentials, db=db)
+        await deps_module.get_current_user(
+            credentials=credentials, payload=payload, db=db
+        )
 
     assert exc.value.status_code == 401
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_raises_when_user_not_found(monkeypatch, deps_module):
-    db = AsyncMock()
+async def test_get_current_user_raises_when_user_not_found(deps_module):
+    db = AsyncMock(info={})
     db.get = AsyncMock(return_value=None)
     user_id = uuid.uuid4()
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
 
-    monkeypatch.setattr(
-        deps_module,
-        "_decode_access_token",
-        lambda *_: {"sub": str(user_id)},
-    )
+    payload = {"sub": str(user_id)}
 
     with pytest.raises(HTTPException) as exc:
-        await deps_module.get_current_user(credentials=credentials, db=db)
+        await deps_module.get_current_user(
+            credentials=credentials, payload=payload, db=db
+        )
 
     assert exc.value.status_code == 401
     db.get.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_returns_user(monkeypatch, deps_module):
-    user_id = uuid.uuid4()
-    user = object()
-    db = AsyncMock()
+async def test_get_current_user_returns_user(deps_module):
+    user = _make_user()
+    db = AsyncMock(info={})
     db.get = AsyncMock(return_value=user)
     credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
 
-    monkeypatch.setattr(
-        deps_module,
-        "_decode_access_token",
-        lambda *_: {"sub": str(user_id)},
-    )
+    payload = {"sub": str(user.id)}
 
-    current_user = await deps_module.get_current_user(credentials=credentials, db=db)
+    current_user = await deps_module.get_current_user(
+        credentials=credentials, payload=payload, db=db
+    )
 
     assert current_user is user
     db.get.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_serves_repeat_lookups_from_cache(deps_module):
+    user = _make_user()
+    db = AsyncMock(info={})
+    db.get = AsyncMock(return_value=user)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+    payload = {"sub": str(user.id)}
+
+    await deps_module.get_current_user(credentials=credentials, payload=payload, db=db)
+    cached_user = await deps_module.get_current_user(
+        credentials=credentials, payload=payload, db=db
+    )
+
+    assert cached_user.id == user.id
+    assert cached_user.email == user.email
+    db.get.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 async def test_get_current_tenant_raises_for_unauthorized_membership(deps_module):
-    db = AsyncMock()
+    db = AsyncMock(info={})
     db.scalar = AsyncMock(return_value=None)
     user = type("UserObj", (), {"id": uuid.uuid4()})()
     tenant_id = uuid.uuid4()
@@ -227,11 +371,11 @@ async def test_get_current_tenant_raises_for_unauthorized_membership(deps_module
 
 @pytest.mark.asyncio
 async def test_get_current_tenant_returns_tenant_for_member(deps_module):
-    tenant = object()
-    db = AsyncMock()
+    tenant_id = uuid.uuid4()
+    tenant = _make_tenant(tenant_id)
+    db = AsyncMock(info={})
     db.scalar = AsyncMock(return_value=tenant)
     user = type("UserObj", (), {"id": uuid.uuid4()})()
-    tenant_id = uuid.uuid4()
 
     current_tenant = await deps_module.get_current_tenant(
         current_user=user,
@@ -241,3 +385,28 @@ async def test_get_current_tenant_returns_tenant_for_member(deps_module):
 
     assert current_tenant is tenant
     db.scalar.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_current_tenant_caches_membership_but_not_denials(deps_module):
+    tenant_id = uuid.uuid4()
+    tenant = _make_tenant(tenant_id)
+    db = AsyncMock(info={})
+    db.scalar = AsyncMock(side_effect=[None, tenant])
+    user = type("UserObj", (), {"id": uuid.uuid4()})()
+
+    with pytest.raises(HTTPException):
+        await deps_module.get_current_tenant(
+            current_user=user, db=db, tenant_id=tenant_id
+        )
+
+    first = await deps_module.get_current_tenant(
+        current_user=user, db=db, tenant_id=tenant_id
+    )
+    second = await deps_module.get_current_tenant(
+        current_user=user, db=db, tenant_id=tenant_id
+    )
+
+    assert first is tenant
+    assert second.id == tenant_id
+    assert db.scalar.await_count == 2
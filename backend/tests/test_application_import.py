@@ -0,0 +1,109 @@
+import pytest
+
+from app.services.application_import import (
+    ImportFormatError,
+    iter_csv_rows,
+    iter_ndjson_rows,
+    row_parser,
+)
+
+
+async def _chunks(body: bytes, size: int = 7):
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+async def _collect(rows):
+    return [row async for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_maps_header_and_handles_quoted_newlines():
+    body = (
+        "\ufefftitle,company,location,applied_date,notes\r\n"
+        'Backend Engineer,"Contoso, Ltd",Remote,2026-02-24,"line one\r\nline two"\r\n'
+        "\r\n"
+        "Data Scientist,Fabrikam,Zürich,2026-02-25,\r\n"
+    ).encode("utf-8")
+
+    rows = await _collect(iter_csv_rows(_chunks(body)))
+
+    assert rows == [
+        (
+            1,
+            {
+                "title": "Backend Engineer",
+                "company": "Contoso, Ltd",
+                "location": "Remote",
+                "applied_date": "2026-02-24",
+                "notes": "line one\r\nline two",
+            },
+        ),
+        (
+            2,
+            {
+                "title": "Data Scientist",
+                "company": "Fabrikam",
+                "location": "Zürich",
+                "applied_date": "2026-02-25",
+            },
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_reports_malformed_rows():
+    body = b'title,company\nOnly one\nA,B\n"unterminated,B\n'
+
+    rows = await _collect(iter_csv_rows(_chunks(body)))
+
+    assert rows == [
+        (1, "Expected 2 columns, found 1"),
+        (2, {"title": "A", "company": "B"}),
+        (3, "Unterminated quoted value"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_rows_rejects_unknown_columns_and_bad_encoding():
+    with pytest.raises(ImportFormatError, match="Unknown CSV columns: salary"):
+        await _collect(iter_csv_rows(_chunks(b"title,salary\nA,1\n")))
+    with pytest.raises(ImportFormatError, match="UTF-8"):
+        await _collect(iter_csv_rows(_chunks(b"title\n\xff\xfe\n")))
+    with pytest.raises(ImportFormatError, match="header"):
+        await _collect(iter_csv_rows(_chunks(b"")))
+
+
+async def _endless(prefix: bytes, filler: bytes):
+    yield prefix
+    while True:
+        yield filler
+
+
+@pytest.mark.asyncio
+async def test_oversized_records_are_rejected_without_reading_the_whole_body():
+    with pytest.raises(ImportFormatError, match="at most 32 characters"):
+        await _collect(iter_ndjson_rows(_endless(b"", b"x" * 8), 32))
+    with pytest.raises(ImportFormatError, match="at most 32 characters"):
+        await _collect(iter_csv_rows(_endless(b'title\n"open', b"\nmore"), 32))
+
+    rows = await _collect(iter_csv_rows(_chunks(b'title\n"a\nb"\n'), 32))
+    assert rows == [(1, {"title": "a\nb"})]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_rows_skips_blank_lines_and_reports_bad_lines():
+    body = b'{"title": "A"}\n\n[1, 2]\n{bad json\n{"title": "B"}'
+
+    rows = await _collect(iter_ndjson_rows(_chunks(body, size=3)))
+
+    assert rows[0] == (1, {"title": "A"})
+    assert rows[1] == (2, "Each line must be a JSON object")
+    assert rows[2][0] == 3 and rows[2][1].startswith("Invalid JSON")
+    assert rows[3] == (4, {"title": "B"})
+
+
+def test_row_parser_selects_format_from_content_type():
+    assert row_parser("text/csv; charset=utf-8") is iter_csv_rows
+    assert row_parser("application/x-ndjson") is iter_ndjson_rows
+    assert row_parser("application/json") is None
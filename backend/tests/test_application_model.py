@@ -5,7 +5,11 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from app.models.application import Application, ApplicationStatus
+from app.models.application import (
+    SEARCH_DOCUMENT_SQL,
+    Application,
+    ApplicationStatus,
+)
 from app.models.tenant import Tenant
 
 
@@ -105,3 +109,43 @@ def test_application_declares_expected_indexes():
     assert "ix_applications_tenant_status" in index_names
     assert "ix_applications_tenant_company" in index_names
     assert "ix_applications_tenant_applied_date" in index_names
+    assert "ix_applications_tenant_created_at" in index_names
+
+
+def test_application_sort_indexes_end_with_id_for_keyset_pagination():
+    indexes = {index.name: index for index in Application.__table__.indexes}
+
+    for name in (
+        "ix_applications_tenant_status",
+        "ix_applications_tenant_company",
+        "ix_applications_tenant_applied_date",
+        "ix_applications_tenant_created_at",
+    ):
+        assert [column.name for column in indexes[name].columns][-1] == "id"
+
+
+def test_application_dashboard_index_is_partial_on_live_rows():
+    index = next(
+        index
+        for index in Application.__table__.indexes
+        if index.name == "ix_applications_tenant_live_dashboard"
+    )
+
+    assert [column.name for column in index.columns] == [
+        "tenant_id",
+        "status",
+        "applied_date",
+    ]
+    assert str(index.dialect_options["postgresql"]["where"]) == "deleted_at IS NULL"
+
+
+def test_application_declares_search_indexes():
+    indexes = {index.name: index for index in Application.__table__.indexes}
+
+    trigram = indexes["ix_applications_company_trgm"]
+    assert trigram.dialect_options["postgresql"]["using"] == "gin"
+    assert trigram.dialect_options["postgresql"]["ops"] == {"company": "gin_trgm_ops"}
+
+    document = indexes["ix_applications_search_document"]
+    assert document.dialect_options["postgresql"]["using"] == "gin"
+    assert str(document.expressions[0]) == SEARCH_DOCUMENT_SQL
@@ -1,11 +1,16 @@
+import uuid
 from datetime import date, datetime, timedelta, timezone
 
+import asyncpg
 import pytest
 from sqlalchemy import select
 
 from app.models.application import Application, ApplicationStatus
 from app.models.tenant import Tenant
-from app.repositories.application_repository import ApplicationRepository
+from app.repositories.application_repository import (
+    BULK_INSERT_ERRORS,
+    ApplicationRepository,
+)
 
 
 async def _create_tenant(db_session, name: str) -> Tenant:
@@ -142,6 +147,113 @@ async def test_list_applications_supports_filters_pagination_and_sorting(db_sess
     assert len(safe_sort) == 3
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["applied_date", "created_at", "company", "status"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+async def test_list_applications_keyset_pages_match_offset_order(
+    db_session, sort_by, sort_order
+):
+    tenant = await _create_tenant(db_session, f"Keyset-{sort_by}-{sort_order}")
+    repo = ApplicationRepository(db_session)
+    created_at = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    statuses = [ApplicationStatus.applied, ApplicationStatus.interview]
+    for index in range(7):
+        # Duplicate sort values on purpose so ties are broken by id.
+        db_session.add(
+            Application(
+                tenant_id=tenant.id,
+                title=f"Role {index}",
+                company=f"Company {index % 3}",
+                status=statuses[index % 2],
+                location="Remote",
+                applied_date=date(2026, 2, 1 + index % 3),
+                created_at=created_at + timedelta(minutes=index % 3),
+            )
+        )
+    await db_session.commit()
+
+    expected = await repo.list_applications(
+        tenant_id=tenant.id,
+        limit=100,
+        offset=0,
+        sort_by=sort_by,
+        sort_order=sort_order,
+    )
+
+    walked: list[Application] = []
+    after = None
+    while True:
+        page = await repo.list_applications(
+            tenant_id=tenant.id,
+            limit=3,
+            offset=0,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            after=after,
+        )
+        walked.extend(page)
+        if len(page) < 3:
+            break
+        after = (getattr(page[-1], sort_by), page[-1].id)
+
+    assert len(expected) == 7
+    assert [item.id for item in walked] == [item.id for item in expected]
+
+
+@pytest.mark.asyncio
+async def test_list_applications_search_modes_cover_text_fields(db_session):
+    tenant = await _create_tenant(db_session, "SearchTenant")
+    repo = ApplicationRepository(db_session)
+
+    for title, company, notes, description in (
+        ("Backend Engineer", "Acme", None, "Python services"),
+        ("Frontend Developer", "Globex", "Referred by Jordan", None),
+        ("Data Engineer", "Initech", None, None),
+    ):
+        await repo.create_application(
+            {
+                "tenant_id": tenant.id,
+                "title": title,
+                "company": company,
+                "location": "Remote",
+                "notes": notes,
+                "description": description,
+                "applied_date": date(2026, 2, 1),
+            }
+        )
+    deleted = await repo.create_application(
+        {
+            "tenant_id": tenant.id,
+            "title": "Backend Engineer",
+            "company": "Deleted Co",
+            "location": "Remote",
+            "applied_date": date(2026, 2, 1),
+        }
+    )
+    await repo.soft_delete_application(tenant.id, deleted.id)
+
+    async def _titles(search: str, mode: str) -> list[str]:
+        found = await repo.list_applications(
+            tenant_id=tenant.id,
+            limit=10,
+            offset=0,
+            sort_by="company",
+            sort_order="asc",
+            search=search,
+            search_mode=mode,
+        )
+        return [application.title for application in found]
+
+    assert await _titles("eng", "prefix") == ["Backend Engineer", "Data Engineer"]
+    assert await _titles("back eng", "prefix") == ["Backend Engineer"]
+    assert await _titles("jord", "prefix") == ["Frontend Developer"]
+    assert await _titles("pyth", "prefix") == ["Backend Engineer"]
+    assert await _titles("!!!", "prefix") == []
+    assert await _titles("engineer -python", "fulltext") == ["Data Engineer"]
+    assert await _titles('"frontend developer"', "fulltext") == ["Frontend Developer"]
+    assert await _titles("eng", "fulltext") == []
+
+
 @pytest.mark.asyncio
 async def test_update_application_applies_updates_and_returns_none_when_missing(
     db_session,
@@ -181,6 +293,52 @@ async def test_update_application_applies_updates_and_returns_none_when_missing(
     assert missing is None
 
 
+@pytest.mark.asyncio
+async def test_update_application_with_previous_returns_overwritten_values(
+    db_session,
+):
+    tenant = await _create_tenant(db_session, "UpdatePreviousTenant")
+    repo = ApplicationRepository(db_session)
+    app_obj = await repo.create_application(
+        {
+            "tenant_id": tenant.id,
+            "title": "Original Title",
+            "company": "Original Co",
+            "location": "Remote",
+            "applied_date": date(2026, 2, 10),
+        }
+    )
+    created_updated_at = app_obj.updated_at
+
+    result = await repo.update_application_with_previous(
+        tenant.id,
+        app_obj.id,
+        {"status": ApplicationStatus.offer, "applied_date": date(2026, 2, 12)},
+    )
+
+    assert result is not None
+    updated, previous_status, previous_applied_date = result
+    assert updated is app_obj
+    assert (updated.status, updated.applied_date) == (
+        ApplicationStatus.offer,
+        date(2026, 2, 12),
+    )
+    assert (previous_status, previous_applied_date) == (
+        ApplicationStatus.applied,
+        date(2026, 2, 10),
+    )
+    assert updated.updated_at >= created_updated_at
+
+    await repo.soft_delete_application(tenant.id, app_obj.id)
+    assert (
+        await repo.update_application_with_previous(
+            tenant.id, app_obj.id, {"status": ApplicationStatus.rejected}
+        )
+        is None
+    )
+    assert await repo.soft_delete_application(tenant.id, app_obj.id) is None
+
+
 @pytest.mark.asyncio
 async def test_soft_delete_marks_record_and_hides_from_base_queries(db_session):
     tenant = await _create_tenant(db_session, "SoftDeleteTenant")
@@ -266,3 +424,146 @@ async def test_get_dashboard_summary_returns_per_status_counts(db_session):
     assert summary["screening"] == 0
     assert summary["applied_last_7_days"] == 2
     assert summary["applied_last_30_days"] == 3
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard_summary_ignores_deleted_rows_and_other_tenants(
+    db_session,
+):
+    tenant = await _create_tenant(db_session, "DashboardLiveTenant")
+    other_tenant = await _create_tenant(db_session, "DashboardOtherTenant")
+    repo = ApplicationRepository(db_session)
+    today = datetime.now(timezone.utc).date()
+
+    kept = await repo.create_application(
+        {
+            "tenant_id": tenant.id,
+            "title": "Live",
+            "company": "Contoso",
+            "status": ApplicationStatus.interview,
+            "location": "Remote",
+            "applied_date": today,
+        }
+    )
+    deleted = await repo.create_application(
+        {
+            "tenant_id": tenant.id,
+            "title": "Deleted",
+            "company": "Contoso",
+            "status": ApplicationStatus.interview,
+            "location": "Remote",
+            "applied_date": today,
+        }
+    )
+    await repo.soft_delete_application(tenant.id, deleted.id)
+    await repo.create_application(
+        {
+            "tenant_id": other_tenant.id,
+            "title": "Elsewhere",
+            "company": "Contoso",
+            "status": ApplicationStatus.interview,
+            "location": "Remote",
+            "applied_date": today,
+        }
+    )
+
+    summary = await repo.get_dashboard_summary(tenant.id)
+
+    assert kept.deleted_at is None
+    assert summary == {
+        "applied": 0,
+        "screening": 0,
+        "interview": 1,
+        "offer": 0,
+        "rejected": 0,
+        "applied_last_7_days": 1,
+        "applied_last_30_days": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard_counters_groups_status_and_recent_days(db_session):
+    tenant = await _create_tenant(db_session, "DashboardCountersTenant")
+    repo = ApplicationRepository(db_session)
+    since = date(2026, 3, 1)
+
+    for status, applied_date in (
+        (ApplicationStatus.applied, date(2026, 3, 2)),
+        (ApplicationStatus.applied, date(2026, 3, 2)),
+        (ApplicationStatus.offer, date(2026, 3, 2)),
+        (ApplicationStatus.offer, date(2026, 1, 15)),
+        (ApplicationStatus.rejected, date(2025, 12, 1)),
+    ):
+        await repo.create_application(
+            {
+                "tenant_id": tenant.id,
+                "title": "Role",
+                "company": "Contoso",
+                "status": status,
+                "location": "Remote",
+                "applied_date": applied_date,
+            }
+        )
+
+    status_counts, day_counts = await repo.get_dashboard_counters(tenant.id, since)
+
+    assert status_counts == {"applied": 2, "offer": 2, "rejected": 1}
+    assert day_counts == {date(2026, 3, 2): 3}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_applications_copies_rows(db_session):
+    tenant = await _create_tenant(db_session, "BulkRepoTenant")
+    repo = ApplicationRepository(db_session)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant.id,
+            "title": f"Engineer {index}",
+            "company": "Contoso",
+            "status": "interview" if index else "applied",
+            "location": "Remote",
+            "notes": "Imported" if index else None,
+            "applied_date": date(2026, 2, 20),
+        }
+        for index in range(3)
+    ]
+
+    inserted = await repo.bulk_create_applications(rows)
+
+    assert inserted == 3
+    assert await repo.bulk_create_applications([]) == 0
+    stored = (
+        await db_session.scalars(
+            select(Application)
+            .where(Application.tenant_id == tenant.id)
+            .order_by(Application.title)
+        )
+    ).all()
+    assert [application.id for application in stored] == [row["id"] for row in rows]
+    assert stored[0].status == ApplicationStatus.applied
+    assert stored[1].status == ApplicationStatus.interview
+    assert stored[1].notes == "Imported"
+    assert all(application.created_at is not None for application in stored)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_applications_rolls_back_a_failed_copy(db_session):
+    tenant = await _create_tenant(db_session, "BulkRollbackTenant")
+    await db_session.commit()
+    repo = ApplicationRepository(db_session)
+    row = {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant.id,
+        "title": "Engineer",
+        "company": "Contoso",
+        "status": "applied",
+        "location": "Remote",
+        "applied_date": date(2026, 2, 20),
+    }
+
+    with pytest.raises(BULK_INSERT_ERRORS) as exc_info:
+        await repo.bulk_create_applications([row, row])
+
+    assert isinstance(exc_info.value, asyncpg.UniqueViolationError)
+    assert await repo.bulk_create_applications([row]) == 1
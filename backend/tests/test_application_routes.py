@@ -5,15 +5,25 @@ from unittest.mock import AsyncMock
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.api.deps import get_application_service, get_current_tenant
+from app.api.deps import (
+    get_application_service,
+    get_current_tenant,
+    get_read_application_service,
+)
 from app.api.routes.applications import router as applications_router
-from app.services.application_service import ApplicationService
+from app.services.application_service import (
+    ApplicationPage,
+    ApplicationService,
+    InvalidCursorError,
+)
+from app.services.dashboard_counters import APPLY_DELTAS_SCRIPT
 
 
 def _build_test_client(fake_service, tenant_id: uuid.UUID):
     app = FastAPI()
     app.include_router(applications_router)
     app.dependency_overrides[get_application_service] = lambda: fake_service
+    app.dependency_overrides[get_read_application_service] = lambda: fake_service
     app.dependency_overrides[get_current_tenant] = lambda: type(
         "TenantObj", (), {"id": tenant_id}
     )()
@@ -66,6 +76,51 @@ def test_create_application_route_calls_service_and_returns_payload():
     fake_service.create_application.assert_awaited_once()
 
 
+def test_list_applications_route_returns_next_cursor_header():
+    fake_service = AsyncMock()
+    tenant_id = uuid.uuid4()
+    application_id = uuid.uuid4()
+    fake_service.list_applications_page.return_value = ApplicationPage(
+        items=[_application_response(application_id, tenant_id)],
+        next_cursor="next-page",
+    )
+    client = _build_test_client(fake_service, tenant_id)
+
+    response = client.get(
+        "/applications",
+        params={
+            "limit": 1,
+            "sort_by": "company",
+            "cursor": "abc",
+            "q": "backend eng",
+            "search_mode": "prefix",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == str(application_id)
+    assert response.headers["X-Next-Cursor"] == "next-page"
+    params = fake_service.list_applications_page.await_args.args[1]
+    assert params.cursor == "abc"
+    assert params.sort_by == "company"
+    assert params.q == "backend eng"
+    assert params.search_mode == "prefix"
+
+
+def test_list_applications_route_returns_400_for_invalid_cursor():
+    fake_service = AsyncMock()
+    fake_service.list_applications_page.side_effect = InvalidCursorError(
+        "Invalid cursor"
+    )
+    client = _build_test_client(fake_service, uuid.uuid4())
+
+    response = client.get("/applications", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+    assert "X-Next-Cursor" not in response.headers
+
+
 def test_get_application_by_id_returns_404_when_service_returns_none():
     fake_service = AsyncMock()
     tenant_id = uuid.uuid4()
@@ -106,30 +161,15 @@ def test_dashboard_summary_route_returns_cached_stats_payload():
     fake_service.get_dashboard_summary.assert_awaited_once_with(tenant_id)
 
 
-class _FakeRedis:
-    def __init__(self):
-        self.store: dict[str, str] = {}
-
-    async def get(self, key: str) -> str | None:
-        return self.store.get(key)
-
-    async def setex(self, key: str, _ttl: int, value: str) -> None:
-        self.store[key] = value
-
-    async def delete(self, key: str) -> int:
-        return 1 if self.store.pop(key, None) is not None else 0
-
-
-def test_create_application_route_invalidates_dashboard_cache_with_real_service():
+def test_create_application_route_updates_dashboard_counters_with_real_service():
     tenant_id = uuid.uuid4()
     application_id = uuid.uuid4()
     fake_repository = AsyncMock()
     fake_repository.create_application.return_value = _application_response(
         application_id, tenant_id
     )
-    fake_redis = _FakeRedis()
-    cache_key = f"dashboard:{tenant_id}"
-    fake_redis.store[cache_key] = "cached"
+    fake_redis = AsyncMock()
+    fake_redis.evalsha = AsyncMock(return_value=1)
 
     service = ApplicationService(repository=fake_repository, redis_client=fake_redis)
     client = _build_test_client(service, tenant_id)
@@ -146,4 +186,59 @@ def test_create_application_route_invalidates_dashboard_cache_with_real_service(
     )
 
     assert response.status_code == 201
-    assert cache_key not in fake_redis.store
+    fake_redis.evalsha.assert_awaited_once_with(
+        APPLY_DELTAS_SCRIPT.sha,
+        1,
+        f"dashboard:counters:{tenant_id}",
+        "status:applied",
+        1,
+        "day:2026-02-24",
+        1,
+    )
+
+
+def test_bulk_import_route_streams_csv_through_real_service():
+    tenant_id = uuid.uuid4()
+    fake_repository = AsyncMock()
+    fake_repository.bulk_create_applications = AsyncMock(
+        side_effect=lambda rows: len(rows)
+    )
+    service = ApplicationService(repository=fake_repository)
+    client = _build_test_client(service, tenant_id)
+
+    response = client.post(
+        "/applications/bulk",
+        content=(
+            "title,company,location,applied_date,status\n"
+            "Backend Engineer,Contoso,Remote,2026-02-24,applied\n"
+            "Data Scientist,Fabrikam,,2026-02-25,screening\n"
+        ),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["received"], body["inserted"], body["failed"]) == (2, 1, 1)
+    assert body["errors"] == [{"row": 2, "errors": ["location: Field required"]}]
+    (rows,) = fake_repository.bulk_create_applications.await_args.args
+    assert rows[0]["tenant_id"] == tenant_id
+
+
+def test_bulk_import_route_rejects_unsupported_or_malformed_bodies():
+    service = ApplicationService(repository=AsyncMock())
+    client = _build_test_client(service, uuid.uuid4())
+
+    unsupported = client.post(
+        "/applications/bulk",
+        content="[]",
+        headers={"Content-Type": "application/json"},
+    )
+    unknown_column = client.post(
+        "/applications/bulk",
+        content="title,salary\nA,1\n",
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert unsupported.status_code == 415
+    assert unknown_column.status_code == 400
+    assert unknown_column.json()["detail"] == "Unknown CSV columns: salary"
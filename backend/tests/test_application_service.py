@@ -1,9 +1,13 @@
+import asyncio
 import uuid
-from datetime import date
-from unittest.mock import AsyncMock
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 
+import asyncpg
 import pytest
 
+import app.services.application_service as service_module
 from app.models.application import ApplicationStatus
 from app.schemas.application import (
     ApplicationCreate,
@@ -11,20 +15,11 @@ from app.schemas.application import (
     ApplicationUpdate,
 )
 from app.services.application_service import ApplicationService
-
-
-class _FakeRedis:
-    def __init__(self):
-        self.store: dict[str, str] = {}
-
-    async def get(self, key: str) -> str | None:
-        return self.store.get(key)
-
-    async def setex(self, key: str, _ttl: int, value: str) -> None:
-        self.store[key] = value
-
-    async def delete(self, key: str) -> int:
-        return 1 if self.store.pop(key, None) is not None else 0
+from app.services.dashboard_counters import (
+    DASHBOARD_REBUILDS,
+    DASHBOARD_REQUESTS_COALESCED,
+    DASHBOARD_STALE_READS,
+)
 
 
 @pytest.mark.asyncio
@@ -76,7 +71,91 @@ async def test_list_applications_passes_validated_params_to_repository():
         company="Acme",
         sort_by="applied_date",
         sort_order="asc",
+        after=None,
+        search=None,
+        search_mode="fulltext",
+    )
+
+
+def _listed_application(**overrides):
+    values = {
+        "id": uuid.uuid4(),
+        "applied_date": date(2026, 2, 24),
+        "created_at": datetime(2026, 2, 24, 8, 30, 15, 123456, tzinfo=timezone.utc),
+        "company": "Contoso",
+        "status": ApplicationStatus.offer,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["applied_date", "created_at", "company", "status"])
+async def test_list_applications_page_cursor_resumes_after_last_row(sort_by):
+    last = _listed_application()
+    repository = AsyncMock()
+    repository.list_applications = AsyncMock(
+        side_effect=[[_listed_application(), last], []]
+    )
+    service = ApplicationService(repository=repository)
+    tenant_id = uuid.uuid4()
+
+    first = await service.list_applications_page(
+        tenant_id, ApplicationListParams(limit=2, sort_by=sort_by)
     )
+    assert first.next_cursor is not None
+
+    second = await service.list_applications_page(
+        tenant_id,
+        ApplicationListParams(limit=2, sort_by=sort_by, cursor=first.next_cursor),
+    )
+
+    assert second.items == []
+    assert second.next_cursor is None
+    after = repository.list_applications.await_args.kwargs["after"]
+    assert after == (getattr(last, sort_by), last.id)
+
+
+@pytest.mark.asyncio
+async def test_list_applications_page_omits_cursor_for_partial_page():
+    repository = AsyncMock()
+    repository.list_applications = AsyncMock(return_value=[_listed_application()])
+    service = ApplicationService(repository=repository)
+
+    page = await service.list_applications_page(
+        uuid.uuid4(), ApplicationListParams(limit=2)
+    )
+
+    assert len(page.items) == 1
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_applications_page_rejects_mismatched_or_malformed_cursor():
+    repository = AsyncMock()
+    repository.list_applications = AsyncMock(return_value=[_listed_application()])
+    service = ApplicationService(repository=repository)
+    tenant_id = uuid.uuid4()
+    cursor = (
+        await service.list_applications_page(
+            tenant_id, ApplicationListParams(limit=1, sort_by="company")
+        )
+    ).next_cursor
+
+    with pytest.raises(ValueError, match="sort order"):
+        await service.list_applications_page(
+            tenant_id,
+            ApplicationListParams(limit=1, sort_by="status", cursor=cursor),
+        )
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await service.list_applications_page(
+            tenant_id, ApplicationListParams(cursor="not-a-cursor")
+        )
+    with pytest.raises(ValueError, match="offset"):
+        await service.list_applications_page(
+            tenant_id,
+            ApplicationListParams(limit=1, sort_by="company", offset=1, cursor=cursor),
+        )
 
 
 @pytest.mark.asyncio
@@ -99,7 +178,7 @@ async def test_update_application_uses_dynamic_update_payload():
 
 
 @pytest.mark.asyncio
-async def test_get_dashboard_summary_uses_repository_then_caches_result():
+async def test_get_dashboard_summary_without_redis_uses_aggregate_query():
     repository = AsyncMock()
     repository.get_dashboard_summary = AsyncMock(
         return_value={
@@ -112,53 +191,343 @@ async def test_get_dashboard_summary_uses_repository_then_caches_result():
             "applied_last_30_days": 6,
         }
     )
-    fake_redis = _FakeRedis()
-    service = ApplicationService(repository=repository, redis_client=fake_redis)
+    service = ApplicationService(repository=repository)
 
     tenant_id = uuid.uuid4()
+    dashboard = await service.get_dashboard_summary(tenant_id)
+
+    assert dashboard.total == 7
+    assert dashboard.by_status.rejected == 3
+    assert dashboard.trends.applied_last_7_days == 4
+    assert dashboard.trends.applied_last_30_days == 6
+    repository.get_dashboard_summary.assert_awaited_once_with(tenant_id)
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard_summary_seeds_counters_then_reads_them():
+    today = datetime.now(timezone.utc).date()
+    repository = AsyncMock()
+    repository.get_dashboard_counters = AsyncMock(
+        return_value=({"applied": 2, "rejected": 3}, {today: 1})
+    )
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    stored: dict[str, int] = {}
 
+    async def _load(_tenant_id):
+        return dict(stored) if stored else None
+
+    async def _replace(_tenant_id, fields, keep_ttl=False):
+        stored.update(fields)
+        return True
+
+    service.dashboard_counters = AsyncMock()
+    service.dashboard_counters.load = AsyncMock(side_effect=_load)
+    service.dashboard_counters.replace = AsyncMock(side_effect=_replace)
+    service.dashboard_counters.acquire_refresh_lock = AsyncMock(return_value="t")
+    service.dashboard_counters.is_stale = Mock(return_value=False)
+
+    tenant_id = uuid.uuid4()
     first = await service.get_dashboard_summary(tenant_id)
     second = await service.get_dashboard_summary(tenant_id)
 
-    assert first.total == 7
-    assert second.total == 7
+    assert first == second
+    assert second.total == 5
     assert second.by_status.rejected == 3
-    assert second.trends.applied_last_7_days == 4
-    assert second.trends.applied_last_30_days == 6
-    repository.get_dashboard_summary.assert_awaited_once_with(tenant_id)
+    assert second.trends.applied_last_7_days == 1
+    assert second.trends.applied_last_30_days == 1
+    since = repository.get_dashboard_counters.await_args.args[1]
+    assert (today - since).days == 29
+    repository.get_dashboard_counters.assert_awaited_once()
+    repository.get_dashboard_summary.assert_not_awaited()
+
+
+def _counter_service(repository, counters) -> ApplicationService:
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = counters
+    return service
 
 
 @pytest.mark.asyncio
-async def test_create_update_delete_invalidate_dashboard_cache():
+async def test_concurrent_dashboard_misses_rebuild_counters_once():
+    release = asyncio.Event()
     repository = AsyncMock()
-    repository.create_application = AsyncMock(return_value={"id": uuid.uuid4()})
-    repository.update_application = AsyncMock(return_value={"id": uuid.uuid4()})
-    repository.soft_delete_application = AsyncMock(return_value={"id": uuid.uuid4()})
-    fake_redis = _FakeRedis()
-    service = ApplicationService(repository=repository, redis_client=fake_redis)
 
+    async def _counts(_tenant_id, _since):
+        await release.wait()
+        return {"offer": 1}, {}
+
+    repository.get_dashboard_counters = AsyncMock(side_effect=_counts)
+    counters = AsyncMock()
+    counters.load = AsyncMock(return_value=None)
+    counters.acquire_refresh_lock = AsyncMock(return_value="token")
+    counters.replace = AsyncMock(return_value=True)
     tenant_id = uuid.uuid4()
-    cache_key = f"dashboard:{tenant_id}"
-    fake_redis.store[cache_key] = "cached"
+    coalesced_before = DASHBOARD_REQUESTS_COALESCED.value(scope="local")
 
-    payload = ApplicationCreate(
-        title="Backend Engineer",
-        company="Contoso",
-        location="Remote",
-        applied_date=date(2026, 2, 24),
-        status="applied",
+    tasks = [
+        asyncio.create_task(
+            _counter_service(repository, counters).get_dashboard_summary(tenant_id)
+        )
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    dashboards = await asyncio.gather(*tasks)
+
+    assert [dashboard.by_status.offer for dashboard in dashboards] == [1] * 5
+    repository.get_dashboard_counters.assert_awaited_once()
+    counters.release_refresh_lock.assert_awaited_once_with(tenant_id, "token")
+    assert DASHBOARD_REQUESTS_COALESCED.value(scope="local") - coalesced_before == 4
+
+
+@pytest.mark.asyncio
+async def test_dashboard_miss_waits_for_rebuild_running_in_another_worker():
+    repository = AsyncMock()
+    counters = AsyncMock()
+    counters.load = AsyncMock(return_value=None)
+    counters.acquire_refresh_lock = AsyncMock(return_value=None)
+    counters.wait_for = AsyncMock(return_value={"status:interview": 2})
+    coalesced_before = DASHBOARD_REQUESTS_COALESCED.value(scope="redis")
+
+    dashboard = await _counter_service(repository, counters).get_dashboard_summary(
+        uuid.uuid4()
     )
-    await service.create_application(tenant_id, payload)
-    assert cache_key not in fake_redis.store
 
-    fake_redis.store[cache_key] = "cached"
+    assert dashboard.by_status.interview == 2
+    repository.get_dashboard_counters.assert_not_awaited()
+    assert DASHBOARD_REQUESTS_COALESCED.value(scope="redis") - coalesced_before == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_dashboard_is_served_while_refreshing_in_background(
+    monkeypatch,
+):
+    tenant_id = uuid.uuid4()
+    background_repository = AsyncMock()
+    background_repository.get_dashboard_counters = AsyncMock(
+        return_value=({"offer": 3}, {})
+    )
+    monkeypatch.setattr(
+        service_module, "ApplicationRepository", lambda session: background_repository
+    )
+
+    class _SessionFactory:
+        def __call__(self):
+            return self
+
+        async def __aenter__(self):
+            return object()
+
+        async def __aexit__(self, *_exc_info):
+            return False
+
+    redis_client = AsyncMock()
+    redis_client.hgetall = AsyncMock(
+        return_value={"status:offer": "1", "meta:refreshed_at": "0"}
+    )
+    redis_client.set = AsyncMock(return_value=True)
+    redis_client.evalsha = AsyncMock(return_value=1)
+    request_repository = AsyncMock()
+    service = ApplicationService(
+        repository=request_repository,
+        redis_client=redis_client,
+        session_factory=_SessionFactory(),
+    )
+    stale_before = DASHBOARD_STALE_READS.value()
+    refreshes_before = DASHBOARD_REBUILDS.value(reason="refresh")
+
+    dashboard = await service.get_dashboard_summary(tenant_id)
+    await asyncio.gather(*service_module._background_refreshes)
+
+    assert dashboard.by_status.offer == 1
+    request_repository.get_dashboard_counters.assert_not_awaited()
+    background_repository.get_dashboard_counters.assert_awaited_once()
+    assert DASHBOARD_STALE_READS.value() - stale_before == 1
+    assert DASHBOARD_REBUILDS.value(reason="refresh") - refreshes_before == 1
+
+
+@pytest.mark.asyncio
+async def test_create_update_delete_apply_dashboard_counter_deltas():
+    applied_date = date(2026, 2, 24)
+    repository = AsyncMock()
+    repository.create_application = AsyncMock(return_value={"id": uuid.uuid4()})
+    repository.update_application_with_previous = AsyncMock(
+        return_value=(
+            SimpleNamespace(status=ApplicationStatus.offer, applied_date=applied_date),
+            ApplicationStatus.applied,
+            applied_date,
+        )
+    )
+    repository.soft_delete_application = AsyncMock(
+        return_value=SimpleNamespace(
+            status=ApplicationStatus.offer, applied_date=applied_date
+        )
+    )
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = AsyncMock()
+    tenant_id = uuid.uuid4()
+
+    await service.create_application(
+        tenant_id,
+        ApplicationCreate(
+            title="Backend Engineer",
+            company="Contoso",
+            location="Remote",
+            applied_date=applied_date,
+        ),
+    )
     await service.update_application(
+        tenant_id, uuid.uuid4(), ApplicationUpdate(status="offer")
+    )
+    await service.soft_delete_application(tenant_id, uuid.uuid4())
+
+    deltas = [call.args for call in service.dashboard_counters.apply.await_args_list]
+    assert deltas == [
+        (tenant_id, {"status:applied": 1, "day:2026-02-24": 1}),
+        (tenant_id, {"status:applied": -1, "status:offer": 1}),
+        (tenant_id, {"status:offer": -1, "day:2026-02-24": -1}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_without_dashboard_fields_skips_counter_lookup():
+    repository = AsyncMock()
+    repository.update_application = AsyncMock(return_value=SimpleNamespace())
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = AsyncMock()
+
+    await service.update_application(
+        uuid.uuid4(), uuid.uuid4(), ApplicationUpdate(notes="Follow up")
+    )
+
+    repository.update_application.assert_awaited_once()
+    repository.update_application_with_previous.assert_not_awaited()
+    service.dashboard_counters.apply.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_dashboard_counters_rewrites_existing_hashes_only():
+    tenant_ids = [uuid.uuid4(), uuid.uuid4()]
+    repository = AsyncMock()
+    repository.get_dashboard_counters = AsyncMock(return_value=({}, {}))
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+
+    async def _tenant_ids():
+        for tenant_id in tenant_ids:
+            yield tenant_id
+
+    service.dashboard_counters = AsyncMock()
+    service.dashboard_counters.tenant_ids = _tenant_ids
+    service.dashboard_counters.replace = AsyncMock(side_effect=[True, False])
+
+    reconciled = await service.reconcile_dashboard_counters()
+
+    assert reconciled == 1
+    for call in service.dashboard_counters.replace.await_args_list:
+        assert call.kwargs == {"keep_ttl": True}
+
+
+async def _import_rows(rows):
+    for row in rows:
+        yield row
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_inserts_valid_rows_in_chunks_and_reports_errors():
+    repository = AsyncMock()
+    repository.bulk_create_applications = AsyncMock(side_effect=lambda rows: len(rows))
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = AsyncMock()
+    tenant_id = uuid.uuid4()
+    valid = {
+        "title": "Backend Engineer",
+        "company": "Contoso",
+        "location": "Remote",
+        "applied_date": "2026-02-24",
+    }
+
+    report = await service.bulk_import_applications(
         tenant_id,
-        uuid.uuid4(),
-        ApplicationUpdate(status="offer"),
+        _import_rows(
+            [
+                (1, valid),
+                (2, {**valid, "status": "offer"}),
+                (3, {**valid, "applied_date": "not-a-date"}),
+                (4, "Expected 4 columns, found 2"),
+                (5, valid),
+            ]
+        ),
+        chunk_size=2,
     )
-    assert cache_key not in fake_redis.store
 
-    fake_redis.store[cache_key] = "cached"
-    await service.soft_delete_application(tenant_id, uuid.uuid4())
-    assert cache_key not in fake_redis.store
+    assert (report.received, report.inserted, report.failed) == (5, 3, 2)
+    assert [error.row for error in report.errors] == [3, 4]
+    assert report.errors[0].errors[0].startswith("applied_date: ")
+    chunks = [
+        call.args[0] for call in repository.bulk_create_applications.await_args_list
+    ]
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0][0]["tenant_id"] == tenant_id
+    assert [row["status"] for row in chunks[0]] == ["applied", "offer"]
+    service.dashboard_counters.apply.assert_awaited_once_with(
+        tenant_id, {"status:applied": 2, "status:offer": 1, "day:2026-02-24": 3}
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_stops_at_row_limit_and_keeps_committed_deltas():
+    repository = AsyncMock()
+    repository.bulk_create_applications = AsyncMock(
+        side_effect=[1, RuntimeError("copy failed")]
+    )
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = AsyncMock()
+    tenant_id = uuid.uuid4()
+    row = {
+        "title": "Backend Engineer",
+        "company": "Contoso",
+        "location": "Remote",
+        "applied_date": "2026-02-24",
+    }
+
+    report = await service.bulk_import_applications(
+        tenant_id, _import_rows([(n, row) for n in range(1, 4)]), max_rows=1
+    )
+    assert (report.received, report.inserted, report.truncated) == (1, 1, True)
+
+    with pytest.raises(RuntimeError):
+        await service.bulk_import_applications(
+            tenant_id, _import_rows([(1, row), (2, row)]), chunk_size=1
+        )
+    assert service.dashboard_counters.apply.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_reports_rows_of_chunks_the_database_rejects():
+    repository = AsyncMock()
+    repository.bulk_create_applications = AsyncMock(
+        side_effect=[1, asyncpg.DeadlockDetectedError("deadlock detected"), 1, 0]
+    )
+    service = ApplicationService(repository=repository, redis_client=AsyncMock())
+    service.dashboard_counters = AsyncMock()
+    tenant_id = uuid.uuid4()
+    row = {
+        "title": "Backend Engineer",
+        "company": "Contoso",
+        "location": "Remote",
+        "applied_date": "2026-02-24",
+    }
+
+    report = await service.bulk_import_applications(
+        tenant_id,
+        _import_rows(
+            [(1, row), (2, row), (3, {**row, "applied_date": "not-a-date"}), (4, row)]
+        ),
+        chunk_size=1,
+    )
+
+    assert (report.received, report.inserted, report.failed) == (4, 2, 2)
+    assert [error.row for error in report.errors] == [2, 3]
+    service.dashboard_counters.apply.assert_awaited_once_with(
+        tenant_id, {"status:applied": 2, "day:2026-02-24": 2}
+    )
@@ -70,7 +70,7 @@ async def test_signup_rejects_existing_email(auth_services_module):
         await service.signup(payload)
 
     assert exc.value.status_code == 409
-    redis_client.setex.assert_not_called()
+    redis_client.evalsha.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -109,14 +109,13 @@ async def test_signup_creates_user_tenant_and_refresh(
     assert len(db.added) == 3
 
     user = db.added[0]
-    redis_client.setex.assert_awaited_once_with(
+    redis_client.evalsha.assert_awaited_once_with(
+        auth_services_module.STORE_REFRESH_TOKEN_SCRIPT.sha,
+        2,
         f"refresh:{user.id}:token-id",
-        auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
-        auth_services_module.hash_token("refresh-token"),
-    )
-    redis_client.sadd.assert_awaited_once_with(f"refresh_index:{user.id}", "token-id")
-    redis_client.expire.assert_awaited_once_with(
         f"refresh_index:{user.id}",
+        auth_services_module.hash_token("refresh-token"),
+        "token-id",
         auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
     )
 
@@ -133,7 +132,7 @@ async def test_login_rejects_unknown_email(auth_services_module):
         await service.login(payload)
 
     assert exc.value.status_code == 401
-    redis_client.setex.assert_not_called()
+    redis_client.evalsha.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -151,7 +150,7 @@ async def test_login_rejects_wrong_password(auth_services_module, monkeypatch):
         await service.login(payload)
 
     assert exc.value.status_code == 401
-    redis_client.setex.assert_not_called()
+    redis_client.evalsha.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -180,18 +179,42 @@ async def test_login_returns_tokens_and_stores_refresh(
     assert response.access_token == "access-token"
     assert response.refresh_token == "refresh-token"
     assert response.token_type == "bearer"
-    redis_client.setex.assert_awaited_once_with(
+    redis_client.evalsha.assert_awaited_once_with(
+        auth_services_module.STORE_REFRESH_TOKEN_SCRIPT.sha,
+        2,
         f"refresh:{user_id}:token-id",
-        auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
-        auth_services_module.hash_token("refresh-token"),
-    )
-    redis_client.sadd.assert_awaited_once_with(f"refresh_index:{user_id}", "token-id")
-    redis_client.expire.assert_awaited_once_with(
         f"refresh_index:{user_id}",
+        auth_services_module.hash_token("refresh-token"),
+        "token-id",
         auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
     )
 
 
+@pytest.mark.asyncio
+async def test_login_returns_503_when_password_executor_is_saturated(
+    auth_services_module, monkeypatch
+):
+    user = type("UserObj", (), {"id": uuid.uuid4(), "hashed_password": "stored-hash"})()
+    db = _FakeDB(scalar_result=user)
+    redis_client = AsyncMock()
+    service = auth_services_module.AuthService(db=db, redis_client=redis_client)
+
+    monkeypatch.setattr(
+        auth_services_module.password_executor,
+        "run",
+        AsyncMock(side_effect=auth_services_module.ExecutorOverloadedError()),
+    )
+
+    payload = UserLogin(email="user@example.com", password="StrongPass123!")
+
+    with pytest.raises(auth_services_module.HTTPException) as exc:
+        await service.login(payload)
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "1"}
+    redis_client.evalsha.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_refresh_rejects_invalid_refresh_token(auth_services_module, monkeypatch):
     db = _FakeDB(scalar_result=None)
@@ -204,7 +227,7 @@ async def test_refresh_rejects_invalid_refresh_token(auth_services_module, monke
         await service.refresh(RefreshTokenRequest(refresh_token="bad-token"))
 
     assert exc.value.status_code == 401
-    redis_client.get.assert_not_called()
+    redis_client.evalsha.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -213,7 +236,7 @@ async def test_refresh_rejects_when_token_not_in_redis(
 ):
     db = _FakeDB(scalar_result=None)
     redis_client = AsyncMock()
-    redis_client.get = AsyncMock(return_value=None)
+    redis_client.evalsha = AsyncMock(return_value=0)
     redis_client.smembers = AsyncMock(return_value={"old-jti", "other-jti"})
     redis_client.delete = AsyncMock(return_value=1)
     service = auth_services_module.AuthService(db=db, redis_client=redis_client)
@@ -230,7 +253,7 @@ async def test_refresh_rejects_when_token_not_in_redis(
 
     assert exc.value.status_code == 401
     assert exc.value.detail == "Refresh token reuse detected. Please log in again."
-    redis_client.get.assert_awaited_once_with(f"refresh:{user_id}:old-jti")
+    redis_client.evalsha.assert_awaited_once()
     redis_client.smembers.assert_awaited_once_with(f"refresh_index:{user_id}")
     redis_client.delete.assert_any_await(
         f"refresh:{user_id}:old-jti", f"refresh:{user_id}:other-jti"
@@ -242,13 +265,7 @@ async def test_refresh_rejects_when_token_not_in_redis(
 async def test_refresh_rotates_tokens(auth_services_module, monkeypatch):
     db = _FakeDB(scalar_result=None)
     redis_client = AsyncMock()
-    redis_client.get = AsyncMock(
-        return_value=auth_services_module.hash_token("old-refresh-token")
-    )
-    redis_client.delete = AsyncMock(return_value=1)
-    redis_client.srem = AsyncMock(return_value=1)
-    redis_client.sadd = AsyncMock(return_value=1)
-    redis_client.expire = AsyncMock(return_value=1)
+    redis_client.evalsha = AsyncMock(return_value=1)
     service = auth_services_module.AuthService(db=db, redis_client=redis_client)
 
     user_id = str(uuid.uuid4())
@@ -273,19 +290,20 @@ async def test_refresh_rotates_tokens(auth_services_module, monkeypatch):
     assert response.access_token == "new-access"
     assert response.refresh_token == "new-refresh"
     assert response.token_type == "bearer"
-    redis_client.get.assert_awaited_once_with(f"refresh:{user_id}:old-jti")
-    redis_client.delete.assert_any_await(f"refresh:{user_id}:old-jti")
-    redis_client.srem.assert_awaited_once_with(f"refresh_index:{user_id}", "old-jti")
-    redis_client.setex.assert_awaited_once_with(
+    redis_client.evalsha.assert_awaited_once_with(
+        auth_services_module.ROTATE_REFRESH_TOKEN_SCRIPT.sha,
+        3,
+        f"refresh:{user_id}:old-jti",
+        f"refresh_index:{user_id}",
         f"refresh:{user_id}:new-jti",
-        auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
+        auth_services_module.hash_token("old-refresh-token"),
+        "old-jti",
+        "new-jti",
         auth_services_module.hash_token("new-refresh"),
-    )
-    redis_client.sadd.assert_awaited_once_with(f"refresh_index:{user_id}", "new-jti")
-    redis_client.expire.assert_awaited_once_with(
-        f"refresh_index:{user_id}",
         auth_services_module.REFRESH_EXPIRE_MINUTES * 60,
     )
+    redis_client.get.assert_not_called()
+    redis_client.smembers.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -294,7 +312,7 @@ async def test_refresh_rejects_hash_mismatch_and_revokes_all(
 ):
     db = _FakeDB(scalar_result=None)
     redis_client = AsyncMock()
-    redis_client.get = AsyncMock(return_value="unexpected-hash")
+    redis_client.evalsha = AsyncMock(return_value=-1)
     redis_client.smembers = AsyncMock(return_value={"old-jti", "newer-jti"})
     redis_client.delete = AsyncMock(return_value=1)
     service = auth_services_module.AuthService(db=db, redis_client=redis_client)
@@ -0,0 +1,55 @@
+from app.core.cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_returns_value_until_expiry():
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_seconds=5, timer=clock)
+
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used_entry():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl_seconds=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_pop_and_clear():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_ttl_cache_with_zero_ttl_stores_nothing():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_seconds=0)
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
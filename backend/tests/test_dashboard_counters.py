@@ -0,0 +1,188 @@
+import uuid
+from datetime import date
+from unittest.mock import ANY, AsyncMock, patch
+
+import pytest
+import redis.asyncio as redis
+
+from app.models.application import ApplicationStatus
+from app.services.dashboard_counters import (
+    APPLY_DELTAS_SCRIPT,
+    REFRESHED_AT_FIELD,
+    RELEASE_LOCK_SCRIPT,
+    REPLACE_COUNTERS_SCRIPT,
+    DashboardCounters,
+    application_deltas,
+    combine_deltas,
+    counts_to_fields,
+    summary_from_fields,
+)
+
+
+def test_combine_deltas_cancels_unchanged_fields():
+    before = application_deltas(ApplicationStatus.applied, date(2026, 2, 1), sign=-1)
+    after = application_deltas(ApplicationStatus.offer, date(2026, 2, 1))
+
+    assert combine_deltas(before, after) == {
+        "status:applied": -1,
+        "status:offer": 1,
+    }
+
+
+def test_counts_to_fields_includes_every_status():
+    fields = counts_to_fields({"offer": 2}, {date(2026, 2, 1): 2})
+
+    assert fields == {
+        "status:applied": 0,
+        "status:screening": 0,
+        "status:interview": 0,
+        "status:offer": 2,
+        "status:rejected": 0,
+        "day:2026-02-01": 2,
+    }
+
+
+def test_summary_from_fields_sums_day_buckets_inside_each_window():
+    today = date(2026, 3, 31)
+    fields = {
+        "status:applied": 3,
+        "status:rejected": -1,
+        "day:2026-03-31": 1,
+        "day:2026-03-25": 1,
+        "day:2026-03-24": 2,
+        "day:2026-03-02": 4,
+        "day:2026-03-01": 8,
+        "day:2026-04-01": 16,
+    }
+
+    summary = summary_from_fields(fields, today)
+
+    assert summary["applied"] == 3
+    assert summary["rejected"] == 0
+    assert summary["applied_last_7_days"] == 2
+    assert summary["applied_last_30_days"] == 8
+
+
+@pytest.mark.asyncio
+async def test_apply_runs_delta_script_with_non_zero_fields():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(return_value=1)
+    counters = DashboardCounters(redis_client)
+    tenant_id = uuid.uuid4()
+
+    applied = await counters.apply(
+        tenant_id, {"status:applied": 1, "status:offer": 0, "day:2026-02-01": 1}
+    )
+
+    assert applied is True
+    redis_client.evalsha.assert_awaited_once_with(
+        APPLY_DELTAS_SCRIPT.sha,
+        1,
+        f"dashboard:counters:{tenant_id}",
+        "status:applied",
+        1,
+        "day:2026-02-01",
+        1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_skips_empty_deltas_and_swallows_redis_errors():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(side_effect=redis.ConnectionError("down"))
+    counters = DashboardCounters(redis_client)
+
+    assert await counters.apply(uuid.uuid4(), {"status:applied": 0}) is False
+    redis_client.evalsha.assert_not_awaited()
+
+    assert await counters.apply(uuid.uuid4(), {"status:applied": 1}) is False
+
+
+@pytest.mark.asyncio
+async def test_load_returns_none_for_missing_hash_and_ints_otherwise():
+    redis_client = AsyncMock()
+    redis_client.hgetall = AsyncMock(side_effect=[{}, {"status:offer": "2"}])
+    counters = DashboardCounters(redis_client)
+
+    assert await counters.load(uuid.uuid4()) is None
+    assert await counters.load(uuid.uuid4()) == {"status:offer": 2}
+
+
+@pytest.mark.asyncio
+async def test_replace_sets_ttl_or_keeps_existing_expiry():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(side_effect=[1, 0])
+    counters = DashboardCounters(redis_client, ttl_seconds=30)
+    tenant_id = uuid.uuid4()
+    key = f"dashboard:counters:{tenant_id}"
+
+    with patch("app.services.dashboard_counters.time.time", return_value=1000.5):
+        assert await counters.replace(tenant_id, {"status:offer": 2}) is True
+        assert (
+            await counters.replace(tenant_id, {"status:offer": 2}, keep_ttl=True)
+            is False
+        )
+
+    first, second = redis_client.evalsha.await_args_list
+    stamp = (REFRESHED_AT_FIELD, 1000, "status:offer", 2)
+    assert first.args == (REPLACE_COUNTERS_SCRIPT.sha, 1, key, 30000, *stamp)
+    assert second.args == (REPLACE_COUNTERS_SCRIPT.sha, 1, key, 0, *stamp)
+
+
+def test_is_stale_compares_refresh_stamp_with_soft_ttl():
+    counters = DashboardCounters(AsyncMock(), soft_ttl_seconds=60)
+
+    assert counters.is_stale({"status:offer": 1}, now=1000)
+    assert not counters.is_stale({REFRESHED_AT_FIELD: 950}, now=1000)
+    assert counters.is_stale({REFRESHED_AT_FIELD: 940}, now=1000)
+
+
+@pytest.mark.asyncio
+async def test_refresh_lock_is_exclusive_and_released_by_owner_token():
+    redis_client = AsyncMock()
+    redis_client.set = AsyncMock(side_effect=[True, None])
+    redis_client.evalsha = AsyncMock(return_value=1)
+    counters = DashboardCounters(redis_client, lock_seconds=2.5)
+    tenant_id = uuid.uuid4()
+    lock_key = f"dashboard:refresh-lock:{tenant_id}"
+
+    token = await counters.acquire_refresh_lock(tenant_id)
+    assert token is not None
+    assert await counters.acquire_refresh_lock(tenant_id) is None
+    redis_client.set.assert_awaited_with(lock_key, ANY, nx=True, px=2500)
+
+    await counters.release_refresh_lock(tenant_id, token)
+    redis_client.evalsha.assert_awaited_once_with(
+        RELEASE_LOCK_SCRIPT.sha, 1, lock_key, token
+    )
+
+
+@pytest.mark.asyncio
+async def test_wait_for_returns_published_fields_or_gives_up_without_lock():
+    redis_client = AsyncMock()
+    redis_client.hgetall = AsyncMock(side_effect=[{}, {"status:offer": "1"}])
+    redis_client.exists = AsyncMock(return_value=1)
+    counters = DashboardCounters(redis_client)
+
+    with patch("app.services.dashboard_counters.REFRESH_POLL_INTERVAL_SECONDS", 0):
+        assert await counters.wait_for(uuid.uuid4()) == {"status:offer": 1}
+
+        redis_client.hgetall = AsyncMock(return_value={})
+        redis_client.exists = AsyncMock(return_value=0)
+        assert await counters.wait_for(uuid.uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_tenant_ids_skips_malformed_keys():
+    tenant_id = uuid.uuid4()
+
+    async def _scan_iter(match: str):
+        assert match == "dashboard:counters:*"
+        for key in (f"dashboard:counters:{tenant_id}", "dashboard:counters:junk"):
+            yield key
+
+    redis_client = AsyncMock()
+    redis_client.scan_iter = _scan_iter
+    counters = DashboardCounters(redis_client)
+
+    assert [found async for found in counters.tenant_ids()] == [tenant_id]
@@ -0,0 +1,115 @@
+import asyncio
+import os
+
+import asyncpg
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.db.engine import (
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_SATURATION,
+    DB_POOL_STALE_CONNECTIONS,
+    DB_POOL_TIMEOUTS,
+    EngineSettings,
+    InstrumentedAsyncPool,
+    create_engine_from_settings,
+)
+
+
+def test_engine_settings_read_prefixed_env(monkeypatch):
+    monkeypatch.setenv("REPLICA_POOL_SIZE", "4")
+    monkeypatch.setenv("REPLICA_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("REPLICA_PRE_PING", "Always")
+    monkeypatch.setenv("REPLICA_PGBOUNCER", "true")
+
+    settings = EngineSettings.from_env("postgresql+asyncpg://db/app", prefix="REPLICA")
+
+    assert (settings.pool_size, settings.max_overflow) == (4, 0)
+    assert settings.pool_timeout_seconds == 10.0
+    kwargs = settings.engine_kwargs()
+    assert kwargs["poolclass"] is InstrumentedAsyncPool
+    assert kwargs["pool_pre_ping"] is True
+    connect_args = kwargs["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name_func = connect_args["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+
+def test_engine_settings_cache_statements_without_pgbouncer():
+    settings = EngineSettings(url="postgresql+asyncpg://db/app", pre_ping="never")
+
+    kwargs = settings.engine_kwargs()
+
+    assert kwargs["pool_pre_ping"] is False
+    assert kwargs["connect_args"] == {"prepared_statement_cache_size": 500}
+    with pytest.raises(ValueError, match="pre_ping"):
+        EngineSettings(url="postgresql+asyncpg://db/app", pre_ping="sometimes")
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_wait_saturation_and_timeouts():
+    settings = EngineSettings(
+        url=os.environ["TEST_DATABASE_URL"],
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout_seconds=0.05,
+    )
+    engine = create_engine_from_settings(settings, name="test_bounded")
+    waits_before = DB_POOL_CHECKOUT_WAIT_SECONDS.sample(pool="test_bounded")
+    timeouts_before = DB_POOL_TIMEOUTS.value(pool="test_bounded")
+
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert DB_POOL_SATURATION.value(pool="test_bounded") == 1.0
+            with pytest.raises(Exception, match="QueuePool limit"):
+                async with engine.connect():
+                    pass
+        assert DB_POOL_SATURATION.value(pool="test_bounded") == 0.0
+    finally:
+        await engine.dispose()
+
+    assert waits_before is None
+    waits = DB_POOL_CHECKOUT_WAIT_SECONDS.sample(pool="test_bounded")
+    assert waits is not None and waits.count == 2
+    assert waits.sum >= 0.05
+    assert DB_POOL_TIMEOUTS.value(pool="test_bounded") == timeouts_before + 1
+
+
+@pytest.mark.asyncio
+async def test_idle_pre_ping_replaces_dead_connections():
+    settings = EngineSettings(
+        url=os.environ["TEST_DATABASE_URL"],
+        pool_size=1,
+        max_overflow=0,
+        pre_ping="idle",
+        pre_ping_idle_seconds=0.01,
+    )
+    engine = create_engine_from_settings(settings, name="test_idle_ping")
+    stale_before = DB_POOL_STALE_CONNECTIONS.value(pool="test_idle_ping")
+
+    try:
+        async with engine.connect() as connection:
+            first_pid = (
+                await connection.execute(text("SELECT pg_backend_pid()"))
+            ).scalar()
+        admin = await asyncpg.connect(
+            make_url(settings.url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        await admin.execute("SELECT pg_terminate_backend($1)", first_pid)
+        await admin.close()
+        await asyncio.sleep(0.02)
+
+        async with engine.connect() as connection:
+            second_pid = (
+                await connection.execute(text("SELECT pg_backend_pid()"))
+            ).scalar()
+    finally:
+        await engine.dispose()
+
+    assert second_pid != first_pid
+    assert DB_POOL_STALE_CONNECTIONS.value(pool="test_idle_ping") == stale_before + 1
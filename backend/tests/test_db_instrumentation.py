@@ -0,0 +1,284 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+import app.db.instrumentation as instrumentation_module
+from app.api.deps import get_current_user
+from app.core.metrics_multiprocess import metrics_collector
+from app.core.tracing import InMemorySpanExporter, Tracer
+from app.db.engine import (
+    CHECKOUT_WAIT_INFO_KEY,
+    EngineSettings,
+    create_engine_from_settings,
+)
+from app.db.instrumentation import (
+    DB_N_PLUS_ONE_REQUESTS,
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_DURATION_SECONDS,
+    DB_QUERY_POOL_WAIT_SECONDS,
+    DB_QUERY_ROWS,
+    OTHER_FINGERPRINT,
+    QueryInstrumentation,
+    normalize_statement,
+)
+from app.main import app as main_app
+from app.middleware.request_id import RequestIDMiddleware
+
+
+class _FakeConn:
+    def __init__(self):
+        self.info: dict[str, float] = {}
+
+
+def _run(instrumentation, statement, rowcount=1, conn=None):
+    conn = conn or _FakeConn()
+    cursor = SimpleNamespace(rowcount=rowcount)
+    instrumentation.before_cursor_execute(conn, cursor, statement, None, None, False)
+    instrumentation.after_cursor_execute(conn, cursor, statement, None, None, False)
+
+
+def test_normalize_statement_collapses_literals_and_value_lists():
+    first = normalize_statement(
+        "SELECT * FROM reminders\n WHERE id IN ($1, $2, $3) AND message = 'hi'"
+    )
+    second = normalize_statement("SELECT * FROM reminders WHERE id IN ($1) AND 1=2")
+
+    assert first == "SELECT * FROM reminders WHERE id IN (?, ...) AND message = ?"
+    assert second == "SELECT * FROM reminders WHERE id IN (?) AND ?=?"
+    assert normalize_statement("SELECT anon_1.col2 FROM t1 LIMIT $4") == (
+        "SELECT anon_1.col2 FROM t1 LIMIT ?"
+    )
+
+
+def test_before_cursor_execute_sets_start_time(monkeypatch):
+    conn = _FakeConn()
+    monkeypatch.setattr(instrumentation_module.time, "perf_counter", lambda: 123.45)
+
+    QueryInstrumentation().before_cursor_execute(
+        conn, None, "SELECT 1", None, None, False
+    )
+
+    assert conn.info["query_start_time"] == 123.45
+
+
+def test_after_cursor_execute_skips_when_start_time_missing(monkeypatch):
+    warning_mock = Mock()
+    monkeypatch.setattr(instrumentation_module.logger, "warning", warning_mock)
+
+    QueryInstrumentation().after_cursor_execute(
+        _FakeConn(), None, "SELECT 1", None, None, False
+    )
+
+    warning_mock.assert_not_called()
+
+
+def test_after_cursor_execute_logs_slow_query_over_configured_threshold(monkeypatch):
+    instrumentation = QueryInstrumentation(slow_query_threshold_seconds=0.5)
+    conn = _FakeConn()
+    conn.info["query_start_time"] = 10.0
+    monkeypatch.setattr(instrumentation_module.time, "perf_counter", lambda: 10.6)
+    warning_mock = Mock()
+    monkeypatch.setattr(instrumentation_module.logger, "warning", warning_mock)
+
+    instrumentation.after_cursor_execute(conn, None, "SELECT 1", None, None, False)
+
+    warning_mock.assert_called_once()
+    args, kwargs = warning_mock.call_args
+    assert args[0] == "Slow query detected"
+    assert kwargs["extra"]["query"] == "SELECT 1"
+    assert kwargs["extra"]["threshold_ms"] == 500
+    assert kwargs["extra"]["duration_ms"] > kwargs["extra"]["threshold_ms"]
+    assert "query_start_time" not in conn.info
+
+
+def test_statement_histograms_record_rows_and_pool_wait():
+    instrumentation = QueryInstrumentation()
+    statement = "SELECT id FROM histogram_probe WHERE tenant_id = $1"
+    fingerprint = instrumentation.fingerprint(statement)
+    before = DB_QUERY_DURATION_SECONDS.sample(fingerprint=fingerprint)
+    calls = before.count if before else 0
+    conn = _FakeConn()
+    conn.info[CHECKOUT_WAIT_INFO_KEY] = 0.02
+
+    _run(instrumentation, statement, rowcount=7, conn=conn)
+    _run(instrumentation, statement, rowcount=-1, conn=conn)
+
+    sample = DB_QUERY_DURATION_SECONDS.sample(fingerprint=fingerprint)
+    assert sample is not None and sample.count == calls + 2
+    rows = DB_QUERY_ROWS.sample(fingerprint=fingerprint)
+    assert rows is not None and rows.sum >= 7
+    # Only the first statement after checkout pays the pool wait.
+    wait = DB_QUERY_POOL_WAIT_SECONDS.sample(fingerprint=fingerprint)
+    assert wait is not None and wait.count == 1
+    assert CHECKOUT_WAIT_INFO_KEY not in conn.info
+
+    [stats] = [
+        row for row in instrumentation.summary() if row["fingerprint"] == fingerprint
+    ]
+    assert stats["statement"] == "SELECT id FROM histogram_probe WHERE tenant_id = ?"
+    assert stats["calls"] == calls + 2
+    assert stats["p50_seconds"] is not None
+    assert stats["p95_pool_wait_seconds"] is not None
+
+
+def test_sampling_skips_histograms_but_still_counts_request_queries():
+    instrumentation = QueryInstrumentation(sample_rate=0)
+    statement = "SELECT id FROM unsampled_probe"
+    fingerprint = instrumentation.fingerprint(statement)
+
+    token = instrumentation.start_request("request-1")
+    _run(instrumentation, statement)
+    queries = instrumentation.finish_request(token)
+
+    assert DB_QUERY_DURATION_SECONDS.sample(fingerprint=fingerprint) is None
+    assert queries is not None
+    assert queries.request_id == "request-1"
+    assert queries.by_fingerprint[fingerprint] == 1
+
+
+def test_fingerprints_past_the_limit_share_one_label():
+    instrumentation = QueryInstrumentation(max_fingerprints=1)
+
+    first = instrumentation.fingerprint("SELECT 1 FROM first_table")
+
+    assert first != OTHER_FINGERPRINT
+    assert instrumentation.fingerprint("SELECT 1 FROM second_table") == (
+        OTHER_FINGERPRINT
+    )
+    assert list(instrumentation.statements) == [first]
+
+
+def test_finish_request_flags_repeated_statements_as_n_plus_one(monkeypatch):
+    instrumentation = QueryInstrumentation(n_plus_one_threshold=3)
+    warning_mock = Mock()
+    monkeypatch.setattr(instrumentation_module.logger, "warning", warning_mock)
+    repeated = "SELECT * FROM reminders WHERE application_id = $1"
+    fingerprint = instrumentation.fingerprint(repeated)
+    flagged = DB_N_PLUS_ONE_REQUESTS.value(fingerprint=fingerprint)
+    per_request = DB_QUERIES_PER_REQUEST.sample()
+    observed = per_request.count if per_request else 0
+
+    token = instrumentation.start_request("request-2")
+    _run(instrumentation, "SELECT * FROM applications WHERE tenant_id = $1")
+    for _ in range(3):
+        _run(instrumentation, repeated)
+    queries = instrumentation.finish_request(token)
+
+    assert queries is not None and queries.count == 4
+    assert DB_N_PLUS_ONE_REQUESTS.value(fingerprint=fingerprint) == flagged + 1
+    warning_mock.assert_called_once()
+    args, kwargs = warning_mock.call_args
+    assert args[0] == "Possible N+1 query"
+    assert kwargs["extra"]["repeats"] == 3
+    assert kwargs["extra"]["query"] == normalize_statement(repeated)
+    sample = DB_QUERIES_PER_REQUEST.sample()
+    assert sample is not None and sample.count == observed + 1
+
+
+def test_request_id_middleware_counts_queries_per_request(monkeypatch):
+    instrumentation = QueryInstrumentation()
+    monkeypatch.setattr(
+        "app.middleware.request_id.query_instrumentation", instrumentation
+    )
+    finished = []
+    original_finish = instrumentation.finish_request
+
+    def _finish(token):
+        queries = original_finish(token)
+        finished.append(queries)
+        return queries
+
+    monkeypatch.setattr(instrumentation, "finish_request", _finish)
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)  # type: ignore[call-arg,arg-type]
+
+    @app.get("/queries")
+    async def run_queries():
+        _run(instrumentation, "SELECT 1 FROM middleware_probe")
+        _run(instrumentation, "SELECT 2 FROM middleware_probe")
+        return {}
+
+    response = TestClient(app).get("/queries")
+
+    [queries] = finished
+    assert queries.request_id == response.headers["X-Request-ID"]
+    assert queries.count == 2
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_records_statements_and_pool_wait():
+    instrumentation = QueryInstrumentation()
+    engine = create_engine_from_settings(
+        EngineSettings(url=os.environ["TEST_DATABASE_URL"]), name="instrumented"
+    )
+    instrumentation.instrument(engine)
+    statement = "SELECT generate_series(1, 3) AS instrumented_probe"
+    fingerprint = instrumentation.fingerprint(statement)
+    before = DB_QUERY_POOL_WAIT_SECONDS.sample(fingerprint=fingerprint)
+    waits = before.count if before else 0
+
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+    rows = DB_QUERY_ROWS.sample(fingerprint=fingerprint)
+    assert rows is not None and rows.sum >= 3
+    wait = DB_QUERY_POOL_WAIT_SECONDS.sample(fingerprint=fingerprint)
+    assert wait is not None and wait.count == waits + 1
+
+
+def test_metrics_endpoints_expose_registry_and_query_summary():
+    client = TestClient(main_app)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_query_duration_seconds histogram" in response.text
+
+    assert client.get("/metrics/queries").status_code == 401
+
+    main_app.dependency_overrides[get_current_user] = lambda: object()
+    try:
+        queries = client.get("/metrics/queries", params={"limit": 5})
+    finally:
+        main_app.dependency_overrides.pop(get_current_user)
+    assert queries.status_code == 200
+    assert queries.headers["X-Metrics-Process"] == metrics_collector.process_id
+    assert isinstance(queries.json(), list)
+    assert len(queries.json()) <= 5
+
+
+def test_statements_get_spans_inside_a_trace(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+    monkeypatch.setattr(instrumentation_module, "tracer", tracer)
+    instrumentation = QueryInstrumentation()
+    conn = _FakeConn()
+
+    _run(instrumentation, "SELECT 1 FROM untraced_probe", conn=conn)
+    with tracer.span("request"):
+        _run(instrumentation, "SELECT id FROM traced_probe WHERE id = $1", 3, conn)
+        instrumentation.before_cursor_execute(
+            conn, None, "UPDATE traced_probe SET x = 1", None, None, False
+        )
+        instrumentation.handle_error(
+            SimpleNamespace(connection=conn, original_exception=ValueError("bad"))
+        )
+    tracer.flush()
+
+    select, update, _request = exporter.spans
+    assert select.name == "sql SELECT"
+    assert select.attributes["db.statement"] == (
+        "SELECT id FROM traced_probe WHERE id = ?"
+    )
+    assert select.attributes["db.rows"] == 3
+    assert update.status == "error"
+    assert update.attributes["exception.type"] == "ValueError"
+    assert conn.info == {}
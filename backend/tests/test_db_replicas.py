@@ -0,0 +1,253 @@
+import math
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.replicas import (
+    DB_READ_ROUTES,
+    DB_REPLICA_CHECK_FAILURES,
+    REPLICA_INFO_KEY,
+    REPLICA_LAG_QUERY,
+    Replica,
+    ReplicaRouter,
+    replica_name,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, tuple[str, int]] = {}
+
+    async def set(self, key: str, value: str, px: int) -> None:
+        self.store[key] = (value, px)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.store)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(method: str, tenant_id: uuid.UUID | None = None):
+    headers = {} if tenant_id is None else {"X-Tenant-ID": str(tenant_id)}
+    return SimpleNamespace(method=method, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_router_without_replicas_always_uses_primary():
+    router = ReplicaRouter()
+
+    assert not router.enabled
+    assert await router.choose("tenant") is None
+    await router.pin("tenant")
+    assert not await router.is_pinned("tenant")
+
+
+@pytest.mark.asyncio
+async def test_router_routes_to_caught_up_replica_and_rechecks_on_interval(
+    test_engine,
+):
+    clock = _Clock()
+    replica = Replica("replica-test", test_engine)
+    router = ReplicaRouter([replica], check_interval_seconds=5, timer=clock)
+    before = DB_READ_ROUTES.value(target="replica-test", reason="fresh")
+
+    assert await router.choose() is replica
+    # Postgres that is not in recovery reports no lag.
+    assert replica.lag_seconds == 0
+    assert replica.checked_at == 100.0
+
+    clock.now += 1
+    replica.lag_seconds = 30
+    assert await router.choose() is None
+
+    clock.now += 5
+    assert await router.choose() is replica
+    assert DB_READ_ROUTES.value(target="replica-test", reason="fresh") == before + 2
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_primary_when_replica_is_unreachable():
+    engine = create_async_engine(
+        "postgresql+asyncpg://postgres@127.0.0.1:1/app", echo=False
+    )
+    replica = Replica("replica-down", engine)
+    router = ReplicaRouter([replica], check_timeout_seconds=2)
+    failures = DB_REPLICA_CHECK_FAILURES.value(replica="replica-down")
+    lagging = DB_READ_ROUTES.value(target="primary", reason="lagging")
+
+    try:
+        assert await router.choose() is None
+    finally:
+        await engine.dispose()
+
+    assert replica.lag_seconds == math.inf
+    assert DB_REPLICA_CHECK_FAILURES.value(replica="replica-down") == failures + 1
+    assert DB_READ_ROUTES.value(target="primary", reason="lagging") == lagging + 1
+
+
+@pytest.mark.asyncio
+async def test_pins_expire_locally_and_are_shared_through_redis():
+    clock = _Clock()
+    replica = Replica("replica-pin", AsyncMock())
+    replica.lag_seconds = 0
+    replica.checked_at = clock.now
+    router = ReplicaRouter(
+        [replica],
+        check_interval_seconds=math.inf,
+        read_your_writes_seconds=10,
+        timer=clock,
+    )
+    fake_redis = _FakeRedis()
+    router.configure(fake_redis)
+
+    await router.pin("tenant-a")
+
+    assert fake_redis.store["db:read_pin:tenant-a"] == ("1", 10000)
+    assert await router.choose("tenant-a") is None
+    assert await router.choose("tenant-b") is replica
+
+    clock.now += 11
+    fake_redis.store.clear()
+    assert await router.choose("tenant-a") is replica
+
+    # Another worker's pin is honoured through Redis.
+    fake_redis.store["db:read_pin:tenant-b"] = ("1", 10000)
+    assert await router.is_pinned("tenant-b")
+
+
+@pytest.fixture
+def routed_deps(monkeypatch):
+    from app.api import deps
+
+    replica = Replica("replica-deps", AsyncMock())
+    replica.lag_seconds = 0
+    replica.checked_at = math.inf
+    router = ReplicaRouter([replica])
+    monkeypatch.setattr(deps, "replica_router", router)
+    return deps, router, replica
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_uses_replica_for_reads_and_pins_after_writes(
+    routed_deps,
+):
+    deps, router, replica = routed_deps
+    primary = object()
+    tenant_id = uuid.uuid4()
+
+    reads = deps.get_read_db(_request("GET", tenant_id), db=primary)
+    session = await reads.__anext__()
+    assert replica_name(session) == "replica-deps"
+    assert session.info[REPLICA_INFO_KEY] == "replica-deps"
+    await reads.aclose()
+
+    writes = deps.get_read_db(_request("PATCH", tenant_id), db=primary)
+    assert await writes.__anext__() is primary
+    with pytest.raises(StopAsyncIteration):
+        await writes.__anext__()
+    assert await router.is_pinned(str(tenant_id))
+
+    pinned = deps.get_read_db(_request("GET", tenant_id), db=primary)
+    assert await pinned.__anext__() is primary
+    await pinned.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_does_not_pin_after_failed_writes(routed_deps):
+    deps, router, _ = routed_deps
+    tenant_id = uuid.uuid4()
+
+    writes = deps.get_read_db(_request("POST", tenant_id), db=object())
+    await writes.__anext__()
+    with pytest.raises(ValueError):
+        await writes.athrow(ValueError("invalid"))
+
+    assert not await router.is_pinned(str(tenant_id))
+
+
+def test_get_read_db_pins_before_the_response_is_sent(routed_deps):
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    deps, router, _ = routed_deps
+    tenant_id = uuid.uuid4()
+    pinned_at_send = []
+
+    async def _primary():
+        yield object()
+
+    app = FastAPI()
+    app.dependency_overrides[deps.get_db] = _primary
+
+    @app.post("/write")
+    async def write(db=Depends(deps.get_read_db, scope="function")):
+        return None
+
+    @app.middleware("http")
+    async def record_pin(request, call_next):
+        response = await call_next(request)
+        pinned_at_send.append(await router.is_pinned(str(tenant_id)))
+        return response
+
+    TestClient(app).post("/write", headers={"X-Tenant-ID": str(tenant_id)})
+
+    assert pinned_at_send == [True]
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_marks_replica_unavailable_on_connection_error(
+    routed_deps,
+):
+    deps, router, replica = routed_deps
+
+    reads = deps.get_read_db(_request("GET"), db=object())
+    await reads.__anext__()
+    with pytest.raises(exc.OperationalError):
+        await reads.athrow(exc.OperationalError("SELECT 1", {}, OSError("gone")))
+
+    assert replica.lag_seconds == math.inf
+    assert await router.choose() is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_tenant_retries_replica_miss_on_primary(
+    monkeypatch, routed_deps
+):
+    deps, _, _ = routed_deps
+    deps.principal_cache.clear_local()
+    tenant_id = uuid.uuid4()
+    tenant = SimpleNamespace(id=tenant_id, name="Workspace", created_at=None)
+    replica_session = AsyncMock(info={REPLICA_INFO_KEY: "replica-deps"})
+    replica_session.scalar = AsyncMock(return_value=None)
+    primary_session = AsyncMock()
+    primary_session.scalar = AsyncMock(return_value=tenant)
+    primary_session.__aenter__.return_value = primary_session
+    monkeypatch.setattr(deps, "AsyncSessionLocal", lambda: primary_session)
+    monkeypatch.setattr(deps.principal_cache, "set_tenant", AsyncMock())
+
+    found = await deps.get_current_tenant(
+        current_user=SimpleNamespace(id=uuid.uuid4()),
+        db=replica_session,
+        tenant_id=tenant_id,
+    )
+
+    assert found is tenant
+    replica_session.scalar.assert_awaited_once()
+    primary_session.scalar.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replica_lag_query_runs_on_primary(test_engine):
+    async with test_engine.connect() as connection:
+        assert await connection.scalar(REPLICA_LAG_QUERY) == 0
+        assert await connection.scalar(text("SELECT pg_is_in_recovery()")) is False
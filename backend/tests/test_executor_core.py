@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.executor import (
+    EXECUTOR_IN_FLIGHT,
+    EXECUTOR_REJECTIONS,
+    EXECUTOR_SATURATION,
+    BoundedExecutor,
+    ExecutorOverloadedError,
+)
+
+
+@pytest.mark.asyncio
+async def test_run_executes_off_the_event_loop_thread():
+    executor = BoundedExecutor("test_offload", max_workers=1, max_queue=0)
+
+    thread_id = await executor.run(threading.get_ident)
+
+    assert thread_id != threading.get_ident()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_work_beyond_workers_plus_queue():
+    executor = BoundedExecutor("test_bounded", max_workers=1, max_queue=1)
+    release = threading.Event()
+    rejections_before = EXECUTOR_REJECTIONS.value(executor="test_bounded")
+
+    first = asyncio.create_task(executor.run(release.wait))
+    second = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0)
+
+    assert executor.in_flight == 2
+    assert EXECUTOR_IN_FLIGHT.value(executor="test_bounded") == 2
+    assert EXECUTOR_SATURATION.value(executor="test_bounded") == 1.0
+
+    with pytest.raises(ExecutorOverloadedError):
+        await executor.run(release.wait)
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert executor.in_flight == 0
+    assert EXECUTOR_SATURATION.value(executor="test_bounded") == 0.0
+    assert EXECUTOR_REJECTIONS.value(executor="test_bounded") == (rejections_before + 1)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_exceptions_and_releases_slot():
+    executor = BoundedExecutor("test_errors", max_workers=1, max_queue=0)
+
+    def _fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await executor.run(_fail)
+
+    assert executor.in_flight == 0
+    executor.shutdown()
@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import redis.asyncio as redis
+
+from app.core.leader import (
+    ACQUIRE_LEASE_SCRIPT,
+    LEADER_LEASE_HELD,
+    RELEASE_LEASE_SCRIPT,
+    LeaderLease,
+)
+
+
+@pytest.mark.asyncio
+async def test_acquire_takes_or_renews_lease_with_owner_token():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(side_effect=[1, 0])
+    lease = LeaderLease(redis_client, "jobs", ttl_seconds=2.5)
+
+    assert await lease.acquire() is True
+    redis_client.evalsha.assert_awaited_with(
+        ACQUIRE_LEASE_SCRIPT.sha, 1, "leader:jobs", lease.token, 2500
+    )
+    assert LEADER_LEASE_HELD.value(name="jobs") == 1
+
+    assert await lease.acquire() is False
+    assert lease.is_leader is False
+    assert LEADER_LEASE_HELD.value(name="jobs") == 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_treats_redis_errors_as_not_leader():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(side_effect=redis.ConnectionError("down"))
+    lease = LeaderLease(redis_client, "jobs", ttl_seconds=1)
+
+    assert await lease.acquire() is False
+
+
+@pytest.mark.asyncio
+async def test_release_only_runs_for_the_current_leader():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(return_value=1)
+    lease = LeaderLease(redis_client, "jobs", ttl_seconds=1)
+
+    await lease.release()
+    redis_client.evalsha.assert_not_awaited()
+
+    await lease.acquire()
+    await lease.release()
+    redis_client.evalsha.assert_awaited_with(
+        RELEASE_LEASE_SCRIPT.sha, 1, "leader:jobs", lease.token
+    )
+    assert lease.is_leader is False
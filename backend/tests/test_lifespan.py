@@ -10,25 +10,78 @@ import app.main as main_module
 async def test_lifespan_disposes_engine(monkeypatch):
     dispose_mock = AsyncMock()
     fake_engine = SimpleNamespace(dispose=dispose_mock)
-    fake_redis_client = AsyncMock()
+    fake_redis_pool = Mock(connection_kwargs={}, disconnect=AsyncMock())
     fake_scheduler = SimpleNamespace(
         add_job=Mock(),
+        add_listener=Mock(),
         start=Mock(),
         shutdown=Mock(),
     )
 
     monkeypatch.setattr(main_module, "engine", fake_engine)
-    monkeypatch.setattr(
-        main_module.redis, "from_url", lambda *args, **kwargs: fake_redis_client
-    )
-    monkeypatch.setattr(main_module.FastAPILimiter, "init", AsyncMock())
-    monkeypatch.setattr(main_module.FastAPILimiter, "close", AsyncMock())
+    monkeypatch.setattr(main_module, "create_redis_pool", lambda: fake_redis_pool)
     monkeypatch.setattr(main_module, "AsyncIOScheduler", lambda: fake_scheduler)
 
-    async with main_module.lifespan(None):
-        pass
+    fake_app = SimpleNamespace(state=SimpleNamespace())
+
+    async with main_module.lifespan(fake_app):
+        assert fake_app.state.redis_pool is fake_redis_pool
+        assert main_module.rate_limiter.redis_client is not None
 
-    assert fake_scheduler.add_job.call_count == 2
+    assert main_module.rate_limiter.redis_client is None
+
+    assert fake_scheduler.add_job.call_count == 5
+    fake_scheduler.add_listener.assert_called_once()
     fake_scheduler.start.assert_called_once()
     fake_scheduler.shutdown.assert_called_once_with(wait=False)
     dispose_mock.assert_awaited_once()
+    fake_redis_pool.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_skips_reminder_jobs_when_scheduler_disabled(monkeypatch):
+    fake_redis_pool = Mock(connection_kwargs={}, disconnect=AsyncMock())
+    fake_scheduler = SimpleNamespace(
+        add_job=Mock(), add_listener=Mock(), start=Mock(), shutdown=Mock()
+    )
+
+    monkeypatch.setenv("REMINDER_SCHEDULER_ENABLED", "false")
+    monkeypatch.setattr(main_module, "engine", SimpleNamespace(dispose=AsyncMock()))
+    monkeypatch.setattr(main_module, "create_redis_pool", lambda: fake_redis_pool)
+    monkeypatch.setattr(main_module, "AsyncIOScheduler", lambda: fake_scheduler)
+
+    async with main_module.lifespan(SimpleNamespace(state=SimpleNamespace())):
+        pass
+
+    fake_scheduler.add_job.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_tenant_wide_jobs_only_on_the_leader(monkeypatch):
+    fake_redis_pool = Mock(connection_kwargs={}, disconnect=AsyncMock())
+    fake_scheduler = SimpleNamespace(
+        add_job=Mock(), add_listener=Mock(), start=Mock(), shutdown=Mock()
+    )
+    reconcile = AsyncMock(return_value=0)
+
+    monkeypatch.setattr(main_module, "engine", SimpleNamespace(dispose=AsyncMock()))
+    monkeypatch.setattr(main_module, "create_redis_pool", lambda: fake_redis_pool)
+    monkeypatch.setattr(main_module, "AsyncIOScheduler", lambda: fake_scheduler)
+    monkeypatch.setattr(
+        main_module.ApplicationService, "reconcile_dashboard_counters", reconcile
+    )
+
+    async with main_module.lifespan(SimpleNamespace(state=SimpleNamespace())):
+        jobs = {
+            call.kwargs["id"]: call.args[0]
+            for call in fake_scheduler.add_job.call_args_list
+        }
+        lease = jobs["renew_scheduler_lease"].__self__
+
+        await jobs["reconcile_dashboard_counters"]()
+        reconcile.assert_not_awaited()
+
+        lease.is_leader = True
+        await jobs["reconcile_dashboard_counters"]()
+        reconcile.assert_awaited_once()
+        lease.is_leader = False
@@ -1,7 +1,23 @@
+import io
 import json
 import logging
+import queue
+from datetime import UTC, datetime
 
-from app.core.logging import JsonFormatter, RequestIDFilter, _request_id_var
+import pytest
+
+from app.core.logging import (
+    LOG_RECORDS_DROPPED,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIDFilter,
+    SamplingFilter,
+    _request_id_var,
+    get_serializer,
+    parse_sample_rates,
+    setup_logging,
+    shutdown_logging,
+)
 
 
 def test_request_id_filter_injects_context_request_id():
@@ -41,3 +57,91 @@ def test_json_formatter_includes_request_id_and_extra_fields():
     assert payload["method"] == "GET"
     assert payload["path"] == "/health"
     assert payload["duration_ms"] == 12.5
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "Request started", (), None)
+
+
+def test_sampling_filter_keeps_or_drops_a_request_consistently():
+    sampling = SamplingFilter({"app.middleware": 0.5, "app.middleware.quiet": 0.0})
+    kept = 0
+    for index in range(200):
+        token = _request_id_var.set(f"req-{index}")
+        try:
+            first = sampling.filter(_record("app.middleware.request_id"))
+            second = sampling.filter(_record("app.middleware.request_id"))
+        finally:
+            _request_id_var.reset(token)
+        assert first == second
+        kept += first
+
+    assert 50 < kept < 150
+    assert sampling.filter(_record("app.services.reminder_service"))
+    # The most specific prefix wins, and warnings are never sampled.
+    assert not sampling.filter(_record("app.middleware.quiet"))
+    assert sampling.filter(_record("app.middleware.quiet", logging.WARNING))
+
+
+def test_parse_sample_rates_clamps_and_skips_blank_items():
+    assert parse_sample_rates("app.middleware.request_id=0.1, ,noisy=2") == {
+        "app.middleware.request_id": 0.1,
+        "noisy": 1.0,
+    }
+
+
+def test_get_serializer_selects_backend():
+    payload = {"message": "hi", "when": datetime(2026, 1, 1, tzinfo=UTC)}
+
+    assert json.loads(get_serializer("json")(payload))["when"].startswith("2026")
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
+
+    orjson = pytest.importorskip("orjson")
+    fast = get_serializer("auto")
+    assert json.loads(fast(payload))["message"] == "hi"
+    assert fast is not get_serializer("json")
+    assert orjson is not None
+
+
+def test_queued_logging_formats_on_listener_thread(restore_root_logger):
+    stream = io.StringIO()
+    setup_logging(use_queue=True, serializer=get_serializer("json"), stream=stream)
+    token = _request_id_var.set("req-queued")
+    try:
+        logging.getLogger("app.test").info("Hello %s", "queue", extra={"n": 1})
+        try:
+            raise RuntimeError("queued failure")
+        except RuntimeError:
+            logging.getLogger("app.test").exception("Failed")
+    finally:
+        _request_id_var.reset(token)
+    shutdown_logging()
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Hello queue"
+    assert first["request_id"] == "req-queued"
+    assert first["n"] == 1
+    assert second["request_id"] == "req-queued"
+    assert "RuntimeError: queued failure" in second["exception"]
+
+
+def test_queue_handler_drops_records_when_full():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    dropped = LOG_RECORDS_DROPPED.value(reason="queue_full")
+
+    handler.handle(_record("app.test"))
+    handler.handle(_record("app.test"))
+
+    assert handler.queue.qsize() == 1
+    assert LOG_RECORDS_DROPPED.value(reason="queue_full") == dropped + 1
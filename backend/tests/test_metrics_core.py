@@ -0,0 +1,183 @@
+import pytest
+
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    merge_snapshots,
+    render_text,
+    snapshot_metrics,
+)
+
+
+def test_counter_increments_per_label_set():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", labelnames=("route",))
+
+    counter.inc(route="/a")
+    counter.inc(2, route="/a")
+    counter.inc(route="/b")
+
+    assert counter.value(route="/a") == 3
+    assert counter.value(route="/b") == 1
+    assert counter.value(route="/c") == 0
+
+
+def test_counter_rejects_negative_increments_and_wrong_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("errors_total", "Errors", labelnames=("kind",))
+
+    with pytest.raises(ValueError):
+        counter.inc(-1, kind="x")
+
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+
+
+def test_gauge_set_inc_and_dec():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("in_flight", "In flight")
+
+    gauge.set(5)
+    gauge.inc()
+    gauge.dec(3)
+
+    assert gauge.value() == 3
+
+
+def test_histogram_tracks_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    sample = histogram.sample()
+    assert sample is not None
+    assert sample.bucket_counts == [1, 2]
+    assert sample.count == 3
+    assert sample.sum == pytest.approx(5.55)
+
+
+def test_histogram_quantile_interpolates_within_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("query_seconds", "Query", buckets=(0.1, 0.2, 1.0))
+
+    assert histogram.quantile(0.5) is None
+    for value in (0.05, 0.05, 0.15, 0.15, 0.5, 0.5, 0.5, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.2) == pytest.approx(0.1)
+    assert histogram.quantile(0.5) == pytest.approx(0.2 + 0.8 * (1 / 5))
+    # Values past the last bucket are reported as its upper bound.
+    assert histogram.quantile(0.99) == 1.0
+
+
+def test_histogram_time_context_manager_observes_duration():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("job_seconds", "Job", labelnames=("job",))
+
+    with histogram.time(job="sync"):
+        pass
+
+    sample = histogram.sample(job="sync")
+    assert sample is not None
+    assert sample.count == 1
+
+
+def test_registry_returns_existing_metric_and_rejects_kind_conflicts():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests")
+
+    assert registry.counter("requests_total", "Requests") is counter
+    assert registry.get("requests_total") is counter
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests")
+
+
+def test_registry_reset_clears_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("resets_total", "Resets")
+    counter.inc()
+
+    registry.reset()
+
+    assert counter.value() == 0
+
+
+def test_render_text_uses_prometheus_exposition_format():
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits", labelnames=("path",)).inc(path='/a"b')
+    registry.gauge("in_flight", "In flight").set(2)
+    histogram = registry.histogram("wait_seconds", "Wait", buckets=(0.1, 1.0))
+    histogram.observe(0.5)
+
+    lines = render_text(registry.metrics()).splitlines()
+
+    assert lines[:3] == [
+        "# HELP hits_total Hits",
+        "# TYPE hits_total counter",
+        'hits_total{path="/a\\"b"} 1.0',
+    ]
+    assert "in_flight 2.0" in lines
+    assert 'wait_seconds_bucket{le="0.1"} 0' in lines
+    assert 'wait_seconds_bucket{le="1.0"} 1' in lines
+    assert 'wait_seconds_bucket{le="+Inf"} 1' in lines
+    assert "wait_seconds_sum 0.5" in lines
+    assert "wait_seconds_count 1" in lines
+
+
+def test_gauge_rejects_unknown_aggregation():
+    with pytest.raises(ValueError):
+        MetricsRegistry().gauge("in_flight", "In flight", aggregate="avg")
+
+
+def _process_snapshot(hits: int, in_flight: float, wait: float):
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits", labelnames=("path",)).inc(hits, path="/a")
+    registry.gauge("in_flight", "In flight", aggregate="sum").set(in_flight)
+    registry.gauge("lag_seconds", "Lag").set(in_flight * 10)
+    registry.histogram("wait_seconds", "Wait", buckets=(0.1, 1.0)).observe(wait)
+    return snapshot_metrics(registry.metrics())
+
+
+def test_merge_snapshots_sums_totals_and_aggregates_live_gauges():
+    merged = {
+        metric.name: metric
+        for metric in merge_snapshots(
+            [
+                (_process_snapshot(hits=2, in_flight=1, wait=0.05), True),
+                (_process_snapshot(hits=3, in_flight=4, wait=0.5), True),
+                (_process_snapshot(hits=5, in_flight=100, wait=5), False),
+            ]
+        )
+    }
+
+    assert merged["hits_total"].value(path="/a") == 10
+    # Gauges of an exited process are dropped, the rest combine per gauge.
+    assert merged["in_flight"].value() == 5
+    assert merged["lag_seconds"].value() == 40
+    histogram = merged["wait_seconds"]
+    assert isinstance(histogram, Histogram)
+    sample = histogram.sample()
+    assert sample is not None
+    assert sample.bucket_counts == [1, 2]
+    assert sample.count == 3
+    assert sample.sum == pytest.approx(5.55)
+    assert "wait_seconds_count 3" in render_text(merged.values()).splitlines()
+
+
+def test_merge_snapshots_skips_conflicting_definitions():
+    registry = MetricsRegistry()
+    registry.gauge("hits_total", "Hits as a gauge").set(7)
+
+    [merged] = merge_snapshots(
+        [
+            (_process_snapshot(hits=2, in_flight=0, wait=0)[:1], True),
+            (snapshot_metrics(registry.metrics()), True),
+        ]
+    )
+
+    assert merged.kind == "counter"
+    assert merged.value(path="/a") == 2
@@ -0,0 +1,76 @@
+import json
+import time
+
+from app.core.metrics import MetricsRegistry
+from app.core.metrics_multiprocess import (
+    EXITED_SNAPSHOT,
+    SNAPSHOT_SUFFIX,
+    MultiprocessCollector,
+)
+
+
+def _collector(directory, hostname: str, requests: int) -> MultiprocessCollector:
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc(requests)
+    registry.gauge("in_flight", "In flight", aggregate="sum").set(requests)
+    collector = MultiprocessCollector(registry, str(directory), 60)
+    collector.hostname = hostname
+    return collector
+
+
+def _by_name(metrics):
+    return {metric.name: metric for metric in metrics}
+
+
+def test_collect_without_directory_returns_local_registry():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc()
+    collector = MultiprocessCollector(registry, "")
+
+    assert not collector.enabled
+    assert collector.collect() == registry.metrics()
+
+
+def test_collect_merges_snapshots_from_every_process(tmp_path):
+    first = _collector(tmp_path, "api-1", requests=2)
+    second = _collector(tmp_path, "api-2", requests=3)
+    second.write()
+
+    merged = _by_name(first.collect())
+
+    assert merged["requests_total"].value() == 5
+    assert merged["in_flight"].value() == 5
+    assert len(list(tmp_path.glob(f"*{SNAPSHOT_SUFFIX}"))) == 2
+
+
+def test_collect_folds_snapshots_of_processes_that_stopped_writing(tmp_path):
+    live = _collector(tmp_path, "api-1", requests=2)
+    exited = _collector(tmp_path, "api-2", requests=3)
+    exited.write()
+    snapshot = json.loads(exited.path.read_text())
+    snapshot["written_at"] = time.time() - 3600
+    exited.path.write_text(json.dumps(snapshot))
+
+    merged = _by_name(live.collect())
+
+    assert merged["requests_total"].value() == 5
+    assert merged["in_flight"].value() == 2
+    assert not exited.path.exists()
+    assert (tmp_path / EXITED_SNAPSHOT).exists()
+
+
+def test_stop_folds_counters_into_exited_totals_once(tmp_path):
+    collector = _collector(tmp_path / "metrics", "worker-1", requests=1)
+    survivor = _collector(tmp_path / "metrics", "worker-2", requests=2)
+
+    collector.start()
+    snapshot = json.loads(collector.path.read_text())
+    [requests] = [m for m in snapshot["metrics"] if m["name"] == "requests_total"]
+    assert requests["samples"] == [[[], 1.0]]
+    collector.stop()
+    collector.stop()
+
+    assert not collector.path.exists()
+    merged = _by_name(survivor.collect())
+    assert merged["requests_total"].value() == 3
+    assert merged["in_flight"].value() == 2
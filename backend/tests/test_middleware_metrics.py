@@ -0,0 +1,65 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.middleware.metrics import (
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    UNMATCHED_ROUTE,
+    MetricsMiddleware,
+)
+
+
+def _count(**labels) -> int:
+    sample = HTTP_REQUEST_DURATION_SECONDS.sample(**labels)
+    return sample.count if sample else 0
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)  # type: ignore[call-arg,arg-type]
+    app.add_middleware(ErrorHandlerMiddleware)  # type: ignore[call-arg,arg-type]
+
+    @app.get("/metric-probes/{probe_id}")
+    async def probe(probe_id: int):
+        assert HTTP_REQUESTS_IN_FLIGHT.value(method="GET") >= 1
+        return {"id": probe_id}
+
+    @app.get("/metric-probes-boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return TestClient(app)
+
+
+def test_latency_is_labelled_by_route_template(client):
+    labels = {"method": "GET", "route": "/metric-probes/{probe_id}", "status": 200}
+    before = _count(**labels)
+
+    assert client.get("/metric-probes/1").status_code == 200
+    assert client.get("/metric-probes/2").status_code == 200
+
+    assert _count(**labels) == before + 2
+    assert HTTP_REQUESTS_IN_FLIGHT.value(method="GET") == 0
+
+
+def test_unmatched_paths_share_one_label(client):
+    labels = {"method": "GET", "route": UNMATCHED_ROUTE, "status": 404}
+    before = _count(**labels)
+
+    client.get("/no-such-path/1")
+    client.get("/no-such-path/2")
+
+    assert _count(**labels) == before + 2
+
+
+def test_unhandled_errors_are_recorded_as_500(client):
+    labels = {"method": "GET", "route": "/metric-probes-boom", "status": 500}
+    before = _count(**labels)
+
+    assert client.get("/metric-probes-boom").status_code == 500
+
+    assert _count(**labels) == before + 1
+    assert HTTP_REQUESTS_IN_FLIGHT.value(method="GET") == 0
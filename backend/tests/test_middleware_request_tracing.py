@@ -1,6 +1,8 @@
 import uuid
 
+import pytest
 from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
 from app.core.logging import _request_id_var
@@ -24,6 +26,22 @@ def _build_app() -> FastAPI:
     async def boom():
         raise RuntimeError("boom")
 
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f"{index}:{_request_id_var.get()}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/broken-stream")
+    async def broken_stream():
+        async def chunks():
+            yield "partial\n"
+            raise RuntimeError("stream failed")
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
     return app
 
 
@@ -57,3 +75,34 @@ def test_request_context_is_reset_after_request():
     client.get("/ok")
 
     assert _request_id_var.get() == ""
+
+
+def test_request_id_middleware_streams_response_in_request_context():
+    client = TestClient(_build_app())
+
+    with client.stream("GET", "/stream") as response:
+        lines = list(response.iter_lines())
+
+    request_id = response.headers["X-Request-ID"]
+    assert lines == [f"{index}:{request_id}" for index in range(3)]
+
+
+def test_error_handler_reraises_once_response_has_started():
+    client = TestClient(_build_app())
+
+    with pytest.raises(RuntimeError, match="stream failed"):
+        client.get("/broken-stream")
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_non_http_scopes_through():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope["type"])
+
+    app = RequestIDMiddleware(ErrorHandlerMiddleware(inner))
+
+    await app({"type": "lifespan"}, None, None)
+
+    assert seen == ["lifespan"]
@@ -0,0 +1,84 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.core.tracing as tracing_module
+from app.core.logging import RequestIDFilter
+from app.core.tracing import InMemorySpanExporter, Tracer, traced
+from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.middleware.tracing import TracingMiddleware
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=1.0)
+    monkeypatch.setattr(tracing_module, "tracer", tracer)
+    monkeypatch.setattr("app.middleware.tracing.tracer", tracer)
+    yield exporter
+    tracer.flush()
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ErrorHandlerMiddleware)  # type: ignore[call-arg,arg-type]
+    app.add_middleware(TracingMiddleware)  # type: ignore[call-arg,arg-type]
+
+    @traced("load_item", root=False)
+    async def load_item(item_id: int) -> dict[str, int]:
+        return {"id": item_id}
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        record = logging.LogRecord("app.test", logging.INFO, "", 0, "", (), None)
+        RequestIDFilter().filter(record)
+        return {**(await load_item(item_id)), "trace_id": record.trace_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_request_span_continues_incoming_trace(exporter):
+    response = TestClient(_build_app()).get(
+        "/items/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    )
+    tracing_module.tracer.flush()
+
+    assert response.json() == {"id": 7, "trace_id": TRACE_ID}
+    child, server = exporter.spans
+    assert server.name == "GET /items/{item_id}"
+    assert server.kind == "server"
+    assert server.context.trace_id == TRACE_ID
+    assert server.parent_id == PARENT_ID
+    assert server.attributes["http.route"] == "/items/{item_id}"
+    assert server.attributes["http.status_code"] == 200
+    assert child.name == "load_item"
+    assert child.parent_id == server.context.span_id
+
+
+def test_unsampled_incoming_trace_is_not_recorded(exporter):
+    TestClient(_build_app()).get(
+        "/items/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"}
+    )
+    tracing_module.tracer.flush()
+
+    assert exporter.spans == []
+
+
+def test_server_errors_mark_the_span(exporter):
+    response = TestClient(_build_app()).get("/boom")
+    tracing_module.tracer.flush()
+
+    assert response.status_code == 500
+    [server] = exporter.spans
+    assert server.name == "GET /boom"
+    assert server.status == "error"
+    assert server.parent_id is None
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import smtplib
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+import app.core.tracing as tracing_module
+import app.services.notifiers as notifiers_module
+from app.models.reminder import Reminder
+from app.services.notifiers import (
+    InMemoryNotifier,
+    LogNotifier,
+    Notifier,
+    SmtpNotifier,
+    WebhookNotifier,
+    build_notifier,
+)
+
+
+def _make_reminder(message: str | None = "Follow up") -> Reminder:
+    return Reminder(
+        id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        application_id=uuid.uuid4(),
+        remind_at=datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc),
+        message=message,
+        sent=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_deliver_limits_concurrency_and_fails_batches_that_raise():
+    active = 0
+    peak = 0
+
+    class _SlowNotifier(Notifier):
+        name = "slow"
+
+        async def send_batch(self, reminders):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if reminders[0].message == "boom":
+                raise RuntimeError("transport down")
+            return [True] * len(reminders)
+
+    notifier = _SlowNotifier(concurrency=2, batch_size=2)
+    batches = [[_make_reminder(), _make_reminder()] for _ in range(4)]
+    batches.append([_make_reminder("boom")])
+
+    results = await asyncio.gather(*(notifier.deliver(batch) for batch in batches))
+
+    assert peak == 2
+    assert results == [[True, True]] * 4 + [[False]]
+
+
+def test_notifier_without_send_batch_cannot_be_built():
+    class _Incomplete(Notifier):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        _Incomplete()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_notifier_records_batches_and_reports_failures():
+    ok, failing = _make_reminder(), _make_reminder()
+    notifier = InMemoryNotifier(fail_ids={failing.id})
+
+    assert await notifier.deliver([ok, failing]) == [True, False]
+    assert notifier.sent == [ok]
+    assert notifier.batches == [[ok.id, failing.id]]
+
+
+@pytest.mark.asyncio
+async def test_webhook_notifier_posts_batches_on_one_client():
+    requests = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500 if len(requests) > 1 else 204)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    notifier = WebhookNotifier("https://hooks.example.com/reminders", client=client)
+    first, second = _make_reminder(), _make_reminder()
+
+    assert await notifier.deliver([first, second]) == [True, True]
+    assert await notifier.deliver([first]) == [False]
+
+    body = json.loads(requests[0].content)
+    assert [item["id"] for item in body["reminders"]] == [
+        str(first.id),
+        str(second.id),
+    ]
+    assert body["reminders"][0]["remind_at"] == "2026-03-01T09:30:00+00:00"
+    await notifier.aclose()
+    assert not client.is_closed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_webhook_notifier_propagates_trace_context(monkeypatch):
+    tracer = tracing_module.Tracer(tracing_module.InMemorySpanExporter())
+    monkeypatch.setattr(tracing_module, "tracer", tracer)
+    requests = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(204)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    notifier = WebhookNotifier("https://hooks.example.com/reminders", client=client)
+
+    await notifier.deliver([_make_reminder()])
+    with tracer.span("job process_queued_reminders") as span:
+        await notifier.deliver([_make_reminder()])
+    tracer.flush()
+    await client.aclose()
+
+    assert span is not None
+    assert "traceparent" not in requests[0].headers
+    assert requests[1].headers["traceparent"] == (
+        tracing_module.format_traceparent(span.context)
+    )
+
+
+class _FakeSMTP:
+    instances: list["_FakeSMTP"] = []
+
+    def __init__(self, host, port, timeout):
+        self.address = (host, port)
+        self.sent: list[str] = []
+        self.recipients: list[str] = []
+        self.reject: set[str] = set()
+        self.disconnect_after: int | None = None
+        self.closed = False
+        self.logged_in = False
+        _FakeSMTP.instances.append(self)
+
+    def starttls(self, context):
+        return (220, b"ready")
+
+    def login(self, username, password):
+        self.logged_in = True
+
+    def noop(self):
+        if self.closed:
+            raise smtplib.SMTPServerDisconnected()
+        return (250, b"ok")
+
+    def send_message(self, message):
+        if (
+            self.disconnect_after is not None
+            and len(self.sent) >= self.disconnect_after
+        ):
+            raise smtplib.SMTPServerDisconnected()
+        if message["X-Reminder-Id"] in self.reject:
+            raise smtplib.SMTPRecipientsRefused({})
+        self.sent.append(message["X-Reminder-Id"])
+        self.recipients.append(message["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+async def _admin_emails(tenant_ids):
+    return {tenant_id: [f"admin-{tenant_id}@example.com"] for tenant_id in tenant_ids}
+
+
+@pytest.mark.asyncio
+async def test_smtp_notifier_reuses_connections_and_isolates_failures(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(notifiers_module.smtplib, "SMTP", _FakeSMTP)
+    notifier = SmtpNotifier(
+        host="smtp.example.com",
+        sender="reminders@example.com",
+        recipients=_admin_emails,
+        username="mailer",
+        password="secret",
+    )
+    first, rejected, last = _make_reminder(), _make_reminder(), _make_reminder()
+
+    assert await notifier.deliver([first]) == [True]
+    _FakeSMTP.instances[0].reject = {str(rejected.id)}
+    assert await notifier.deliver([rejected, last]) == [False, True]
+
+    assert len(_FakeSMTP.instances) == 1
+    connection = _FakeSMTP.instances[0]
+    assert connection.logged_in
+    assert connection.sent == [str(first.id), str(last.id)]
+
+    connection.disconnect_after = 2
+    assert await notifier.deliver([first, last]) == [False, False]
+    assert connection.closed
+    assert await notifier.deliver([first]) == [True]
+    assert len(_FakeSMTP.instances) == 2
+
+    await notifier.aclose()
+    assert _FakeSMTP.instances[1].closed
+
+
+@pytest.mark.asyncio
+async def test_smtp_notifier_sends_each_reminder_to_its_own_tenant(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(notifiers_module.smtplib, "SMTP", _FakeSMTP)
+    first, orphan, second = _make_reminder(), _make_reminder(), _make_reminder()
+
+    async def _recipients(tenant_ids):
+        return {
+            first.tenant_id: ["a@one.example.com"],
+            second.tenant_id: ["b@two.example.com", "c@two.example.com"],
+        }
+
+    notifier = SmtpNotifier(
+        host="smtp.example.com",
+        sender="reminders@example.com",
+        recipients=_recipients,
+        starttls=False,
+    )
+
+    assert await notifier.deliver([first, orphan, second]) == [True, False, True]
+    assert _FakeSMTP.instances[0].recipients == [
+        "a@one.example.com",
+        "b@two.example.com, c@two.example.com",
+    ]
+    await notifier.aclose()
+
+
+def test_build_notifier_selects_backend_and_requires_settings():
+    assert isinstance(build_notifier("log"), LogNotifier)
+    assert isinstance(build_notifier(" Memory "), InMemoryNotifier)
+    with pytest.raises(RuntimeError, match="REMINDER_WEBHOOK_URL"):
+        build_notifier("webhook")
+    with pytest.raises(ValueError, match="pigeon"):
+        build_notifier("pigeon")
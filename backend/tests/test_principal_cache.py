@@ -0,0 +1,175 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.tenant import Tenant
+from app.models.tenant_user import TenantRole, TenantUser
+from app.models.user import User
+from app.services.principal_cache import (
+    INVALIDATION_CHANNEL,
+    PRINCIPAL_CACHE_LOOKUPS,
+    PrincipalCache,
+    principal_cache,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.published: list[tuple[str, str]] = []
+
+    async def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+    async def setex(self, key: str, _ttl: int, value: str) -> None:
+        self.store[key] = value
+
+    async def delete(self, key: str) -> int:
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 1
+
+
+def _make_user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=uuid.uuid4(),
+        email="cached@example.com",
+        username="cached",
+        first_name="Cached",
+        last_name="User",
+        hashed_password="secret-hash",
+        is_active=True,
+        created_at=now,
+        last_update=now,
+    )
+
+
+def _make_tenant() -> Tenant:
+    return Tenant(
+        id=uuid.uuid4(), name="Workspace", created_at=datetime.now(timezone.utc)
+    )
+
+
+@pytest.mark.asyncio
+async def test_user_round_trips_through_local_tier_and_counts_hits():
+    cache = PrincipalCache()
+    user = _make_user()
+    hits_before = PRINCIPAL_CACHE_LOOKUPS.value(kind="user", result="local_hit")
+    misses_before = PRINCIPAL_CACHE_LOOKUPS.value(kind="user", result="miss")
+
+    assert await cache.get_user(user.id) is None
+    await cache.set_user(user)
+    cached = await cache.get_user(user.id)
+
+    assert cached is not None
+    assert cached is not user
+    assert cached.id == user.id
+    assert cached.email == user.email
+    assert cached.created_at == user.created_at
+    assert PRINCIPAL_CACHE_LOOKUPS.value(kind="user", result="miss") == (
+        misses_before + 1
+    )
+    assert PRINCIPAL_CACHE_LOOKUPS.value(kind="user", result="local_hit") == (
+        hits_before + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_never_stores_password_hash():
+    fake_redis = _FakeRedis()
+    writer = PrincipalCache()
+    reader = PrincipalCache()
+    writer.configure(fake_redis)
+    reader.configure(fake_redis)
+    user = _make_user()
+
+    await writer.set_user(user)
+    cached = await reader.get_user(user.id)
+
+    assert cached is not None
+    assert cached.username == user.username
+    assert "secret-hash" not in fake_redis.store[f"principal:user:{user.id}"]
+
+
+@pytest.mark.asyncio
+async def test_membership_cache_is_keyed_by_user_and_tenant():
+    cache = PrincipalCache()
+    tenant = _make_tenant()
+    user_id = uuid.uuid4()
+
+    await cache.set_tenant(user_id, tenant)
+
+    cached = await cache.get_tenant(user_id, tenant.id)
+    assert cached is not None
+    assert cached.id == tenant.id
+    assert await cache.get_tenant(uuid.uuid4(), tenant.id) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_membership_evicts_both_tiers_and_publishes():
+    fake_redis = _FakeRedis()
+    cache = PrincipalCache()
+    cache.configure(fake_redis)
+    tenant = _make_tenant()
+    user_id = uuid.uuid4()
+    await cache.set_tenant(user_id, tenant)
+
+    await cache.invalidate_membership(user_id, tenant.id)
+
+    assert await cache.get_tenant(user_id, tenant.id) is None
+    assert fake_redis.store == {}
+    assert fake_redis.published == [
+        (INVALIDATION_CHANNEL, f"membership:{user_id}:{tenant.id}")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_evict_local_handles_messages_from_other_workers():
+    cache = PrincipalCache()
+    user = _make_user()
+    await cache.set_user(user)
+
+    cache.evict_local("garbage:not-a-uuid")
+    cache.evict_local(f"user:{user.id}")
+
+    assert await cache.get_user(user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_committing_user_or_membership_changes_evicts_cached_entries(
+    db_session,
+):
+    user = User(
+        email="deactivate@example.com",
+        username="deactivate",
+        first_name="De",
+        last_name="Activate",
+        hashed_password="hash",
+    )
+    tenant = Tenant(name="Membership Tenant")
+    db_session.add_all([user, tenant])
+    await db_session.flush()
+    db_session.add(
+        TenantUser(user_id=user.id, tenant_id=tenant.id, role=TenantRole.member)
+    )
+    await db_session.commit()
+
+    await principal_cache.set_user(user)
+    await principal_cache.set_tenant(user.id, tenant)
+
+    user.is_active = False
+    await db_session.commit()
+    assert await principal_cache.get_user(user.id) is None
+    assert await principal_cache.get_tenant(user.id, tenant.id) is not None
+
+    membership = await db_session.scalar(
+        select(TenantUser).where(TenantUser.user_id == user.id)
+    )
+    await db_session.delete(membership)
+    await db_session.commit()
+    assert await principal_cache.get_tenant(user.id, tenant.id) is None
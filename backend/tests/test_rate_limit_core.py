@@ -0,0 +1,135 @@
+import pytest
+import redis.asyncio as redis
+
+import app.core.rate_limit as rate_limit_module
+from app.core.rate_limit import RATE_LIMIT_SYNCS, RateLimiter
+
+
+class FakeTimer:
+    def __init__(self, now: float = 6000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def shared_counts(monkeypatch) -> dict[str, int]:
+    """Stand in for the sync script with counters shared by every limiter."""
+    counts: dict[str, int] = {}
+
+    async def _sync(_client, keys, args):
+        result = []
+        for position, key in enumerate(keys):
+            counts[key] = counts.get(key, 0) + args[position // 2 * 3 + position % 2]
+            result.append(counts[key])
+        return result
+
+    monkeypatch.setattr(rate_limit_module, "SYNC_WINDOWS_SCRIPT", _sync)
+    return counts
+
+
+def _limiter(timer: FakeTimer, redis_client=None, **options) -> RateLimiter:
+    limiter = RateLimiter(timer=timer, **options)
+    limiter.configure(redis_client)
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_local_limit_rejects_with_retry_after():
+    limiter = _limiter(FakeTimer())
+
+    for _ in range(3):
+        assert (await limiter.hit("login", 3, 60)).allowed
+    decision = await limiter.hit("login", 3, 60)
+
+    assert not decision.allowed
+    assert decision.retry_after_seconds == 80
+    assert limiter.degraded
+
+
+@pytest.mark.asyncio
+async def test_previous_window_is_weighted_by_its_overlap():
+    timer = FakeTimer()
+    limiter = _limiter(timer)
+    for _ in range(4):
+        await limiter.hit("login", 4, 60)
+
+    timer.now += 60 + 10
+    assert not (await limiter.hit("login", 4, 60)).allowed
+    timer.now += 15
+    assert (await limiter.hit("login", 4, 60)).allowed
+
+
+@pytest.mark.asyncio
+async def test_hits_below_the_local_fraction_skip_redis(shared_counts):
+    limiter = _limiter(FakeTimer(), redis_client=object(), local_fraction=0.5)
+
+    for _ in range(5):
+        assert (await limiter.hit("login", 10, 60)).allowed
+
+    # Only the first hit, before any were counted, waited on Redis.
+    assert shared_counts["ratelimit:login:100"] == 0
+    await limiter.flush()
+    assert shared_counts["ratelimit:login:100"] == 5
+
+
+@pytest.mark.asyncio
+async def test_workers_share_counts_through_redis(shared_counts):
+    timer = FakeTimer()
+    first = _limiter(timer, redis_client=object())
+    second = _limiter(timer, redis_client=object())
+
+    for _ in range(3):
+        assert (await first.hit("login", 4, 60)).allowed
+    await first.flush()
+
+    assert (await second.hit("login", 4, 60)).allowed
+    assert not (await second.hit("login", 4, 60)).allowed
+    await second.flush()
+    assert shared_counts["ratelimit:login:100"] == 4
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_degrades_to_local_limits(monkeypatch):
+    async def _fail(*_args):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(rate_limit_module, "SYNC_WINDOWS_SCRIPT", _fail)
+    limiter = _limiter(FakeTimer(), redis_client=object(), redis_retry_seconds=60)
+    errors = RATE_LIMIT_SYNCS.value(mode="inline", outcome="error")
+
+    assert (await limiter.hit("login", 2, 60)).allowed
+    assert (await limiter.hit("login", 2, 60)).allowed
+    assert not (await limiter.hit("login", 2, 60)).allowed
+
+    assert limiter.degraded
+    assert RATE_LIMIT_SYNCS.value(mode="inline", outcome="error") == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_hits_for_the_next_sync(monkeypatch, shared_counts):
+    sync = rate_limit_module.SYNC_WINDOWS_SCRIPT
+    limiter = _limiter(FakeTimer(), redis_client=object(), redis_retry_seconds=0)
+    await limiter.hit("login", 10, 60)
+
+    async def _fail(*_args):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(rate_limit_module, "SYNC_WINDOWS_SCRIPT", _fail)
+    await limiter.flush()
+    monkeypatch.setattr(rate_limit_module, "SYNC_WINDOWS_SCRIPT", sync)
+    await limiter.flush()
+
+    assert shared_counts["ratelimit:login:100"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_keys_are_evicted():
+    limiter = _limiter(FakeTimer(), max_keys=2)
+
+    await limiter.hit("first", 1, 60)
+    await limiter.hit("second", 1, 60)
+    await limiter.hit("third", 1, 60)
+
+    assert (await limiter.hit("first", 1, 60)).allowed
@@ -0,0 +1,120 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from redis.exceptions import NoScriptError
+
+import app.core.redis as redis_core
+from app.core.tracing import InMemorySpanExporter, Tracer
+
+
+def test_create_redis_pool_uses_configured_url_and_limits(monkeypatch):
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6390/1")
+
+    pool = redis_core.create_redis_pool()
+
+    assert isinstance(pool, redis_core.InstrumentedConnectionPool)
+    assert pool.max_connections == redis_core.REDIS_MAX_CONNECTIONS
+    assert pool.timeout == redis_core.REDIS_POOL_TIMEOUT_SECONDS
+    assert pool.connection_kwargs["host"] == "localhost"
+    assert pool.connection_kwargs["port"] == 6390
+    assert pool.connection_kwargs["db"] == 1
+    assert pool.connection_kwargs["decode_responses"] is True
+    assert redis_core.REDIS_POOL_MAX_CONNECTIONS.value() == pool.max_connections
+
+
+def test_create_redis_pool_uses_default_url(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+
+    pool = redis_core.create_redis_pool()
+
+    assert pool.connection_kwargs["host"] == "localhost"
+    assert pool.connection_kwargs["port"] == 6379
+    assert pool.connection_kwargs["db"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_records_checkout_time_and_in_use_connections(monkeypatch):
+    pool = redis_core.create_redis_pool()
+    monkeypatch.setattr(
+        pool,
+        "make_connection",
+        lambda: AsyncMock(should_reconnect=Mock(return_value=False)),
+    )
+    monkeypatch.setattr(pool, "ensure_connection", AsyncMock())
+    before = redis_core.REDIS_POOL_CHECKOUT_SECONDS.sample()
+    before_count = before.count if before is not None else 0
+
+    connection = await pool.get_connection()
+
+    after = redis_core.REDIS_POOL_CHECKOUT_SECONDS.sample()
+    assert after is not None
+    assert after.count == before_count + 1
+    assert redis_core.REDIS_POOL_IN_USE_CONNECTIONS.value() == 1
+
+    await pool.release(connection)
+
+    assert redis_core.REDIS_POOL_IN_USE_CONNECTIONS.value() == 0
+
+
+@pytest.mark.asyncio
+async def test_lua_script_runs_by_sha():
+    script = redis_core.LuaScript("return 1")
+    client = AsyncMock()
+    client.evalsha = AsyncMock(return_value=1)
+
+    result = await script(client, keys=["k1", "k2"], args=["a", 3])
+
+    assert result == 1
+    client.evalsha.assert_awaited_once_with(script.sha, 2, "k1", "k2", "a", 3)
+    client.eval.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lua_script_falls_back_to_eval_when_not_loaded():
+    script = redis_core.LuaScript("return 1")
+    client = AsyncMock()
+    client.evalsha = AsyncMock(side_effect=NoScriptError("NOSCRIPT"))
+    client.eval = AsyncMock(return_value=1)
+
+    result = await script(client, keys=["k1"])
+
+    assert result == 1
+    client.eval.assert_awaited_once_with("return 1", 1, "k1")
+
+
+@pytest.mark.asyncio
+async def test_instrumented_redis_records_command_latency_and_errors(monkeypatch):
+    execute = AsyncMock(side_effect=["PONG", ConnectionError("down")])
+    monkeypatch.setattr(redis_core.redis.Redis, "execute_command", execute)
+    client = redis_core.create_redis_client(Mock(connection_kwargs={}))
+    before = redis_core.REDIS_COMMAND_DURATION_SECONDS.sample(command="PING")
+    before_count = before.count if before is not None else 0
+    errors = redis_core.REDIS_COMMAND_ERRORS.value(command="PING")
+
+    assert await client.execute_command("ping") == "PONG"
+    with pytest.raises(ConnectionError):
+        await client.execute_command("PING")
+
+    after = redis_core.REDIS_COMMAND_DURATION_SECONDS.sample(command="PING")
+    assert after is not None and after.count == before_count + 2
+    assert redis_core.REDIS_COMMAND_ERRORS.value(command="PING") == errors + 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_redis_traces_commands_inside_a_trace(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+    monkeypatch.setattr(redis_core, "tracer", tracer)
+    monkeypatch.setattr(
+        redis_core.redis.Redis, "execute_command", AsyncMock(return_value="1")
+    )
+    client = redis_core.create_redis_client(Mock(connection_kwargs={}))
+
+    await client.execute_command("GET", "outside")
+    with tracer.span("request"):
+        await client.execute_command("GET", "inside")
+    tracer.flush()
+
+    redis_span, _request = exporter.spans
+    assert redis_span.name == "redis GET"
+    assert redis_span.attributes == {"db.system": "redis", "db.operation": "GET"}
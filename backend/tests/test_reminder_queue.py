@@ -0,0 +1,93 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.reminder_queue import (
+    ENQUEUE_SCRIPT,
+    QUEUE_STATS_SCRIPT,
+    REMINDER_QUEUE_DEPTH,
+    REMINDER_QUEUE_LAG_SECONDS,
+    REMINDER_QUEUE_REDELIVERIES,
+    RESERVE_SCRIPT,
+    ReminderQueue,
+)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_scores_ids_by_remind_at_and_skips_empty_batches():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(return_value=1)
+    queue = ReminderQueue(redis_client)
+    reminder_id = uuid.uuid4()
+    remind_at = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+    assert await queue.enqueue([]) == 0
+    redis_client.evalsha.assert_not_awaited()
+
+    assert await queue.enqueue([(reminder_id, remind_at)]) == 1
+    redis_client.evalsha.assert_awaited_once_with(
+        ENQUEUE_SCRIPT.sha,
+        2,
+        "reminders:pending",
+        "reminders:in-flight",
+        int(remind_at.timestamp() * 1000),
+        str(reminder_id),
+    )
+
+
+@pytest.mark.asyncio
+async def test_reserve_sets_visibility_deadline_and_drops_invalid_ids():
+    reminder_id = uuid.uuid4()
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(return_value=[2, [str(reminder_id), "junk"]])
+    queue = ReminderQueue(redis_client, visibility_timeout_seconds=30)
+    redeliveries_before = REMINDER_QUEUE_REDELIVERIES.value()
+
+    reserved = await queue.reserve(10, now=1000)
+
+    assert reserved == [reminder_id]
+    redis_client.evalsha.assert_awaited_once_with(
+        RESERVE_SCRIPT.sha,
+        2,
+        "reminders:pending",
+        "reminders:in-flight",
+        1_000_000,
+        1_030_000,
+        10,
+    )
+    redis_client.zrem.assert_awaited_once_with("reminders:in-flight", "junk")
+    assert REMINDER_QUEUE_REDELIVERIES.value() - redeliveries_before == 2
+
+
+@pytest.mark.asyncio
+async def test_ack_removes_reserved_ids():
+    redis_client = AsyncMock()
+    redis_client.zrem = AsyncMock(return_value=1)
+    queue = ReminderQueue(redis_client)
+    reminder_id = uuid.uuid4()
+
+    assert await queue.ack([]) == 0
+    assert await queue.ack([reminder_id]) == 1
+    redis_client.zrem.assert_awaited_once_with("reminders:in-flight", str(reminder_id))
+
+
+@pytest.mark.asyncio
+async def test_refresh_metrics_exports_depth_and_oldest_due_lag():
+    redis_client = AsyncMock()
+    redis_client.evalsha = AsyncMock(side_effect=[[3, 1, "940000"], [0, 0, None]])
+    queue = ReminderQueue(redis_client)
+
+    await queue.refresh_metrics(now=1000)
+
+    redis_client.evalsha.assert_awaited_with(
+        QUEUE_STATS_SCRIPT.sha, 2, "reminders:pending", "reminders:in-flight"
+    )
+    assert REMINDER_QUEUE_DEPTH.value(state="pending") == 3
+    assert REMINDER_QUEUE_DEPTH.value(state="in_flight") == 1
+    assert REMINDER_QUEUE_LAG_SECONDS.value() == 60
+
+    await queue.refresh_metrics(now=1000)
+    assert REMINDER_QUEUE_DEPTH.value(state="pending") == 0
+    assert REMINDER_QUEUE_LAG_SECONDS.value() == 0
@@ -2,9 +2,15 @@ from datetime import date, datetime, timedelta, timezone
 from uuid import UUID
 
 import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.application import Application
+from app.models.reminder import Reminder
+from app.models.reminder_archive import ReminderArchive
 from app.models.tenant import Tenant
+from app.models.tenant_user import TenantRole, TenantUser
+from app.models.user import User
 from app.repositories.reminder_repository import ReminderRepository
 
 
@@ -123,3 +129,227 @@ async def test_mark_sent_updates_flag_and_returns_none_when_missing(db_session):
 
     missing = await repo.mark_sent(UUID("00000000-0000-0000-0000-000000000000"))
     assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_claim_due_reminders_leases_rows_and_skips_locked_ones(
+    db_session, test_engine
+):
+    tenant = await _create_tenant(db_session, "ClaimTenant")
+    application = await _create_application(db_session, tenant.id, "Role D")
+    repo = ReminderRepository(db_session)
+    now = datetime.now(timezone.utc)
+    reminders = [
+        await repo.create_reminder(
+            {
+                "tenant_id": tenant.id,
+                "application_id": application.id,
+                "remind_at": now - timedelta(minutes=minutes),
+            }
+        )
+        for minutes in (3, 2, 1)
+    ]
+    await repo.create_reminder(
+        {
+            "tenant_id": tenant.id,
+            "application_id": application.id,
+            "remind_at": now + timedelta(hours=1),
+        }
+    )
+
+    async with AsyncSession(test_engine) as other_session:
+        # Another dispatcher holds the oldest reminder's row lock.
+        await other_session.execute(
+            select(Reminder.id).where(Reminder.id == reminders[0].id).with_for_update()
+        )
+        claimed = await repo.claim_due_reminders(limit=10, lease_seconds=60)
+
+    assert [reminder.id for reminder in claimed] == [
+        reminders[1].id,
+        reminders[2].id,
+    ]
+    assert all(reminder.claimed_until > now for reminder in claimed)
+
+    # Live claims are not handed out twice; the released row is.
+    reclaimed = await repo.claim_due_reminders(limit=10, lease_seconds=60)
+    assert [reminder.id for reminder in reclaimed] == [reminders[0].id]
+
+
+@pytest.mark.asyncio
+async def test_complete_claimed_reminders_marks_sent_and_releases_failed(
+    db_session,
+):
+    tenant = await _create_tenant(db_session, "CompleteTenant")
+    application = await _create_application(db_session, tenant.id, "Role E")
+    repo = ReminderRepository(db_session)
+    due_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    sent, failed = [
+        await repo.create_reminder(
+            {
+                "tenant_id": tenant.id,
+                "application_id": application.id,
+                "remind_at": due_at,
+            }
+        )
+        for _ in range(2)
+    ]
+    await repo.claim_due_reminders(limit=10, lease_seconds=60)
+    retry = {"retry_base_seconds": 60, "retry_max_seconds": 90}
+
+    started = datetime.now(timezone.utc)
+    marked = await repo.complete_claimed_reminders([sent.id], [failed.id], **retry)
+
+    assert marked == 1
+    assert await repo.complete_claimed_reminders([], [], **retry) == 0
+    stored_sent = await repo.get_by_id(sent.id)
+    stored_failed = await repo.get_by_id(failed.id)
+    assert (stored_sent.sent, stored_sent.claimed_until) == (True, None)
+    assert (stored_sent.attempts, stored_sent.next_attempt_at) == (0, None)
+    assert (stored_failed.sent, stored_failed.claimed_until) == (False, None)
+    assert stored_failed.attempts == 1
+    first_delay = stored_failed.next_attempt_at - started
+    assert timedelta(seconds=59) < first_delay < timedelta(seconds=62)
+    assert await repo.claim_due_reminders(limit=10, lease_seconds=60) == []
+
+    await db_session.execute(
+        update(Reminder)
+        .where(Reminder.id == failed.id)
+        .values(next_attempt_at=started - timedelta(seconds=1))
+    )
+    reclaimed = await repo.claim_due_reminders(limit=10, lease_seconds=60)
+    assert [reminder.id for reminder in reclaimed] == [failed.id]
+
+    started = datetime.now(timezone.utc)
+    await repo.complete_claimed_reminders([], [failed.id], **retry)
+    stored_failed = await repo.get_by_id(failed.id)
+    assert stored_failed.attempts == 2
+    capped_delay = stored_failed.next_attempt_at - started
+    assert timedelta(seconds=89) < capped_delay < timedelta(seconds=92)
+
+
+@pytest.mark.asyncio
+async def test_fetch_upcoming_reminders_orders_unsent_within_window(db_session):
+    tenant = await _create_tenant(db_session, "UpcomingTenant")
+    application = await _create_application(db_session, tenant.id, "Role A")
+    now = datetime.now(timezone.utc)
+    repo = ReminderRepository(db_session)
+    later = await repo.create_reminder(
+        {
+            "tenant_id": tenant.id,
+            "application_id": application.id,
+            "remind_at": now + timedelta(seconds=60),
+            "message": "Later",
+        }
+    )
+    overdue = await repo.create_reminder(
+        {
+            "tenant_id": tenant.id,
+            "application_id": application.id,
+            "remind_at": now - timedelta(seconds=60),
+            "message": "Overdue",
+        }
+    )
+    retrying = await repo.create_reminder(
+        {
+            "tenant_id": tenant.id,
+            "application_id": application.id,
+            "remind_at": now - timedelta(seconds=120),
+            "next_attempt_at": now + timedelta(seconds=90),
+            "message": "Retrying",
+        }
+    )
+    for remind_at, sent, next_attempt_at in (
+        (now, True, None),
+        (now + timedelta(hours=1), False, None),
+        (now, False, now + timedelta(hours=1)),
+    ):
+        await repo.create_reminder(
+            {
+                "tenant_id": tenant.id,
+                "application_id": application.id,
+                "remind_at": remind_at,
+                "next_attempt_at": next_attempt_at,
+                "message": "Skipped",
+                "sent": sent,
+            }
+        )
+
+    upcoming = await repo.fetch_upcoming_reminders(now + timedelta(minutes=5), limit=10)
+    limited = await repo.fetch_upcoming_reminders(now + timedelta(minutes=5), limit=1)
+
+    assert upcoming == [
+        (overdue.id, overdue.remind_at),
+        (later.id, later.remind_at),
+        (retrying.id, retrying.next_attempt_at),
+    ]
+    assert limited == [(overdue.id, overdue.remind_at)]
+
+
+@pytest.mark.asyncio
+async def test_archive_sent_reminders_moves_only_old_sent_rows(db_session):
+    tenant = await _create_tenant(db_session, "ArchiveTenant")
+    application = await _create_application(db_session, tenant.id, "Role A")
+    now = datetime.now(timezone.utc)
+    repo = ReminderRepository(db_session)
+    reminders = {}
+    for name, age_days, sent in (
+        ("old_sent", 40, True),
+        ("older_sent", 50, True),
+        ("old_unsent", 40, False),
+        ("recent_sent", 1, True),
+    ):
+        reminders[name] = await repo.create_reminder(
+            {
+                "tenant_id": tenant.id,
+                "application_id": application.id,
+                "remind_at": now - timedelta(days=age_days),
+                "message": name,
+                "sent": sent,
+            }
+        )
+    cutoff = now - timedelta(days=30)
+
+    first = await repo.archive_sent_reminders(before=cutoff, limit=1)
+    second = await repo.archive_sent_reminders(before=cutoff, limit=10)
+
+    remaining = set((await db_session.execute(select(Reminder.id))).scalars())
+    archived = (await db_session.execute(select(ReminderArchive))).scalars().all()
+    assert (first, second) == (1, 1)
+    assert remaining == {reminders["old_unsent"].id, reminders["recent_sent"].id}
+    assert {item.id for item in archived} == {
+        reminders["old_sent"].id,
+        reminders["older_sent"].id,
+    }
+    older = next(item for item in archived if item.message == "older_sent")
+    assert older.tenant_id == tenant.id
+    assert older.remind_at == reminders["older_sent"].remind_at
+    assert older.archived_at is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_tenant_admin_emails_returns_active_admins_per_tenant(db_session):
+    tenant = await _create_tenant(db_session, "AdminEmailTenantA")
+    other_tenant = await _create_tenant(db_session, "AdminEmailTenantB")
+    for username, tenant_id, role, active in [
+        ("owner", tenant.id, TenantRole.admin, True),
+        ("member", tenant.id, TenantRole.member, True),
+        ("former", tenant.id, TenantRole.admin, False),
+        ("other", other_tenant.id, TenantRole.admin, True),
+    ]:
+        user = User(
+            email=f"{username}@example.com",
+            username=username,
+            first_name=username,
+            last_name="User",
+            hashed_password="hash",
+            is_active=active,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add(TenantUser(user_id=user.id, tenant_id=tenant_id, role=role))
+    await db_session.flush()
+    repo = ReminderRepository(db_session)
+
+    emails = await repo.fetch_tenant_admin_emails([tenant.id])
+
+    assert emails == {tenant.id: ["owner@example.com"]}
@@ -4,14 +4,12 @@ from unittest.mock import AsyncMock
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from fastapi_limiter import FastAPILimiter
 
 from app.api.deps import get_current_tenant, get_reminder_service
 from app.api.routes.reminders import router as reminders_router
 
 
 def _build_test_client(fake_service, tenant_id: uuid.UUID):
-    FastAPILimiter.redis = None
     app = FastAPI()
     app.include_router(reminders_router)
     app.dependency_overrides[get_reminder_service] = lambda: fake_service
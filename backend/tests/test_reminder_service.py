@@ -1,10 +1,13 @@
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
 
 import pytest
 
+import app.services.reminder_service as service_module
 from app.models.reminder import Reminder
+from app.services.notifiers import REMINDER_NOTIFICATIONS, InMemoryNotifier
 from app.services.reminder_service import ReminderService
 
 
@@ -39,48 +42,94 @@ async def test_create_reminder_calls_repository():
 
 
 @pytest.mark.asyncio
-async def test_process_due_reminders_fetches_notifies_and_marks_sent():
+async def test_process_due_reminders_claims_sends_and_completes_in_batches():
     repository = AsyncMock()
     reminder_1 = _make_reminder()
     reminder_2 = _make_reminder()
-    repository.fetch_pending_reminders = AsyncMock(
-        return_value=[reminder_1, reminder_2]
+    reminder_3 = _make_reminder()
+    repository.claim_due_reminders = AsyncMock(
+        side_effect=[[reminder_1, reminder_2], [reminder_3]]
     )
-    repository.mark_sent = AsyncMock(side_effect=[reminder_1, reminder_2])
+    repository.complete_claimed_reminders = AsyncMock(side_effect=[2, 1])
 
     notifier = AsyncMock()
-    service = ReminderService(repository=repository, notifier=notifier)
+    service = ReminderService(
+        repository=repository, notifier=notifier, claim_lease_seconds=30
+    )
 
     tenant_id = uuid.uuid4()
-    processed = await service.process_due_reminders(tenant_id)
+    processed = await service.process_due_reminders(tenant_id, batch_size=2)
 
-    assert processed == 2
-    repository.fetch_pending_reminders.assert_awaited_once_with(tenant_id)
-    notifier.assert_any_await(reminder_1)
-    notifier.assert_any_await(reminder_2)
-    assert notifier.await_count == 2
-    repository.mark_sent.assert_any_await(reminder_1.id)
-    repository.mark_sent.assert_any_await(reminder_2.id)
-    assert repository.mark_sent.await_count == 2
+    assert processed == 3
+    assert repository.claim_due_reminders.await_count == 2
+    repository.claim_due_reminders.assert_awaited_with(
+        limit=2, lease_seconds=30, tenant_id=tenant_id
+    )
+    assert notifier.await_count == 3
+    assert [
+        call.args for call in repository.complete_claimed_reminders.await_args_list
+    ] == [
+        ([reminder_1.id, reminder_2.id], []),
+        ([reminder_3.id], []),
+    ]
+    repository.mark_sent.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_process_due_reminders_skips_mark_when_notification_fails():
+async def test_process_due_reminders_releases_failed_sends_and_stops():
     repository = AsyncMock()
     reminder_1 = _make_reminder()
     reminder_2 = _make_reminder()
-    repository.fetch_pending_reminders = AsyncMock(
-        return_value=[reminder_1, reminder_2]
+    repository.claim_due_reminders = AsyncMock(return_value=[reminder_1, reminder_2])
+    repository.complete_claimed_reminders = AsyncMock(return_value=0)
+
+    notifier = AsyncMock(side_effect=RuntimeError("smtp error"))
+    service = ReminderService(
+        repository=repository,
+        notifier=notifier,
+        retry_base_seconds=5,
+        retry_max_seconds=50,
     )
-    repository.mark_sent = AsyncMock(return_value=reminder_2)
 
-    notifier = AsyncMock(side_effect=[RuntimeError("smtp error"), None])
-    service = ReminderService(repository=repository, notifier=notifier)
+    processed = await service.process_due_reminders(uuid.uuid4(), batch_size=2)
 
-    processed = await service.process_due_reminders(uuid.uuid4())
+    assert processed == 0
+    repository.claim_due_reminders.assert_awaited_once()
+    repository.complete_claimed_reminders.assert_awaited_once_with(
+        [],
+        [reminder_1.id, reminder_2.id],
+        retry_base_seconds=5,
+        retry_max_seconds=50,
+    )
 
-    assert processed == 1
-    repository.mark_sent.assert_awaited_once_with(reminder_2.id)
+
+@pytest.mark.asyncio
+async def test_dispatch_due_reminders_bounds_concurrent_sends():
+    reminders = [_make_reminder() for _ in range(6)]
+    repository = AsyncMock()
+    repository.claim_due_reminders = AsyncMock(return_value=reminders)
+    repository.complete_claimed_reminders = AsyncMock(return_value=6)
+    active = 0
+    peak = 0
+
+    async def _notifier(_reminder):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    service = ReminderService(
+        repository=repository, notifier=_notifier, send_concurrency=2
+    )
+
+    assert await service.dispatch_due_reminders(batch_size=6) == 6
+    assert peak == 2
+    repository.complete_claimed_reminders.assert_awaited_once()
+    assert repository.complete_claimed_reminders.await_args.args == (
+        [reminder.id for reminder in reminders],
+        [],
+    )
 
 
 @pytest.mark.asyncio
@@ -102,25 +151,73 @@ async def test_send_notification_without_notifier_does_not_raise():
     reminder = _make_reminder()
     service = ReminderService(repository=repository, notifier=None)
 
-    await service.send_notification(reminder)
+    assert await service.send_notification(reminder) is True
+
+
+@pytest.mark.asyncio
+async def test_send_notification_reports_failures_through_deliver():
+    reminder = _make_reminder()
+    notifier = InMemoryNotifier(fail_ids={reminder.id})
+    failed = REMINDER_NOTIFICATIONS.value(backend="memory", outcome="failed")
+    service = ReminderService(repository=AsyncMock(), notifier=notifier)
+
+    assert await service.send_notification(reminder) is False
+    assert (
+        REMINDER_NOTIFICATIONS.value(backend="memory", outcome="failed") == failed + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_notification_does_not_raise_when_the_backend_fails():
+    notifier = AsyncMock(side_effect=RuntimeError("smtp error"))
+    service = ReminderService(repository=AsyncMock(), notifier=notifier)
+
+    assert await service.send_notification(_make_reminder()) is False
+
 
+class _FakeReminderQueue:
+    """In-memory stand-in for ReminderQueue with the same dedup rules."""
 
-class _FakeRedisQueue:
-    def __init__(self):
-        self.items: list[str] = []
+    def __init__(self, _redis_client):
+        self.pending: dict[uuid.UUID, datetime] = {}
+        self.in_flight: set[uuid.UUID] = set()
+        self.acked: list[uuid.UUID] = []
+        self.metrics_refreshes = 0
 
-    async def rpush(self, _key: str, *values: str) -> int:
-        self.items.extend(values)
-        return len(self.items)
+    async def enqueue(self, reminders) -> int:
+        added = 0
+        for reminder_id, remind_at in reminders:
+            if reminder_id in self.pending or reminder_id in self.in_flight:
+                continue
+            self.pending[reminder_id] = remind_at
+            added += 1
+        return added
 
-    async def lpop(self, _key: str) -> str | None:
-        if not self.items:
-            return None
-        return self.items.pop(0)
+    async def reserve(self, limit: int) -> list[uuid.UUID]:
+        reserved = sorted(self.pending, key=self.pending.__getitem__)[:limit]
+        for reminder_id in reserved:
+            del self.pending[reminder_id]
+            self.in_flight.add(reminder_id)
+        return reserved
+
+    async def ack(self, reminder_ids) -> int:
+        self.acked.extend(reminder_ids)
+        self.in_flight.difference_update(reminder_ids)
+        return len(reminder_ids)
+
+    async def refresh_metrics(self) -> None:
+        self.metrics_refreshes += 1
+
+
+@pytest.fixture
+def fake_queue(monkeypatch):
+    queue = _FakeReminderQueue(None)
+    monkeypatch.setattr(service_module, "ReminderQueue", lambda _client: queue)
+    return queue
 
 
 @pytest.mark.asyncio
-async def test_enqueue_due_reminders_pushes_ids_to_redis_queue():
+async def test_enqueue_due_reminders_queues_each_reminder_once(fake_queue):
     repository = AsyncMock()
     reminder_1 = _make_reminder()
     reminder_2 = _make_reminder()
@@ -128,50 +225,97 @@ async def test_enqueue_due_reminders_pushes_ids_to_redis_queue():
         return_value=[reminder_1, reminder_2]
     )
     service = ReminderService(repository=repository)
-    fake_redis = _FakeRedisQueue()
 
-    enqueued = await service.enqueue_due_reminders(fake_redis, batch_size=50)
+    first = await service.enqueue_due_reminders(AsyncMock(), batch_size=50)
+    second = await service.enqueue_due_reminders(AsyncMock(), batch_size=50)
 
-    assert enqueued == 2
-    repository.fetch_pending_reminders_global.assert_awaited_once_with(limit=50)
-    assert fake_redis.items == [str(reminder_1.id), str(reminder_2.id)]
+    assert (first, second) == (2, 0)
+    repository.fetch_pending_reminders_global.assert_awaited_with(limit=50)
+    assert list(fake_queue.pending) == [reminder_1.id, reminder_2.id]
+    assert fake_queue.metrics_refreshes == 2
 
 
 @pytest.mark.asyncio
-async def test_process_queued_reminders_sends_and_marks_sent():
+async def test_process_queued_reminders_dispatches_and_acks_reserved_ids(
+    fake_queue,
+):
     repository = AsyncMock()
     reminder_1 = _make_reminder()
     reminder_2 = _make_reminder()
-    repository.get_by_id = AsyncMock(side_effect=[reminder_1, reminder_2])
-    repository.mark_sent = AsyncMock(side_effect=[reminder_1, reminder_2])
+    repository.claim_due_reminders = AsyncMock(return_value=[reminder_1, reminder_2])
+    repository.complete_claimed_reminders = AsyncMock(return_value=2)
     notifier = AsyncMock()
-
     service = ReminderService(repository=repository, notifier=notifier)
-    fake_redis = _FakeRedisQueue()
-    await fake_redis.rpush("reminders:queue", str(reminder_1.id), str(reminder_2.id))
+    await fake_queue.enqueue(
+        [(reminder_1.id, reminder_1.remind_at), (reminder_2.id, reminder_2.remind_at)]
+    )
 
-    processed = await service.process_queued_reminders(fake_redis, max_items=10)
+    processed = await service.process_queued_reminders(AsyncMock(), max_items=10)
 
     assert processed == 2
-    assert repository.get_by_id.await_count == 2
-    assert repository.mark_sent.await_count == 2
+    claim_kwargs = repository.claim_due_reminders.await_args.kwargs
+    assert claim_kwargs["reminder_ids"] == [reminder_1.id, reminder_2.id]
+    assert claim_kwargs["limit"] == 2
     assert notifier.await_count == 2
+    assert fake_queue.acked == [reminder_1.id, reminder_2.id]
+    assert not fake_queue.in_flight
+    repository.get_by_id.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_process_queued_reminders_skips_invalid_id_and_notification_errors():
+async def test_process_queued_reminders_leaves_ids_reserved_when_dispatch_fails(
+    fake_queue,
+):
     repository = AsyncMock()
+    repository.claim_due_reminders = AsyncMock(side_effect=RuntimeError("db down"))
+    service = ReminderService(repository=repository)
     reminder = _make_reminder()
-    repository.get_by_id = AsyncMock(return_value=reminder)
-    repository.mark_sent = AsyncMock(return_value=reminder)
-    notifier = AsyncMock(side_effect=[RuntimeError("send failed")])
+    await fake_queue.enqueue([(reminder.id, reminder.remind_at)])
 
-    service = ReminderService(repository=repository, notifier=notifier)
-    fake_redis = _FakeRedisQueue()
-    await fake_redis.rpush("reminders:queue", "not-a-uuid", str(reminder.id))
+    with pytest.raises(RuntimeError):
+        await service.process_queued_reminders(AsyncMock())
 
-    processed = await service.process_queued_reminders(fake_redis, max_items=10)
+    assert fake_queue.in_flight == {reminder.id}
+    assert fake_queue.acked == []
 
-    assert processed == 0
-    repository.get_by_id.assert_awaited_once()
-    repository.mark_sent.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_process_queued_reminders_skips_empty_queue(fake_queue):
+    repository = AsyncMock()
+    service = ReminderService(repository=repository)
+
+    assert await service.process_queued_reminders(AsyncMock()) == 0
+    repository.claim_due_reminders.assert_not_awaited()
+    assert fake_queue.metrics_refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_archive_sent_reminders_moves_batches_until_drained():
+    repository = AsyncMock()
+    repository.archive_sent_reminders = AsyncMock(side_effect=[2, 2, 1])
+    service = ReminderService(repository=repository)
+
+    archived = await service.archive_sent_reminders(retention_days=7, batch_size=2)
+
+    assert archived == 5
+    assert repository.archive_sent_reminders.await_count == 3
+    before = repository.archive_sent_reminders.await_args.kwargs["before"]
+    expected = datetime.now(timezone.utc) - timedelta(days=7)
+    assert abs((before - expected).total_seconds()) < 5
+
+
+@pytest.mark.asyncio
+async def test_dispatch_due_reminders_sends_in_notifier_batches():
+    reminders = [_make_reminder() for _ in range(5)]
+    repository = AsyncMock()
+    repository.claim_due_reminders = AsyncMock(return_value=reminders)
+    repository.complete_claimed_reminders = AsyncMock(return_value=4)
+    notifier = InMemoryNotifier(batch_size=2, fail_ids={reminders[3].id})
+    service = ReminderService(repository=repository, notifier=notifier)
+
+    assert await service.dispatch_due_reminders(batch_size=5) == 4
+    assert [len(batch) for batch in notifier.batches] == [2, 2, 1]
+    assert repository.complete_claimed_reminders.await_args.args == (
+        [reminder.id for index, reminder in enumerate(reminders) if index != 3],
+        [reminders[3].id],
+    )
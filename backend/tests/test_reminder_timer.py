@@ -0,0 +1,189 @@
+import asyncio
+import json
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.application import Application
+from app.models.reminder import Reminder
+from app.models.tenant import Tenant
+from app.services.reminder_timer import ReminderTimer, TimerHeap
+
+NOW = 1_800_000_000.0
+
+
+def _at(seconds: float) -> datetime:
+    return datetime.fromtimestamp(NOW + seconds, timezone.utc)
+
+
+def _notification(reminder_id: uuid.UUID, seconds: float, sent=False) -> str:
+    return json.dumps({"id": str(reminder_id), "due_at": NOW + seconds, "sent": sent})
+
+
+def _timer(monkeypatch, upcoming, max_entries: int = 100) -> ReminderTimer:
+    repository = AsyncMock()
+    repository.fetch_upcoming_reminders = AsyncMock(return_value=upcoming)
+    monkeypatch.setattr(
+        "app.services.reminder_timer.ReminderRepository", lambda _session: repository
+    )
+
+    class _Session:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *_exc):
+            return False
+
+    fired = []
+    timer = ReminderTimer(
+        AsyncMock(),
+        lambda: _Session(),
+        lookahead_seconds=60,
+        max_entries=max_entries,
+        on_fire=lambda: fired.append(True),
+    )
+    timer.queue = AsyncMock()
+    timer.fired = fired
+    return timer
+
+
+def test_timer_heap_pops_due_entries_in_deadline_order():
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    heap = TimerHeap()
+    heap.push(second, 20.0)
+    heap.push(first, 10.0)
+    heap.push(third, 30.0)
+    heap.push(third, 5.0)
+    heap.discard(second)
+
+    assert len(heap) == 2
+    assert heap.next_deadline() == 5.0
+    assert heap.pop_due(15.0) == [(third, 5.0), (first, 10.0)]
+    assert heap.next_deadline() is None
+    assert len(heap) == 0
+
+
+@pytest.mark.asyncio
+async def test_step_queues_due_reminders_and_sleeps_until_next_deadline(
+    monkeypatch,
+):
+    overdue, soon = uuid.uuid4(), uuid.uuid4()
+    timer = _timer(monkeypatch, [(overdue, _at(-2)), (soon, _at(5))])
+
+    delay = await timer.step(now=NOW)
+
+    timer.queue.enqueue.assert_awaited_once()
+    assert list(timer.queue.enqueue.await_args.args[0]) == [(overdue, _at(-2))]
+    assert delay == 5.0
+    assert timer.fired == [True]
+    assert timer.window_end == NOW + 60
+
+    timer.queue.enqueue.reset_mock()
+    assert await timer.step(now=NOW + 5) == 25.0
+    assert list(timer.queue.enqueue.await_args.args[0]) == [(soon, _at(5))]
+
+
+@pytest.mark.asyncio
+async def test_truncated_reload_narrows_window_to_loaded_reminders(monkeypatch):
+    first, last = uuid.uuid4(), uuid.uuid4()
+    timer = _timer(monkeypatch, [(first, _at(10)), (last, _at(20))], max_entries=2)
+
+    await timer.reload(now=NOW)
+    timer.handle_notification(_notification(uuid.uuid4(), 30))
+
+    assert timer.window_end == NOW + 20
+    assert len(timer.heap) == 2
+
+
+@pytest.mark.asyncio
+async def test_notifications_reschedule_and_remove_loaded_reminders(monkeypatch):
+    moved, sent, added = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    timer = _timer(monkeypatch, [(moved, _at(10)), (sent, _at(20))])
+
+    timer.handle_notification(_notification(added, 1))
+    assert len(timer.heap) == 0 and not timer.wake.is_set()
+
+    await timer.reload(now=NOW)
+    timer.handle_notification(_notification(moved, 120))
+    timer.handle_notification(_notification(sent, 20, sent=True))
+    timer.handle_notification(_notification(added, 1))
+    timer.handle_notification("not json")
+
+    assert timer.wake.is_set()
+    assert timer.heap.pop_due(NOW + 60) == [(added, NOW + 1)]
+
+
+async def _create_reminder(session_factory, name: str) -> Reminder:
+    async with session_factory() as session:
+        tenant = Tenant(name=name)
+        session.add(tenant)
+        await session.flush()
+        application = Application(
+            tenant_id=tenant.id,
+            title="Role",
+            company="Contoso",
+            location="Remote",
+            applied_date=date(2026, 3, 1),
+        )
+        session.add(application)
+        await session.flush()
+        reminder = Reminder(
+            tenant_id=tenant.id,
+            application_id=application.id,
+            remind_at=datetime.now(timezone.utc) + timedelta(seconds=10),
+            message="Follow up",
+        )
+        session.add(reminder)
+        await session.commit()
+    return reminder
+
+
+@pytest.mark.asyncio
+async def test_listen_receives_reminder_changes(test_engine):
+    session_factory = async_sessionmaker(
+        bind=test_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    timer = ReminderTimer(AsyncMock(), session_factory, lookahead_seconds=60)
+
+    try:
+        assert await timer.listen(test_engine) is True
+        await timer.reload()
+        reminder = await _create_reminder(session_factory, "TimerNotifyTenant")
+        await asyncio.wait_for(timer.wake.wait(), timeout=2)
+    finally:
+        await timer.unlisten()
+
+    assert reminder.id in timer.heap
+
+
+@pytest.mark.asyncio
+async def test_listen_reconnects_and_reloads_after_the_connection_drops(test_engine):
+    session_factory = async_sessionmaker(
+        bind=test_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    timer = ReminderTimer(AsyncMock(), session_factory, lookahead_seconds=60)
+
+    try:
+        assert await timer.listen(test_engine) is True
+        await timer.reload()
+        async with test_engine.connect() as connection:
+            await connection.execute(
+                text("SELECT pg_terminate_backend(:pid)"),
+                {"pid": timer._listener.get_server_pid()},
+            )
+        await asyncio.wait_for(timer.wake.wait(), timeout=2)
+        timer.wake.clear()
+
+        assert await timer.listen(test_engine) is True
+        assert timer.window_end is None
+        await timer.reload()
+        reminder = await _create_reminder(session_factory, "TimerReconnectTenant")
+        await asyncio.wait_for(timer.wake.wait(), timeout=2)
+    finally:
+        await timer.unlisten()
+
+    assert reminder.id in timer.heap
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.workers.reminders import ReminderWorker
+
+
+def _worker(**kwargs) -> ReminderWorker:
+    worker = ReminderWorker(
+        AsyncMock(),
+        AsyncMock(),
+        poll_seconds=0.01,
+        lease_seconds=0.03,
+        **kwargs,
+    )
+    worker.lease = AsyncMock(ttl_seconds=0.03, is_leader=False)
+    worker.archive_once = AsyncMock(return_value=0)
+    worker.reconcile_once = AsyncMock(return_value=0)
+    worker.timer.step = AsyncMock(return_value=0.05)
+    worker.timer.reset = MagicMock()
+    worker.timer.listen = AsyncMock(return_value=True)
+    worker.timer.unlisten = AsyncMock()
+    return worker
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_consumers_and_timer_only_while_leading():
+    worker = _worker(concurrency=3, engine=MagicMock())
+    worker.lease.acquire = AsyncMock(return_value=True)
+    worker.lease.is_leader = True
+    active = 0
+    peak = 0
+
+    async def _process_once() -> int:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return 0
+
+    worker.process_once = _process_once
+    stop = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.12, stop.set)
+
+    await asyncio.wait_for(worker.run(stop), timeout=1)
+
+    assert peak == 3
+    assert worker.timer.step.await_count >= 3
+    worker.timer.reset.assert_not_called()
+    assert worker.timer.listen.await_count >= 3
+    worker.timer.unlisten.assert_awaited_once()
+    worker.archive_once.assert_awaited_once()
+    worker.reconcile_once.assert_awaited_once()
+    worker.lease.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_follower_keeps_consuming_without_running_timer():
+    worker = _worker()
+    worker.lease.acquire = AsyncMock(return_value=False)
+    results = iter([RuntimeError("db down"), 2])
+    calls = 0
+
+    async def _process_once() -> int:
+        nonlocal calls
+        calls += 1
+        result = next(results, 0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    worker.process_once = _process_once
+    stop = asyncio.Event()
+    asyncio.get_running_loop().call_later(0.05, stop.set)
+
+    await asyncio.wait_for(worker.run(stop), timeout=1)
+
+    worker.timer.step.assert_not_awaited()
+    worker.timer.listen.assert_not_awaited()
+    worker.archive_once.assert_not_awaited()
+    worker.reconcile_once.assert_not_awaited()
+    worker.timer.reset.assert_called()
+    assert worker.lease.acquire.await_count >= 2
+    assert calls >= 3
+
+
+@pytest.mark.asyncio
+async def test_fired_timer_wakes_idle_consumers():
+    worker = _worker()
+    worker.poll_seconds = 10
+    worker.lease.acquire = AsyncMock(return_value=False)
+    calls = 0
+
+    async def _process_once() -> int:
+        nonlocal calls
+        calls += 1
+        return 0
+
+    worker.process_once = _process_once
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.call_later(0.02, worker.timer.on_fire)
+    loop.call_later(0.05, stop.set)
+
+    await asyncio.wait_for(worker.run(stop), timeout=1)
+
+    assert calls == 2
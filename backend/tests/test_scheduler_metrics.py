@@ -0,0 +1,87 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from apscheduler.events import (  # type: ignore[import-untyped]
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+)
+
+from app.core.scheduler_metrics import (
+    SCHEDULER_JOB_DURATION_SECONDS,
+    SCHEDULER_JOB_LAG_SECONDS,
+    SCHEDULER_JOB_RUNS,
+    SCHEDULER_JOBS_RUNNING,
+    SchedulerMetricsListener,
+    instrument_scheduler,
+    record_job,
+)
+
+
+def _count(histogram, job: str) -> int:
+    sample = histogram.sample(job=job)
+    return sample.count if sample else 0
+
+
+def test_listener_records_lag_duration_and_outcome():
+    listener = SchedulerMetricsListener()
+    job = "listener_probe"
+    scheduled = datetime.now(UTC) - timedelta(seconds=2)
+    durations = _count(SCHEDULER_JOB_DURATION_SECONDS, job)
+    errors = SCHEDULER_JOB_RUNS.value(job=job, outcome="error")
+
+    listener(JobSubmissionEvent(EVENT_JOB_SUBMITTED, job, "default", [scheduled]))
+    assert SCHEDULER_JOBS_RUNNING.value(job=job) == 1
+    listener(JobExecutionEvent(EVENT_JOB_ERROR, job, "default", scheduled))
+
+    assert SCHEDULER_JOBS_RUNNING.value(job=job) == 0
+    assert _count(SCHEDULER_JOB_DURATION_SECONDS, job) == durations + 1
+    assert SCHEDULER_JOB_RUNS.value(job=job, outcome="error") == errors + 1
+    lag = SCHEDULER_JOB_LAG_SECONDS.sample(job=job)
+    assert lag is not None and lag.sum >= 2
+
+
+def test_listener_times_a_run_once_when_it_covers_several_run_times():
+    listener = SchedulerMetricsListener()
+    job = "coalesced_probe"
+    now = datetime.now(UTC)
+    run_times = [now - timedelta(seconds=120), now]
+    durations = _count(SCHEDULER_JOB_DURATION_SECONDS, job)
+
+    listener(JobSubmissionEvent(EVENT_JOB_SUBMITTED, job, "default", run_times))
+    listener(JobExecutionEvent(EVENT_JOB_MISSED, job, "default", run_times[0]))
+    listener(JobExecutionEvent(EVENT_JOB_EXECUTED, job, "default", run_times[1]))
+
+    assert _count(SCHEDULER_JOB_LAG_SECONDS, job) == 2
+    assert _count(SCHEDULER_JOB_DURATION_SECONDS, job) == durations + 1
+    assert SCHEDULER_JOB_RUNS.value(job=job, outcome="missed") == 1
+    assert SCHEDULER_JOB_RUNS.value(job=job, outcome="success") == 1
+
+
+def test_instrument_scheduler_registers_listener():
+    scheduler = Mock()
+
+    listener = instrument_scheduler(scheduler)
+
+    scheduler.add_listener.assert_called_once_with(
+        listener, SchedulerMetricsListener.mask
+    )
+
+
+def test_record_job_counts_success_and_error():
+    job = "record_job_probe"
+
+    with record_job(job):
+        assert SCHEDULER_JOBS_RUNNING.value(job=job) == 1
+    with pytest.raises(RuntimeError):
+        with record_job(job):
+            raise RuntimeError("boom")
+
+    assert SCHEDULER_JOBS_RUNNING.value(job=job) == 0
+    assert _count(SCHEDULER_JOB_DURATION_SECONDS, job) == 2
+    assert SCHEDULER_JOB_RUNS.value(job=job, outcome="success") == 1
+    assert SCHEDULER_JOB_RUNS.value(job=job, outcome="error") == 1
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls_for_a_key():
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def _compute() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    tasks = [asyncio.create_task(flight.run("tenant", _compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.in_flight("tenant")
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert sorted(results) == [(42, False)] + [(42, True)] * 4
+    assert not flight.in_flight("tenant")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_allows_retry():
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def _fail() -> int:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    leader = asyncio.create_task(flight.run("tenant", _fail))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.run("tenant", _fail))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await leader
+    with pytest.raises(RuntimeError, match="boom"):
+        await follower
+
+    async def _succeed() -> int:
+        return 7
+
+    assert await flight.run("tenant", _succeed) == (7, False)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_keeps_keys_independent():
+    flight: SingleFlight[str, str] = SingleFlight()
+
+    async def _echo(value: str):
+        await asyncio.sleep(0)
+        return value
+
+    first, second = await asyncio.gather(
+        flight.run("a", lambda: _echo("a")), flight.run("b", lambda: _echo("b"))
+    )
+
+    assert first == ("a", False)
+    assert second == ("b", False)
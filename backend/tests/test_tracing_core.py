@@ -0,0 +1,252 @@
+import io
+import json
+import threading
+
+import pytest
+
+import app.core.tracing as tracing_module
+from app.core.tracing import (
+    TRACING_SPANS_DROPPED,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    SpanContext,
+    SpanExporter,
+    StreamSpanExporter,
+    Tracer,
+    build_exporter,
+    format_traceparent,
+    inject_trace_context,
+    parse_traceparent,
+    traced,
+    traced_methods,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=1.0)
+    monkeypatch.setattr(tracing_module, "tracer", tracer)
+    yield exporter
+    tracer.flush()
+
+
+def test_parse_traceparent_accepts_valid_headers():
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == SpanContext(
+        TRACE_ID, PARENT_ID, True
+    )
+    assert parse_traceparent(f" 00-{TRACE_ID.upper()}-{PARENT_ID}-00 ") == (
+        SpanContext(TRACE_ID, PARENT_ID, False)
+    )
+    # Later versions may append fields; the known prefix is still used.
+    assert parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-01-extra") is not None
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+    ],
+)
+def test_parse_traceparent_rejects_invalid_headers(header):
+    assert parse_traceparent(header) is None
+
+
+def test_format_traceparent_round_trips():
+    context = SpanContext(TRACE_ID, PARENT_ID, True)
+
+    assert format_traceparent(context) == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    assert parse_traceparent(format_traceparent(context)) == context
+
+
+def test_disabled_tracer_creates_no_spans():
+    tracer = Tracer(None)
+
+    with tracer.span("request") as span:
+        assert span is None
+    assert not tracer.enabled
+
+
+def test_spans_nest_and_export_on_flush():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.span("request", kind="server") as root:
+        with tracer.span("redis GET", kind="client", root=False) as child:
+            assert child is not None
+            child.set_attribute("db.operation", "GET")
+        with pytest.raises(RuntimeError):
+            with tracer.span("failing", root=False):
+                raise RuntimeError("boom")
+    tracer.flush()
+
+    child_span, failing, root_span = exporter.spans
+    assert root is not None and root_span is root
+    assert root_span.parent_id is None
+    assert child_span.parent_id == failing.parent_id == root.context.span_id
+    assert child_span.context.trace_id == root.context.trace_id
+    assert child_span.attributes == {"db.operation": "GET"}
+    assert failing.status == "error"
+    assert failing.attributes["exception.type"] == "RuntimeError"
+    assert root_span.to_dict()["duration_ms"] >= 0
+
+
+def test_sampling_follows_rate_and_remote_parent():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=0.0)
+
+    with tracer.span("unsampled") as root:
+        assert root is not None and not root.recording
+        # Children of an unsampled trace are skipped entirely.
+        assert tracer.start_span("redis GET", root=False) is None
+        # A span that may start a trace still carries the context on.
+        child = tracer.start_span("deps")
+        assert child is not None
+        assert child.context.trace_id == root.context.trace_id
+        assert not child.recording
+
+    remote = SpanContext(TRACE_ID, PARENT_ID, True)
+    with tracer.span("request", parent=remote) as span:
+        assert span is not None and span.recording
+    tracer.flush()
+
+    [exported] = exporter.spans
+    assert exported.context.trace_id == TRACE_ID
+    assert exported.parent_id == PARENT_ID
+
+
+def test_flush_returns_when_a_span_ends_while_it_waits():
+    release = threading.Event()
+
+    class _SlowExporter(InMemorySpanExporter):
+        def export(self, spans):
+            release.wait(5)
+            super().export(spans)
+
+    exporter = _SlowExporter()
+    tracer = Tracer(exporter, batch_size=1)
+    with tracer.span("first"):
+        pass
+    first_thread = tracer._thread
+    assert first_thread is not None
+    join = first_thread.join
+
+    def _join_after_another_span(*args, **kwargs):
+        # While the first thread is still exporting, a span starts a second
+        # one, which must not consume the first thread's shutdown marker.
+        with tracer.span("during flush"):
+            pass
+        second_thread = tracer._thread
+        assert second_thread is not None
+        second_thread.join(0.2)
+        release.set()
+        join(*args, **kwargs)
+
+    first_thread.join = _join_after_another_span  # type: ignore[method-assign]
+    flushing = threading.Thread(target=tracer.flush, daemon=True)
+    flushing.start()
+    flushing.join(timeout=5)
+    assert not flushing.is_alive()
+    tracer.flush()
+
+    # Both threads export once released, in either order.
+    assert sorted(span.name for span in exporter.spans) == ["during flush", "first"]
+
+
+def test_root_false_spans_need_an_active_trace():
+    tracer = Tracer(InMemorySpanExporter())
+
+    assert tracer.start_span("redis GET", root=False) is None
+
+
+def test_full_export_queue_drops_spans():
+    tracer = Tracer(InMemorySpanExporter(), max_queue_size=1)
+    tracer._thread = object()  # type: ignore[assignment]
+    dropped = TRACING_SPANS_DROPPED.value(reason="queue_full")
+
+    for _ in range(3):
+        with tracer.span("request"):
+            pass
+
+    assert TRACING_SPANS_DROPPED.value(reason="queue_full") == dropped + 2
+
+
+def test_file_and_stream_exporters_write_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    stream = io.StringIO()
+    tracer = Tracer(FileSpanExporter(str(path)))
+
+    with tracer.span("request"):
+        pass
+    tracer.flush()
+    tracer.configure(StreamSpanExporter(stream))
+    with tracer.span("job"):
+        pass
+    tracer.flush()
+
+    [written] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert written["name"] == "request"
+    assert len(written["trace_id"]) == 32
+    assert json.loads(stream.getvalue())["name"] == "job"
+
+
+def test_build_exporter_selects_backend():
+    assert build_exporter("none") is None
+    assert isinstance(build_exporter("stdout"), StreamSpanExporter)
+    assert isinstance(build_exporter("file"), FileSpanExporter)
+    assert isinstance(
+        build_exporter("app.core.tracing:InMemorySpanExporter"), InMemorySpanExporter
+    )
+    with pytest.raises(ValueError):
+        build_exporter("zipkin")
+
+
+def test_exporter_without_export_cannot_be_built():
+    class _Incomplete(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete()
+
+
+@pytest.mark.asyncio
+async def test_traced_decorators_record_calls(exporter):
+    @traced_methods
+    class Repository:
+        async def fetch(self, value):
+            return value
+
+        async def _private(self):
+            return None
+
+    @traced("job nightly")
+    async def job():
+        return await Repository().fetch(3)
+
+    assert Repository._private.__name__ == "_private"
+    assert await Repository().fetch(1) == 1
+    assert await job() == 3
+    tracing_module.tracer.flush()
+
+    assert [span.name for span in exporter.spans] == ["Repository.fetch", "job nightly"]
+    fetch, root = exporter.spans
+    assert fetch.parent_id == root.context.span_id
+
+
+def test_inject_trace_context_adds_traceparent(exporter):
+    assert inject_trace_context({}) == {}
+
+    with tracing_module.tracer.span("job") as span:
+        headers = inject_trace_context({})
+
+    assert span is not None
+    assert headers == {"traceparent": format_traceparent(span.context)}